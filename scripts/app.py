@@ -3,6 +3,10 @@ from flask_cors import CORS
 from seismic_viewer import get_seismic_data, get_ebcdic_header, get_file_metadata
 from segy_manual_extractor import read_segy_file
 from proj4_converter import convert_multiple_segy_files_to_wgs84, convert_segy_coordinates_to_wgs84
+from segy_index_cache import queue_full_hash, full_hash_status
+from segy_header_discovery import discover_file_header_fields, MAX_SAMPLE_TRACES
+from segy_prefetch import READ_AHEAD
+from file_fingerprint import DEFAULT_MODE, UNIQUE_ID_MODES, FAST
 import logging
 import os
 
@@ -23,6 +27,16 @@ def serve_seismic_data():
     - file_path: Path to SEGY file (optional, uses default if not provided)
     - start_trace: Starting trace index (default: 0)
     - end_trace: Ending trace index (optional, reads all traces if not provided)
+    - width, height: Target display size (optional); returns a decimated section
+      of at most width traces by height samples
+    - method: Decimation binning, 'minmax' (peak-preserving, default) or 'rms'
+    - start_sample, end_sample: Time window in samples, end exclusive (optional);
+      only those bytes of each trace are read
+    - start_time, end_time: Time window in ms (optional, used without sample numbers)
+    
+    Clients scrolling in steps of equal windows get the next windows read ahead
+    into the block cache; they are told apart by the X-Client-Id header (or
+    their address when it is missing).
     """
     file_path = request.args.get('file_path', DEFAULT_SEGY_FILE)
     start_trace = int(request.args.get('start_trace', 0))
@@ -31,13 +45,40 @@ def serve_seismic_data():
     if end_trace is not None:
         end_trace = int(end_trace)
     
+    try:
+        width = int(request.args['width']) if 'width' in request.args else None
+        height = int(request.args['height']) if 'height' in request.args else None
+    except ValueError:
+        return jsonify({'error': 'width and height must be integers'}), 400
+    method = request.args.get('method', 'minmax')
+    
+    try:
+        window = {
+            key: int(request.args[key]) if key in request.args else None
+            for key in ('start_sample', 'end_sample')
+        }
+        window.update({
+            key: float(request.args[key]) if key in request.args else None
+            for key in ('start_time', 'end_time')
+        })
+    except ValueError:
+        return jsonify({'error': 'start_sample/end_sample must be integers and start_time/end_time numbers'}), 400
+    
     app.logger.debug(f"Reading traces {start_trace} to {end_trace} from {file_path}")
-    result = get_seismic_data(file_path, start_trace, end_trace)
+    result = get_seismic_data(file_path, start_trace, end_trace, width, height, method, **window)
     
     if 'error' in result and result['error']:
         app.logger.error(f"Error in get_seismic_data: {result['error']}")
         return jsonify(result), 500
     
+    if width is None and height is None:
+        client = request.headers.get('X-Client-Id') or request.remote_addr
+        queued = READ_AHEAD.observe(client, file_path, result['start_trace'],
+                                    result['start_trace'] + result['n_traces'], result['total_traces'],
+                                    result['start_sample'], result['start_sample'] + result['n_samples'])
+        if queued:
+            app.logger.debug(f"Prefetching {queued} windows ahead of traces {start_trace} to {end_trace}")
+    
     app.logger.debug("Successfully processed SEG-Y data")
     return jsonify(result)
 
@@ -89,10 +130,13 @@ def serve_manual_segy_read():
     
     GET Query parameters:
     - file_path: Path to SEGY file (optional, uses default if not provided)
+    - unique_id_mode: "full" (SHA-256) or "fast" (sampled fingerprint; the full
+      hash is computed in the background, see /api/unique_id_full)
     
     POST Request body (JSON):
     {
         "file_path": "path/to/file.sgy" (optional),
+        "unique_id_mode": "fast" (optional),
         "field_mappings": {
             "Ffid": 9,
             "Sp": 17,
@@ -107,6 +151,7 @@ def serve_manual_segy_read():
         # Handle GET request with query parameters
         file_path = request.args.get('file_path', DEFAULT_SEGY_FILE)
         field_mappings = None
+        unique_id_mode = request.args.get('unique_id_mode', DEFAULT_MODE)
     else:
         # Handle POST request with JSON body
         try:
@@ -116,6 +161,7 @@ def serve_manual_segy_read():
             
             file_path = data.get('file_path', DEFAULT_SEGY_FILE)
             field_mappings = data.get('field_mappings', None)
+            unique_id_mode = data.get('unique_id_mode', DEFAULT_MODE)
             
             # Validate field_mappings structure if provided
             if field_mappings:
@@ -130,16 +176,72 @@ def serve_manual_segy_read():
         except Exception as e:
             return jsonify({'error': f'Invalid JSON data: {str(e)}'}), 400
     
+    if unique_id_mode not in UNIQUE_ID_MODES:
+        return jsonify({'error': f'Invalid unique_id_mode: must be one of {", ".join(UNIQUE_ID_MODES)}'}), 400
+    
     app.logger.debug(f"Reading SEGY file from {file_path} with field mappings: {field_mappings}")
-    result = read_segy_file(file_path, field_mappings)
+    result = read_segy_file(file_path, field_mappings, unique_id_mode=unique_id_mode)
     
     if 'error' in result and result['error']['type'] is not None:
         app.logger.error(f"Error in manual SEGY read: {result['error']}")
         return jsonify(result), 500
     
+    if unique_id_mode == FAST and result.get('unique_id_full') is None:
+        # Full hash follows later through /api/unique_id_full
+        result['unique_id_full_status'] = queue_full_hash(file_path)['status']
+    
     app.logger.debug("Successfully processed SEGY file with manual extraction")
     return jsonify(result)
 
+@app.route('/api/unique_id_full', methods=['GET'])
+def serve_unique_id_full():
+    """
+    API endpoint to poll the full SHA-256 unique_id of a file that was read
+    with unique_id_mode "fast".
+    
+    Query parameters:
+    - file_path: Path to SEGY file (optional, uses default if not provided)
+    
+    Returns status ("done", "pending", "not_queued", "stale" or "error") and
+    unique_id_full once it is known.
+    """
+    file_path = request.args.get('file_path', DEFAULT_SEGY_FILE)
+    
+    if not os.path.isfile(file_path):
+        return jsonify({'error': f'File not found: {file_path}'}), 404
+    
+    return jsonify(full_hash_status(file_path))
+
+@app.route('/api/header_discovery', methods=['GET'])
+def serve_header_discovery():
+    """
+    API endpoint to suggest trace header byte positions (FFID, SP, CDP,
+    inline, crossline, coordinates) for a SEGY file.
+    
+    Query parameters:
+    - file_path: Path to SEGY file (optional, uses default if not provided)
+    - max_traces: Traces examined (optional; larger files are sampled, 0 examines every trace)
+    
+    Returns ranked suggestions per field, plus field_mappings ready for
+    /api/segy_manual_read.
+    """
+    file_path = request.args.get('file_path', DEFAULT_SEGY_FILE)
+    
+    try:
+        max_traces = int(request.args.get('max_traces', MAX_SAMPLE_TRACES)) or None
+    except ValueError:
+        return jsonify({'error': 'max_traces must be an integer'}), 400
+    
+    app.logger.debug(f"Discovering header fields of {file_path}")
+    result = discover_file_header_fields(file_path, max_traces)
+    
+    if result['error']:
+        app.logger.error(f"Error in header discovery: {result['error']}")
+        return jsonify(result), 500
+    
+    app.logger.debug("Successfully discovered header fields")
+    return jsonify(result)
+
 @app.route('/api/convert_coordinates', methods=['POST'])
 def serve_coordinate_conversion():
     """
@@ -388,6 +490,8 @@ def serve_index():
                 '/api/ebcdic_header': 'Get EBCDIC header',
                 '/api/file_metadata': 'Get file metadata',
                 '/api/segy_manual_read': 'Read SEGY file with manual extraction (returns segy_read_from_list format)',
+                '/api/unique_id_full': 'Poll the full SHA-256 unique_id of a file read with unique_id_mode "fast"',
+                '/api/header_discovery': 'Suggest trace header byte positions for a SEGY file',
                 '/api/convert_coordinates': 'Convert srcx/srcy coordinates from multiple SEG-Y files to WGS84',
                 '/api/convert_single_file': 'Convert srcx/srcy coordinates from a single SEG-Y file to WGS84'
             }
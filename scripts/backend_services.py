@@ -4,25 +4,32 @@ Backend Services - Contains the actual business logic
 This file contains all the methods that the electron_backend.py will call
 """
 
+import importlib.util
 import json
+import threading
 import time
 from datetime import datetime
 
-# Import the LAS extractor
-try:
-    from las_extractor import extract_metadata, get_las_summary
-    LAS_AVAILABLE = True
-except ImportError as e:
-    LAS_AVAILABLE = False
-    LAS_IMPORT_ERROR = str(e)
+def _missing_dependency(*modules):
+    """Import error message for the first module that is not installed, found without importing it"""
+    for name in modules:
+        if importlib.util.find_spec(name) is None:
+            return f"No module named '{name}'"
+    return None
 
-# Import the SEGY 2D reader
-try:
-    from segy_2d_reader import get_seismic_data, get_ebcdic_header, get_file_metadata
-    SEGY_2D_AVAILABLE = True
-except ImportError as e:
-    SEGY_2D_AVAILABLE = False
-    SEGY_2D_IMPORT_ERROR = str(e)
+# The LAS extractor and SEGY 2D reader are imported by the service methods on
+# first use, so the backend starts without loading numpy, lasio or segyio;
+# only check here that their dependencies are installed
+LAS_IMPORT_ERROR = _missing_dependency("lasio", "numpy")
+LAS_AVAILABLE = LAS_IMPORT_ERROR is None
+
+SEGY_2D_IMPORT_ERROR = _missing_dependency("segyio", "numpy")
+SEGY_2D_AVAILABLE = SEGY_2D_IMPORT_ERROR is None
+
+# Batch readers run on threads inside the backend: it is multithreaded (request
+# pools, hash queue, caches), and forking it for a process pool could copy a
+# lock held by another thread into the child and deadlock it
+BATCH_EXECUTOR = "thread"
 
 class CalculatorService:
     """Service for mathematical calculations"""
@@ -74,6 +81,8 @@ class DataService:
             "start_time": time.time(),
             "status": "healthy"
         }
+        # Endpoints run concurrently on the backend's request pools
+        self.stats_lock = threading.Lock()
     
     def get_user(self, user_id=None):
         """Get user by ID or return all users"""
@@ -100,7 +109,8 @@ class DataService:
     
     def increment_request_count(self):
         """Increment the request counter"""
-        self.stats["requests_processed"] += 1
+        with self.stats_lock:
+            self.stats["requests_processed"] += 1
     
     def _format_uptime(self, seconds):
         """Format uptime in human readable format"""
@@ -160,6 +170,7 @@ class LASService:
             raise ValueError(f"LAS extraction not available: {self.error_message}")
         
         try:
+            from las_extractor import extract_metadata
             metadata = extract_metadata(file_path)
             return metadata
         except Exception as e:
@@ -171,6 +182,7 @@ class LASService:
             raise ValueError(f"LAS extraction not available: {self.error_message}")
         
         try:
+            from las_extractor import get_las_summary
             summary = get_las_summary(file_path)
             return summary
         except Exception as e:
@@ -191,13 +203,28 @@ class SegyService:
         self.available = SEGY_2D_AVAILABLE
         self.error_message = SEGY_2D_IMPORT_ERROR if not SEGY_2D_AVAILABLE else None
     
-    def get_seismic_data(self, file_path, start_trace=0, end_trace=None):
-        """Get seismic data from SEGY file"""
+    def get_seismic_data(self, file_path, start_trace=0, end_trace=None, as_array=False, handoff=None,
+                         width=None, height=None, method="minmax", start_sample=None, end_sample=None,
+                         start_time=None, end_time=None, layout="sample"):
+        """
+        Get seismic data from SEGY file (as a float32 NumPy array with as_array=True).
+        
+        layout "sample" gives (n_samples, n_traces), "trace" gives (n_traces, n_samples).
+        
+        With handoff ('file' or 'shm') the samples are decoded into a shared block and
+        only its handle, shape, dtype and strides are returned; see release_block.
+        With width and/or height a display-resolution section is returned instead.
+        start_sample/end_sample (or start_time/end_time in ms) read only a time window.
+        """
         if not self.available:
             raise ValueError(f"SEGY 2D reader not available: {self.error_message}")
         
         try:
-            result = get_seismic_data(file_path, start_trace, end_trace)
+            from segy_2d_reader import get_seismic_data
+            result = get_seismic_data(file_path, start_trace, end_trace, as_array=as_array, handoff=handoff,
+                                      width=width, height=height, method=method, start_sample=start_sample,
+                                      end_sample=end_sample, start_time=start_time, end_time=end_time,
+                                      layout=layout)
             if 'error' in result:
                 raise ValueError(result['error'])
             return result
@@ -210,6 +237,7 @@ class SegyService:
             raise ValueError(f"SEGY 2D reader not available: {self.error_message}")
         
         try:
+            from segy_2d_reader import get_ebcdic_header
             result = get_ebcdic_header(file_path)
             if result.get('error'):
                 raise ValueError(result['error'])
@@ -223,6 +251,7 @@ class SegyService:
             raise ValueError(f"SEGY 2D reader not available: {self.error_message}")
         
         try:
+            from segy_2d_reader import get_file_metadata
             result = get_file_metadata(file_path)
             if result.get('error'):
                 raise ValueError(result['error'])
@@ -230,12 +259,214 @@ class SegyService:
         except Exception as e:
             raise ValueError(f"SEGY metadata extraction failed: {str(e)}")
     
+    def get_full_hash(self, file_path):
+        """Get (queueing if needed) the deferred full SHA-256 unique_id of a SEGY file"""
+        if not self.available:
+            raise ValueError(f"SEGY 2D reader not available: {self.error_message}")
+        
+        try:
+            import os
+            if not os.path.isfile(file_path):
+                raise ValueError(f"File not found: {file_path}")
+            from segy_index_cache import queue_full_hash
+            return queue_full_hash(file_path)
+        except Exception as e:
+            raise ValueError(f"SEGY full hash failed: {str(e)}")
+    
+    def release_block(self, handle):
+        """Free a shared block handed out by get_seismic_data"""
+        if not self.available:
+            raise ValueError(f"SEGY 2D reader not available: {self.error_message}")
+        from segy_shared_blocks import SHARED_BLOCKS
+        return SHARED_BLOCKS.release(handle)
+    
+    def release_all_blocks(self):
+        """Free every shared block still held, returning how many there were"""
+        import sys
+        # Nothing to free when the block registry was never loaded
+        if "segy_shared_blocks" not in sys.modules:
+            return 0
+        return sys.modules["segy_shared_blocks"].SHARED_BLOCKS.release_all()
+    
+    def close_handles(self):
+        """Close every cached open file, returning how many there were"""
+        import sys
+        if "segy_handle_cache" not in sys.modules:
+            return 0
+        return sys.modules["segy_handle_cache"].SEGY_HANDLES.close_all()
+    
+    def discover_header_fields(self, file_path, max_traces=None):
+        """Suggest trace header byte positions for a SEGY file"""
+        if not self.available:
+            raise ValueError(f"SEGY 2D reader not available: {self.error_message}")
+        
+        try:
+            from segy_header_discovery import discover_file_header_fields
+            if max_traces is None:
+                result = discover_file_header_fields(file_path)
+            else:
+                result = discover_file_header_fields(file_path, int(max_traces) or None)
+            if result.get('error'):
+                raise ValueError(result['error'])
+            return result
+        except Exception as e:
+            raise ValueError(f"SEGY header discovery failed: {str(e)}")
+    
     def get_status(self):
         """Get SEGY service status"""
+        if not SEGY_2D_AVAILABLE:
+            return {
+                "available": self.available,
+                "error": self.error_message,
+                "segyio_installed": False,
+                "index_cache": None,
+                "shared_blocks": None,
+                "handle_cache": None,
+                "block_cache": None
+            }
+        import segy_index_cache
+        from segy_shared_blocks import SHARED_BLOCKS
+        from segy_handle_cache import SEGY_HANDLES
+        from segy_block_cache import TRACE_BLOCKS
         return {
             "available": self.available,
             "error": self.error_message,
-            "segyio_installed": SEGY_2D_AVAILABLE
+            "segyio_installed": True,
+            "index_cache": {
+                "enabled": segy_index_cache.CACHE_ENABLED,
+                "directory": segy_index_cache.CACHE_DIR
+            },
+            "shared_blocks": SHARED_BLOCKS.status(),
+            "handle_cache": SEGY_HANDLES.status(),
+            "block_cache": TRACE_BLOCKS.status()
+        }
+
+class ScriptService:
+    """
+    Entry points of the standalone reader scripts, served by the long-lived backend.
+    
+    Each reader module is imported on first use and then stays loaded, so later
+    calls skip interpreter start-up and imports and reuse warm caches (header
+    index, fingerprint store, pyproj transformers).
+    """
+    
+    READER_MODULES = [
+        "segy_read_single_file", "segy_read_from_list", "las_reader",
+        "others_reader", "manual_segy_reader", "proj4_converter_segy"
+    ]
+    
+    def read_segy_file(self, file_path, unique_id_mode=None):
+        """Read one SEGY file like segy_read_single_file.py"""
+        import os
+        from segy_read_single_file import read_segy
+        if not (os.path.isfile(file_path) and file_path.lower().endswith((".sgy", ".segy"))):
+            raise ValueError(f"Provided path '{file_path}' is not a valid .sgy file")
+        if unique_id_mode is None:
+            return read_segy(file_path)
+        return read_segy(file_path, unique_id_mode)
+    
+    def read_segy_list(self, file_list_path=None, workers=None, emit=None):
+        """Read the SEGY files of a list file like segy_read_from_list.py (streamed to emit when given)"""
+        import os
+        from segy_read_from_list import process_file_list, stream_file_list, FILE_LIST_PATH
+        file_list_path = file_list_path or FILE_LIST_PATH
+        if not os.path.isfile(file_list_path):
+            raise ValueError(f"File list '{file_list_path}' is not a file")
+        if emit:
+            return self._streamed(stream_file_list(file_list_path, workers, executor=BATCH_EXECUTOR, emit=emit))
+        return process_file_list(file_list_path, workers, executor=BATCH_EXECUTOR)
+    
+    def parse_las_file(self, file_path):
+        """Parse one LAS file like las_reader.py"""
+        from las_reader import parse_single_las_file
+        return parse_single_las_file(file_path)
+    
+    def read_las_list(self, file_list_path=None, emit=None):
+        """Parse the LAS files of a list file like las_reader.py (streamed to emit when given)"""
+        import os
+        from las_reader import process_file_list, stream_file_list, FILE_LIST_PATH
+        file_list_path = file_list_path or FILE_LIST_PATH
+        if not os.path.isfile(file_list_path):
+            raise ValueError(f"File list '{file_list_path}' is not a file")
+        if emit:
+            return self._streamed(stream_file_list(file_list_path, emit=emit))
+        return process_file_list(file_list_path)
+    
+    def read_others_list(self, file_list_path=None, emit=None):
+        """Get the details of the files of a list file like others_reader.py (streamed to emit when given)"""
+        import os
+        from others_reader import process_file_list, stream_file_list, FILE_LIST_PATH
+        file_list_path = file_list_path or FILE_LIST_PATH
+        if not os.path.isfile(file_list_path):
+            raise ValueError(f"File list '{file_list_path}' is not a file")
+        if emit:
+            return self._streamed(stream_file_list(file_list_path, emit=emit))
+        return process_file_list(file_list_path)
+    
+    def read_segy_manual(self, input_data, emit=None):
+        """Read SEGY files with user header bytes like manual_segy_reader.py (streamed to emit when given)"""
+        from manual_segy_reader import process_files
+        if not isinstance(input_data, dict) or not isinstance(input_data.get("files"), list):
+            raise ValueError("Input must contain 'files' array")
+        if emit:
+            from ndjson_output import NdjsonWriter
+            writer = NdjsonWriter(len(input_data["files"]), emit=emit)
+            writer.progress(force=True)
+            process_files(input_data, writer=writer, executor=BATCH_EXECUTOR)
+            return writer.counts()
+        return process_files(input_data, executor=BATCH_EXECUTOR)
+    
+    def _streamed(self, writer):
+        """Totals of a batch whose records went to emit; the list error record was already sent"""
+        if writer is None:
+            raise ValueError("Failed to read file list")
+        return writer.counts()
+    
+    def convert_segy_coordinates(self, file_configs, srid=None, proj4_string=None):
+        """Extract and convert source coordinates to WGS84 like proj4_converter_segy.py"""
+        from proj4_converter_segy import process_segy_files
+        if not file_configs:
+            raise ValueError("file_configs is empty or missing")
+        if srid is None and proj4_string is None:
+            raise ValueError("Either srid or proj4_string must be provided")
+        if srid is not None and not isinstance(srid, int):
+            raise ValueError("srid must be an integer")
+        if proj4_string is not None and not isinstance(proj4_string, str):
+            raise ValueError("proj4_string must be a string")
+        return process_segy_files(file_configs, srid=srid, proj4_string=proj4_string)
+    
+    def get_segy_coordinates(self, file_config, srid=None, proj4_string=None, trace_step=10):
+        """Source coordinates of one SEGY file as arrays, with WGS84 lon/lat when a CRS is given"""
+        from proj4_converter_segy import read_coordinate_arrays, get_transformer
+        if not isinstance(file_config, dict) or not file_config.get('file_path'):
+            raise ValueError("Parameter 'file_path' is required")
+        if not isinstance(trace_step, int) or trace_step < 1:
+            raise ValueError("trace_step must be a positive integer")
+        srcx, srcy = read_coordinate_arrays(file_config, trace_step)
+        result = {"file_path": file_config['file_path'], "trace_step": trace_step, "srcx": srcx, "srcy": srcy}
+        if srid is not None or proj4_string is not None:
+            result["longitude"], result["latitude"] = get_transformer(srid, proj4_string).transform(srcx, srcy)
+        return result
+    
+    def get_startup_profile(self, modules=None, budget_ms=None):
+        """Cold-start import cost of the entry points, each measured in a fresh interpreter"""
+        from startup_profile import ENTRY_POINTS, profile_startup
+        if modules is not None:
+            if not isinstance(modules, list) or not all(isinstance(m, str) for m in modules):
+                raise ValueError("modules must be a list of module names")
+            unknown = [m for m in modules if m not in ENTRY_POINTS]
+            if unknown:
+                raise ValueError(f"Unknown entry points: {', '.join(unknown)}")
+        if budget_ms is not None and not isinstance(budget_ms, (int, float)):
+            raise ValueError("budget_ms must be a number")
+        return profile_startup(modules, budget_ms)
+    
+    def get_status(self):
+        """Get script service status: which reader modules are loaded in this process"""
+        import sys
+        return {
+            "endpoints": len(self.READER_MODULES),
+            "loaded_modules": [name for name in self.READER_MODULES if name in sys.modules]
         }
 
 # Main service container
@@ -248,6 +479,15 @@ class BackendServices:
         self.file = FileService()
         self.las = LASService()
         self.segy = SegyService()
+        self.scripts = ScriptService()
+    
+    def release_shared_blocks(self):
+        """Free every shared trace block (backend shutdown)"""
+        return self.segy.release_all_blocks()
+    
+    def close_file_handles(self):
+        """Close the cached open SEGY files (backend shutdown)"""
+        return self.segy.close_handles()
     
     def ping(self):
         """Health check endpoint"""
@@ -365,8 +605,17 @@ class BackendServices:
             
             start_trace = params.get('start_trace', 0)
             end_trace = params.get('end_trace')
+            handoff = params.get('handoff')
             
-            data = self.segy.get_seismic_data(file_path, start_trace, end_trace)
+            # Kept as an array: sent as a binary frame or as JSON lists, per request;
+            # with handoff only the shared block handle is sent
+            data = self.segy.get_seismic_data(
+                file_path, start_trace, end_trace, as_array=True, handoff=handoff,
+                width=params.get('width'), height=params.get('height'), method=params.get('method', 'minmax'),
+                start_sample=params.get('start_sample'), end_sample=params.get('end_sample'),
+                start_time=params.get('start_time'), end_time=params.get('end_time'),
+                layout=params.get('layout', 'sample')
+            )
             self.data.increment_request_count()
             
             return {"seismic_data": data}
@@ -374,6 +623,21 @@ class BackendServices:
         except Exception as e:
             raise ValueError(f"Seismic data extraction error: {str(e)}")
     
+    def release_seismic_block(self, params):
+        """Release a shared trace block from get_seismic_data endpoint"""
+        try:
+            handle = params.get('handle')
+            if not handle:
+                raise ValueError("Parameter 'handle' is required")
+            
+            released = self.segy.release_block(handle)
+            self.data.increment_request_count()
+            
+            return {"released": released, "handle": handle}
+            
+        except Exception as e:
+            raise ValueError(f"Seismic block release error: {str(e)}")
+    
     def get_segy_ebcdic_header(self, params):
         """Get EBCDIC header from SEGY file endpoint"""
         try:
@@ -413,4 +677,157 @@ class BackendServices:
             return {"segy_status": status}
             
         except Exception as e:
-            raise ValueError(f"SEGY status error: {str(e)}") 
\ No newline at end of file
+            raise ValueError(f"SEGY status error: {str(e)}")
+    
+    def get_segy_full_hash(self, params):
+        """Get the full SHA-256 unique_id of a SEGY file read with a fast fingerprint endpoint"""
+        try:
+            file_path = params.get('file_path')
+            if not file_path:
+                raise ValueError("Parameter 'file_path' is required")
+            
+            full_hash = self.segy.get_full_hash(file_path)
+            self.data.increment_request_count()
+            
+            return {"full_hash": full_hash}
+            
+        except Exception as e:
+            raise ValueError(f"SEGY full hash error: {str(e)}")
+    
+    def discover_segy_headers(self, params):
+        """Suggest trace header byte positions for a SEGY file endpoint"""
+        try:
+            file_path = params.get('file_path')
+            if not file_path:
+                raise ValueError("Parameter 'file_path' is required")
+            
+            discovery = self.segy.discover_header_fields(file_path, params.get('max_traces'))
+            self.data.increment_request_count()
+            
+            return {"header_discovery": discovery}
+            
+        except Exception as e:
+            raise ValueError(f"SEGY header discovery error: {str(e)}")
+    
+    def read_segy_file(self, params):
+        """Read a single SEGY file (segy_read_single_file.py) endpoint"""
+        try:
+            file_path = params.get('file_path')
+            if not file_path:
+                raise ValueError("Parameter 'file_path' is required")
+            
+            result = self.scripts.read_segy_file(file_path, params.get('unique_id_mode'))
+            self.data.increment_request_count()
+            
+            return {"segy_file": result}
+            
+        except Exception as e:
+            raise ValueError(f"SEGY file read error: {str(e)}")
+    
+    def read_segy_list(self, params, emit=None):
+        """Read the SEGY file list (segy_read_from_list.py) endpoint"""
+        try:
+            result = self.scripts.read_segy_list(params.get('file_list_path'), params.get('workers'), emit=emit)
+            self.data.increment_request_count()
+            
+            # Streamed batches answer with their totals; the results went out as they completed
+            return {"summary": result} if emit else {"segy_files": result}
+            
+        except Exception as e:
+            raise ValueError(f"SEGY list read error: {str(e)}")
+    
+    def parse_las_file(self, params):
+        """Parse a single LAS file (las_reader.py) endpoint"""
+        try:
+            file_path = params.get('file_path')
+            if not file_path:
+                raise ValueError("Parameter 'file_path' is required")
+            
+            result = self.scripts.parse_las_file(file_path)
+            self.data.increment_request_count()
+            
+            return {"las_file": result}
+            
+        except Exception as e:
+            raise ValueError(f"LAS file parse error: {str(e)}")
+    
+    def read_las_list(self, params, emit=None):
+        """Parse the LAS file list (las_reader.py) endpoint"""
+        try:
+            result = self.scripts.read_las_list(params.get('file_list_path'), emit=emit)
+            self.data.increment_request_count()
+            
+            return {"summary": result} if emit else {"las_files": result}
+            
+        except Exception as e:
+            raise ValueError(f"LAS list read error: {str(e)}")
+    
+    def read_others_list(self, params, emit=None):
+        """Get details of the other-files list (others_reader.py) endpoint"""
+        try:
+            result = self.scripts.read_others_list(params.get('file_list_path'), emit=emit)
+            self.data.increment_request_count()
+            
+            return {"summary": result} if emit else {"other_files": result}
+            
+        except Exception as e:
+            raise ValueError(f"File list read error: {str(e)}")
+    
+    def read_segy_manual(self, params, emit=None):
+        """Read SEGY files with user header bytes (manual_segy_reader.py) endpoint"""
+        try:
+            result = self.scripts.read_segy_manual(params, emit=emit)
+            self.data.increment_request_count()
+            
+            return {"summary": result} if emit else {"segy_manual": result}
+            
+        except Exception as e:
+            raise ValueError(f"Manual SEGY read error: {str(e)}")
+    
+    def convert_segy_coordinates(self, params):
+        """Convert SEGY source coordinates to WGS84 (proj4_converter_segy.py) endpoint"""
+        try:
+            result = self.scripts.convert_segy_coordinates(
+                params.get('file_configs'), params.get('srid'), params.get('proj4_string')
+            )
+            self.data.increment_request_count()
+            
+            return {"segy_coordinates": result}
+            
+        except Exception as e:
+            raise ValueError(f"SEGY coordinate conversion error: {str(e)}")
+    
+    def get_segy_coordinates(self, params):
+        """Get SEGY source coordinate arrays of one file (suited to binary framing) endpoint"""
+        try:
+            result = self.scripts.get_segy_coordinates(
+                params, params.get('srid'), params.get('proj4_string'), params.get('trace_step', 10)
+            )
+            self.data.increment_request_count()
+            
+            return {"coordinate_arrays": result}
+            
+        except Exception as e:
+            raise ValueError(f"SEGY coordinate read error: {str(e)}")
+    
+    def get_startup_profile(self, params):
+        """Get the start-up import profile of the backend entry points endpoint"""
+        try:
+            result = self.scripts.get_startup_profile(params.get('modules'), params.get('budget_ms'))
+            self.data.increment_request_count()
+            
+            return {"startup_profile": result}
+            
+        except Exception as e:
+            raise ValueError(f"Startup profile error: {str(e)}")
+    
+    def get_script_status(self, params):
+        """Get script service status endpoint"""
+        try:
+            result = self.scripts.get_status()
+            self.data.increment_request_count()
+            
+            return {"script_status": result}
+            
+        except Exception as e:
+            raise ValueError(f"Script status error: {str(e)}")
@@ -0,0 +1,104 @@
+"""
+Batch Runner
+Runs a per-file function over a list of inputs on a process (or thread) pool,
+keeping a bounded number of files in flight, isolating per-file errors and
+returning results in input order
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Worker count used when none is given; SEGY_SCAN_WORKERS=1 forces sequential scans
+DEFAULT_WORKERS = int(os.environ.get("SEGY_SCAN_WORKERS", "0")) or min(os.cpu_count() or 1, 4)
+
+
+def default_error_result(item: Any, error: BaseException) -> Dict[str, Any]:
+    """Result recorded for an input whose processing raised"""
+    return {
+        "file_name": os.path.basename(str(item)),
+        "error": {
+            "type": "processing_error",
+            "message": str(error) or type(error).__name__
+        }
+    }
+
+
+def iter_batch(func: Callable[[Any], Any], items: Sequence[Any], workers: Optional[int] = None,
+               max_in_flight: Optional[int] = None, executor: str = "process",
+               on_error: Callable[[Any, BaseException], Any] = default_error_result) -> Iterator[Tuple[int, Any]]:
+    """
+    Apply func to every item, yielding (input index, result) as each one completes.
+
+    Args:
+        func (callable): Per-item function; must be picklable for the process executor
+        items (sequence): Inputs, e.g. file paths
+        workers (int): Pool size (default: DEFAULT_WORKERS); 1 runs inline
+        max_in_flight (int): Upper bound on submitted but unfinished items (default: 2 x workers)
+        executor (str): "process" or "thread"
+        on_error (callable): Builds the result for an item whose processing raised
+
+    Yields:
+        tuple: (index, result)
+    """
+    workers = workers or DEFAULT_WORKERS
+    if workers <= 1 or len(items) <= 1:
+        for i, item in enumerate(items):
+            try:
+                yield i, func(item)
+            except Exception as e:
+                yield i, on_error(item, e)
+        return
+
+    pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    max_in_flight = max(max_in_flight or 2 * workers, 1)
+    pool = pool_class(max_workers=workers)
+    pending = {}
+    crashed = []
+    next_item = 0
+    try:
+        while next_item < len(items) or pending:
+            # Keep the pool fed without letting more than max_in_flight items build up
+            while next_item < len(items) and len(pending) < max_in_flight:
+                try:
+                    pending[pool.submit(func, items[next_item])] = next_item
+                except BrokenProcessPool:
+                    # A worker died (e.g. crashed inside a native reader); start a fresh pool
+                    pool.shutdown(wait=False)
+                    pool = pool_class(max_workers=workers)
+                    continue
+                next_item += 1
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = pending.pop(future)
+                try:
+                    yield i, future.result()
+                except BrokenProcessPool:
+                    # Could be this item or another one in flight; retried alone below
+                    crashed.append(i)
+                except Exception as e:
+                    yield i, on_error(items[i], e)
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+    # Re-run items lost to a worker crash one at a time so only the culprit fails
+    for i in crashed:
+        with pool_class(max_workers=1) as retry_pool:
+            try:
+                yield i, retry_pool.submit(func, items[i]).result()
+            except Exception as e:
+                yield i, on_error(items[i], e)
+
+
+def run_batch(func: Callable[[Any], Any], items: Sequence[Any], workers: Optional[int] = None,
+              max_in_flight: Optional[int] = None, executor: str = "process",
+              on_error: Callable[[Any, BaseException], Any] = default_error_result) -> List[Any]:
+    """Apply func to every item in parallel and return the results in input order"""
+    results = [None] * len(items)
+    for i, result in iter_batch(func, items, workers, max_in_flight, executor, on_error):
+        results[i] = result
+    return results
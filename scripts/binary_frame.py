@@ -0,0 +1,108 @@
+"""
+Binary Frame
+Framed output for the electron_backend protocol: a JSON envelope line lists
+the arrays of a response and their raw little-endian bytes follow it, written
+straight from the NumPy buffers instead of as nested JSON lists
+"""
+
+import json
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+# Payload dtype names for the client; every array is sent in the smallest of
+# these that holds its values exactly (trace samples arrive as float32)
+FRAME_DTYPES = {
+    "float32": np.dtype("<f4"),
+    "float64": np.dtype("<f8"),
+    "int32": np.dtype("<i4"),
+    "int64": np.dtype("<i8"),
+    "uint32": np.dtype("<u4"),
+    "uint8": np.dtype("u1"),
+}
+
+
+def frame_dtype(array: np.ndarray) -> str:
+    """
+    Payload dtype name of an array, chosen so its values are carried exactly.
+
+    Raises:
+        TypeError: For dtypes no payload dtype holds exactly (uint64, complex, object, ...)
+    """
+    dtype = array.dtype
+    if dtype.kind == "f" and dtype.itemsize <= 8:
+        return "float64" if dtype.itemsize == 8 else "float32"
+    if dtype.kind == "b" or (dtype.kind == "u" and dtype.itemsize == 1):
+        return "uint8"
+    if dtype.kind == "u" and dtype.itemsize <= 4:
+        return "int32" if dtype.itemsize == 2 else "uint32"
+    if dtype.kind == "i":
+        return "int64" if dtype.itemsize == 8 else "int32"
+    raise TypeError(f"Arrays of dtype {dtype} cannot be sent in a binary frame")
+
+
+def split_arrays(value: Any, path: Tuple = ()) -> Tuple[Any, List[Tuple[List, np.ndarray]]]:
+    """
+    Take the NumPy arrays out of a response.
+
+    Returns:
+        tuple: (the response with every array replaced by None, [(key path, array)])
+    """
+    if isinstance(value, np.ndarray):
+        return None, [(list(path), value)]
+    arrays = []
+    if isinstance(value, dict):
+        body = {}
+        for key, item in value.items():
+            body[key], found = split_arrays(item, path + (key,))
+            arrays.extend(found)
+        return body, arrays
+    if isinstance(value, (list, tuple)):
+        body = []
+        for i, item in enumerate(value):
+            item_body, found = split_arrays(item, path + (i,))
+            body.append(item_body)
+            arrays.extend(found)
+        return body, arrays
+    return value, arrays
+
+
+def encode_frame(message: Dict[str, Any]) -> Tuple[bytes, List[np.ndarray]]:
+    """
+    Split a response into its envelope line and payload buffers.
+
+    The envelope is the response as JSON with arrays set to null and a "frame"
+    entry: {"nbytes": payload size, "arrays": [{"path", "dtype", "shape",
+    "offset", "nbytes"}]}. The payload is the arrays back to back, C order.
+
+    Args:
+        message (dict): Response that may hold NumPy arrays at any depth
+
+    Returns:
+        tuple: (envelope line as UTF-8 bytes, contiguous little-endian arrays to write after it)
+    """
+    body, arrays = split_arrays(message)
+    specs, buffers, offset = [], [], 0
+    for path, array in arrays:
+        dtype = frame_dtype(array)
+        data = np.ascontiguousarray(array, dtype=FRAME_DTYPES[dtype])
+        specs.append({
+            "path": path,
+            "dtype": dtype,
+            "shape": list(array.shape),
+            "offset": offset,
+            "nbytes": data.nbytes,
+        })
+        buffers.append(data)
+        offset += data.nbytes
+    body["frame"] = {"nbytes": offset, "arrays": specs}
+    return (json.dumps(body, default=json_default) + "\n").encode("utf-8"), buffers
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps fallback for NumPy values in plain JSON responses"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -4,16 +4,82 @@ Electron Backend - Communication layer
 This handles stdin/stdout communication and routes requests to backend services
 """
 
+import functools
 import json
+import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from backend_services import BackendServices
 
+# Handler threads for requests that carry an "id"; requests without one are
+# handled in order on the reader thread, as before
+WORKERS = int(os.environ.get("BACKEND_WORKERS", "4"))
+BATCH_WORKERS = int(os.environ.get("BACKEND_BATCH_WORKERS", "2"))
+
+# Long-running endpoints get their own pool so a batch scan cannot take every
+# worker away from interactive calls
+BATCH_ENDPOINTS = {
+    'read_segy_list', 'read_las_list', 'read_others_list', 'read_segy_manual',
+    'convert_segy_coordinates', 'get_segy_full_hash', 'get_startup_profile',
+}
+
+def _json_default(value):
+    """NumPy values in plain JSON responses; binary_frame (and numpy) load on first need"""
+    from binary_frame import json_default
+    return json_default(value)
+
 class ElectronBackend:
     def __init__(self):
         self.running = True
         self.services = BackendServices()
+        self.stdout = sys.stdout
+        # Protocol channel: one JSON line per message, followed by the raw array
+        # payload for requests that ask for "binary" framing
+        self.output = sys.stdout.buffer
+        self.output_lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="backend")
+        self.batch_pool = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="backend-batch")
+    
+    def send(self, message, binary=False):
+        """
+        Write one message to the protocol channel (safe to call from any thread).
+
+        With binary=True the NumPy arrays in the message go out as a frame payload
+        after the JSON envelope line (see binary_frame); otherwise they are
+        written as JSON lists.
+        """
+        if binary:
+            from binary_frame import encode_frame
+            line, buffers = encode_frame(message)
+        else:
+            line, buffers = (json.dumps(message, default=_json_default) + "\n").encode("utf-8"), []
+        with self.output_lock:
+            self.output.write(line)
+            for buffer in buffers:
+                self.output.write(buffer)
+            self.output.flush()
+    
+    def stream(self, request_id, record):
+        """Send one result/progress/summary record of a streamed batch ahead of its response"""
+        self.send({"id": request_id, "stream": True, **record})
+    
+    def respond(self, request_data):
+        """Handle one request and send its response, echoing the request id when there is one"""
+        # Batch requests with "stream": true send each record as it completes (see
+        # ndjson_output) and are answered with the batch totals
+        emit = None
+        if request_data.get('stream') and 'id' in request_data:
+            emit = functools.partial(self.stream, request_data['id'])
+        response = self.handle_request(request_data, emit)
+        if 'id' in request_data:
+            response = {"id": request_data['id'], **response}
+        try:
+            self.send(response, binary=bool(request_data.get('binary')))
+        except (TypeError, ValueError) as e:
+            self.send({"id": request_data.get('id'), "error": f"Response is not JSON serializable: {str(e)}"})
         
-    def handle_request(self, request_data):
+    def handle_request(self, request_data, emit=None):
         """Route requests to appropriate service methods"""
         try:
             endpoint = request_data.get('endpoint')
@@ -36,12 +102,38 @@ class ElectronBackend:
                 return self.services.get_las_status(params)
             elif endpoint == 'get_seismic_data':
                 return self.services.get_seismic_data(params)
+            elif endpoint == 'release_seismic_block':
+                return self.services.release_seismic_block(params)
             elif endpoint == 'get_segy_ebcdic_header':
                 return self.services.get_segy_ebcdic_header(params)
             elif endpoint == 'get_segy_metadata':
                 return self.services.get_segy_metadata(params)
             elif endpoint == 'get_segy_status':
                 return self.services.get_segy_status(params)
+            elif endpoint == 'get_segy_full_hash':
+                return self.services.get_segy_full_hash(params)
+            elif endpoint == 'discover_segy_headers':
+                return self.services.discover_segy_headers(params)
+            elif endpoint == 'read_segy_file':
+                return self.services.read_segy_file(params)
+            elif endpoint == 'read_segy_list':
+                return self.services.read_segy_list(params, emit)
+            elif endpoint == 'parse_las_file':
+                return self.services.parse_las_file(params)
+            elif endpoint == 'read_las_list':
+                return self.services.read_las_list(params, emit)
+            elif endpoint == 'read_others_list':
+                return self.services.read_others_list(params, emit)
+            elif endpoint == 'read_segy_manual':
+                return self.services.read_segy_manual(params, emit)
+            elif endpoint == 'convert_segy_coordinates':
+                return self.services.convert_segy_coordinates(params)
+            elif endpoint == 'get_segy_coordinates':
+                return self.services.get_segy_coordinates(params)
+            elif endpoint == 'get_script_status':
+                return self.services.get_script_status(params)
+            elif endpoint == 'get_startup_profile':
+                return self.services.get_startup_profile(params)
             elif endpoint == 'shutdown':
                 self.running = False
                 return {"message": "Shutting down..."}
@@ -57,9 +149,12 @@ class ElectronBackend:
     
     def run(self):
         """Main loop - listen for requests on stdin"""
+        # Anything the readers print goes to stderr so it cannot break the protocol on
+        # stdout; swapped once for the whole run since sys.stdout is shared by all threads
+        sys.stdout = sys.stderr
         try:
             # Send ready signal
-            print(json.dumps({"status": "ready", "message": "Python backend started"}), flush=True)
+            self.send({"status": "ready", "message": "Python backend started"})
             
             while self.running:
                 try:
@@ -75,28 +170,44 @@ class ElectronBackend:
                     # Parse JSON request
                     request_data = json.loads(line)
                     
-                    # Handle request using services
-                    response = self.handle_request(request_data)
-                    
-                    # Send JSON response
-                    print(json.dumps(response), flush=True)
+                    # Requests with an id run on the worker pools and are answered as they
+                    # complete; shutdown and id-less requests are answered in order here
+                    if not isinstance(request_data, dict):
+                        self.send({"error": "Request must be a JSON object"})
+                    elif 'id' in request_data and request_data.get('endpoint') != 'shutdown':
+                        pool = self.batch_pool if request_data.get('endpoint') in BATCH_ENDPOINTS else self.pool
+                        pool.submit(self.respond, request_data)
+                    else:
+                        self.respond(request_data)
                     
                 except json.JSONDecodeError as e:
                     error_response = {"error": f"Invalid JSON: {str(e)}"}
-                    print(json.dumps(error_response), flush=True)
+                    self.send(error_response)
                 except Exception as e:
                     error_response = {"error": f"Unexpected error: {str(e)}"}
-                    print(json.dumps(error_response), flush=True)
+                    self.send(error_response)
                     
         except KeyboardInterrupt:
             pass
         except Exception as e:
             error_response = {"error": f"Fatal error: {str(e)}"}
-            print(json.dumps(error_response), flush=True)
+            self.send(error_response)
         finally:
+            # Let in-flight requests finish and answer before signalling shutdown
+            self.pool.shutdown(wait=True)
+            self.batch_pool.shutdown(wait=True)
+            # Free the shared blocks the viewer did not release
+            self.services.release_shared_blocks()
+            self.services.close_file_handles()
+            sys.stdout = self.stdout
             # Send shutdown signal
-            print(json.dumps({"status": "shutdown", "message": "Python backend stopped"}), flush=True)
+            self.send({"status": "shutdown", "message": "Python backend stopped"})
 
 if __name__ == "__main__":
+    if "--startup-profile" in sys.argv:
+        # Report the cold-start import cost of every entry point instead of serving
+        from startup_profile import main as startup_profile_main
+        sys.argv.remove("--startup-profile")
+        startup_profile_main()
     backend = ElectronBackend()
     backend.run() 
\ No newline at end of file
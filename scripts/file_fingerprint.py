@@ -0,0 +1,206 @@
+"""
+File Fingerprints
+unique_id strategies shared by the file readers: a full SHA-256 of the content,
+a parallel BLAKE2b tree hash over fixed-size chunks, or a fast fingerprint
+sampled from a few blocks, plus a background queue that computes the full hash
+after the fast fingerprint has been returned
+"""
+
+import os
+import sys
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+FULL = "full"
+TREE = "tree"
+FAST = "fast"
+UNIQUE_ID_MODES = (FULL, TREE, FAST)
+
+# unique_id strategy used when a reader is not told otherwise
+DEFAULT_MODE = os.environ.get("UNIQUE_ID_MODE", FULL)
+if DEFAULT_MODE not in UNIQUE_ID_MODES:
+    print(f"Warning: UNIQUE_ID_MODE={DEFAULT_MODE!r} is not one of {', '.join(UNIQUE_ID_MODES)}; using {FULL}",
+          file=sys.stderr)
+    DEFAULT_MODE = FULL
+
+HASH_CHUNK_SIZE = 8 * 1024 * 1024  # 8 MB per read
+FAST_BLOCK_COUNT = 16              # Evenly spaced blocks between head and tail
+FAST_BLOCK_SIZE = 64 * 1024
+FAST_ID_PREFIX = "fast-v1:"
+
+# The tree layout is part of the id: changing the chunk size needs a new prefix
+TREE_CHUNK_SIZE = 4 * 1024 * 1024
+TREE_DIGEST_SIZE = 32
+TREE_ID_PREFIX = "b2t1:"
+TREE_WORKERS = min(os.cpu_count() or 1, 8)
+
+
+def stat_signature(filepath: str) -> Dict[str, int]:
+    """Size, mtime and inode of a file; any change invalidates cached data for it"""
+    st = os.stat(filepath)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "inode": st.st_ino}
+
+
+def full_hash(filepath: str, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """SHA-256 of the whole file content (hex digest)"""
+    hash_sha256 = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(filepath, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            hash_sha256.update(view[:n])
+    return hash_sha256.hexdigest()
+
+
+def _read_at(fd: int, filepath: str, size: int, offset: int) -> bytes:
+    """Positional read that is safe to call from several threads on one descriptor"""
+    if hasattr(os, "pread"):
+        return os.pread(fd, size, offset)
+    with open(filepath, "rb") as f:  # No pread on Windows
+        f.seek(offset)
+        return f.read(size)
+
+
+def _tree_node(data: bytes, node_offset: int, node_depth: int, last_node: bool) -> bytes:
+    return hashlib.blake2b(
+        data, digest_size=TREE_DIGEST_SIZE, fanout=0, depth=2, leaf_size=TREE_CHUNK_SIZE,
+        inner_size=TREE_DIGEST_SIZE, node_offset=node_offset, node_depth=node_depth, last_node=last_node
+    ).digest()
+
+
+def tree_hash(filepath: str, workers: Optional[int] = None) -> str:
+    """
+    BLAKE2b tree hash of the file content.
+
+    The file is split into TREE_CHUNK_SIZE leaves that a thread pool reads and
+    hashes concurrently (both release the GIL); the root hashes the ordered leaf
+    digests. Throughput scales with cores and storage bandwidth, and the id only
+    depends on the content.
+    """
+    size = os.path.getsize(filepath)
+    nchunks = max(1, -(-size // TREE_CHUNK_SIZE))
+    fd = os.open(filepath, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        def leaf(i):
+            data = _read_at(fd, filepath, TREE_CHUNK_SIZE, i * TREE_CHUNK_SIZE)
+            return _tree_node(data, i, 0, i == nchunks - 1)
+
+        workers = workers or TREE_WORKERS
+        if workers <= 1 or nchunks == 1:
+            leaves = [leaf(i) for i in range(nchunks)]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                leaves = list(pool.map(leaf, range(nchunks)))
+    finally:
+        os.close(fd)
+
+    return TREE_ID_PREFIX + _tree_node(b"".join(leaves), 0, 1, True).hex()
+
+
+def fast_fingerprint(filepath: str, blocks: int = FAST_BLOCK_COUNT, block_size: int = FAST_BLOCK_SIZE) -> str:
+    """
+    Fingerprint from the file size plus hashed head, tail and evenly spaced blocks.
+
+    Reads at most (blocks + 2) * block_size bytes whatever the file size. Small
+    files are hashed in full. The result is prefixed with FAST_ID_PREFIX so it
+    can never be mistaken for a full SHA-256 unique_id.
+    """
+    size = os.path.getsize(filepath)
+    hash_sha256 = hashlib.sha256()
+    hash_sha256.update(size.to_bytes(8, "big"))
+
+    with open(filepath, "rb") as f:
+        if size <= (blocks + 2) * block_size:
+            hash_sha256.update(f.read())
+        else:
+            step = (size - block_size) / (blocks + 1)
+            for i in range(blocks + 2):  # head, spaced blocks, tail
+                f.seek(int(round(i * step)))
+                hash_sha256.update(f.read(block_size))
+
+    return FAST_ID_PREFIX + hash_sha256.hexdigest()
+
+
+def get_file_unique_id(filepath: str, mode: str = DEFAULT_MODE) -> str:
+    """Compute a file's unique_id with the given strategy ("full", "tree" or "fast")"""
+    if mode == FAST:
+        return fast_fingerprint(filepath)
+    if mode == TREE:
+        return tree_hash(filepath)
+    if mode == FULL:
+        return full_hash(filepath)
+    raise ValueError(f"Unknown unique_id mode: {mode}")
+
+
+class FullHashQueue:
+    """Computes full hashes in the background for files that were given a fast fingerprint"""
+
+    def __init__(self, workers: int = 1):
+        self.workers = workers
+        self._executor = None
+        self._jobs = {}  # abspath -> (stat signature, future)
+        self._lock = threading.Lock()
+
+    def submit(self, filepath: str, on_done: Optional[Callable[[str, str], Any]] = None) -> Future:
+        """
+        Queue a full hash of filepath, unless one for the unchanged file is already queued.
+
+        Args:
+            filepath (str): File to hash
+            on_done (callable): Called with (filepath, unique_id) once the hash is ready
+        """
+        key = os.path.abspath(filepath)
+        signature = stat_signature(filepath)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job[0] == signature and not (job[1].done() and job[1].exception()):
+                return job[1]
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="full-hash")
+            future = self._executor.submit(full_hash, filepath)
+            self._jobs[key] = (signature, future)
+
+        if on_done is not None:
+            future.add_done_callback(lambda f: f.exception() is None and on_done(filepath, f.result()))
+        return future
+
+    def status(self, filepath: str) -> Dict[str, Any]:
+        """Report the state of the background hash of a file"""
+        with self._lock:
+            job = self._jobs.get(os.path.abspath(filepath))
+        if job is None:
+            return {"status": "not_queued", "unique_id_full": None}
+        signature, future = job
+        if os.path.exists(filepath) and stat_signature(filepath) != signature:
+            return {"status": "stale", "unique_id_full": None}
+        if not future.done():
+            return {"status": "pending", "unique_id_full": None}
+        if future.exception() is not None:
+            return {"status": "error", "unique_id_full": None, "message": str(future.exception())}
+        return {"status": "done", "unique_id_full": future.result()}
+
+
+# Process-wide queue used by long-lived services (Flask app, Electron backend)
+FULL_HASH_QUEUE = FullHashQueue()
+
+
+def unique_id_fields(filepath: str, mode: str = DEFAULT_MODE) -> Dict[str, Optional[str]]:
+    """
+    unique_id result fields of a file read without a SEG-Y header index (LAS and other files).
+
+    A fast unique_id also carries its mode and the full hash when it is already
+    known; otherwise the full hash is queued on FULL_HASH_QUEUE and
+    unique_id_full stays None until a follow-up lookup supplies it.
+    """
+    fields = {"unique_id": get_file_unique_id(filepath, mode)}
+    if mode == FAST:
+        status = FULL_HASH_QUEUE.status(filepath)
+        if status["status"] in ("not_queued", "stale", "error"):
+            FULL_HASH_QUEUE.submit(filepath)
+        fields.update({"unique_id_mode": FAST, "unique_id_full": status["unique_id_full"]})
+    return fields
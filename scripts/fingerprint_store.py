@@ -0,0 +1,187 @@
+"""
+Fingerprint Store
+Local SQLite store mapping (path, size, mtime, inode) to the unique_id and the
+extraction result of each imported file, so a re-import only processes files
+that are new or have changed since they were last read
+"""
+
+import os
+import json
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from file_fingerprint import stat_signature
+
+# Set FINGERPRINT_STORE=0 to always reprocess every file
+STORE_ENABLED = os.environ.get("FINGERPRINT_STORE", "1") != "0"
+STORE_PATH = os.environ.get(
+    "FINGERPRINT_STORE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "ed_loader_tester", "fingerprints.sqlite3")
+)
+
+STORE_BATCH_SIZE = 50  # Results written per transaction while streaming
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    reader      TEXT NOT NULL,
+    path        TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    inode       INTEGER NOT NULL,
+    unique_id   TEXT,
+    result_json TEXT NOT NULL,
+    updated_at  REAL NOT NULL,
+    PRIMARY KEY (reader, path)
+)
+"""
+
+
+def is_cacheable(result: Dict[str, Any]) -> bool:
+    """Results of failed reads are not stored, so the file is retried next time"""
+    if not isinstance(result, dict) or result.get("success") is False:
+        return False
+    error = result.get("error")
+    return not (isinstance(error, dict) and error.get("type") == "processing_error")
+
+
+class FingerprintStore:
+    """SQLite-backed map from file identity to unique_id and extraction result"""
+
+    def __init__(self, path: str = STORE_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")  # Concurrent imports can read while one writes
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self._conn.close()
+
+    def get_many(self, reader: str, signatures: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+        """
+        Look up stored results for files whose size, mtime and inode are unchanged.
+
+        Args:
+            reader (str): Reader name; results of different readers are kept apart
+            signatures (dict): Path -> stat_signature of the file now
+
+        Returns:
+            dict: Path -> stored result, for hits only
+        """
+        hits = {}
+        paths = list(signatures)
+        for i in range(0, len(paths), 500):  # Stay under SQLite's host parameter limit
+            batch = paths[i:i + 500]
+            rows = self._conn.execute(
+                f"SELECT path, size, mtime_ns, inode, result_json FROM files "
+                f"WHERE reader = ? AND path IN ({', '.join('?' * len(batch))})",
+                [reader, *batch]
+            )
+            for path, size, mtime_ns, inode, result_json in rows:
+                if signatures[path] == {"size": size, "mtime_ns": mtime_ns, "inode": inode}:
+                    hits[path] = json.loads(result_json)
+        return hits
+
+    def put_many(self, reader: str, entries: Sequence[tuple]):
+        """Store (path, stat_signature, result) entries in one transaction"""
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files (reader, path, size, mtime_ns, inode, unique_id, result_json, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (reader, path, sig["size"], sig["mtime_ns"], sig["inode"],
+                     result.get("unique_id"), json.dumps(result), now)
+                    for path, sig, result in entries
+                ]
+            )
+
+
+def _open_store(store_path: Optional[str]) -> Optional[FingerprintStore]:
+    if not STORE_ENABLED:
+        return None
+    try:
+        return FingerprintStore(store_path or STORE_PATH)
+    except (OSError, sqlite3.Error):
+        return None  # The store is an optimisation only
+
+
+def iter_with_store(reader: str, filepaths: Sequence[str],
+                    iter_process: Callable[[List[str]], Iterable[Tuple[int, Any]]],
+                    store_path: Optional[str] = None) -> Iterator[Tuple[int, Any, bool]]:
+    """
+    Process a list of files, reusing stored results for unchanged files, and
+    yield each result as soon as it is available.
+
+    Args:
+        reader (str): Reader name the results are stored under
+        filepaths (sequence): Files to process
+        iter_process (callable): Processes a list of paths, yielding (position in that list, result)
+            in any order, e.g. batch_runner.iter_batch
+        store_path (str): SQLite file (default: STORE_PATH)
+
+    Yields:
+        tuple: (index in filepaths, result, True if it came from the store)
+    """
+    positions = {}
+    for i, path in enumerate(filepaths):
+        positions.setdefault(path, []).append(i)
+
+    store = _open_store(store_path)
+    if store is None:
+        paths = list(positions)
+        for j, result in iter_process(paths):
+            for i in positions[paths[j]]:
+                yield i, result, False
+        return
+
+    with store:
+        # Signatures are taken before processing so a file modified meanwhile is redone next time
+        signatures = {path: stat_signature(path) for path in positions}
+        try:
+            hits = store.get_many(reader, signatures)
+        except sqlite3.Error:
+            hits = {}
+        for path, result in hits.items():
+            for i in positions[path]:
+                yield i, result, True
+
+        misses = [path for path in positions if path not in hits]
+        pending = []
+
+        def flush():
+            try:
+                store.put_many(reader, pending)
+            except sqlite3.Error:
+                pass
+            pending.clear()
+
+        try:
+            for j, result in (iter_process(misses) if misses else ()):
+                path = misses[j]
+                if is_cacheable(result):
+                    pending.append((path, signatures[path], result))
+                    if len(pending) >= STORE_BATCH_SIZE:
+                        flush()
+                for i in positions[path]:
+                    yield i, result, False
+        finally:
+            flush()
+
+
+def process_with_store(reader: str, filepaths: Sequence[str],
+                       iter_process: Callable[[List[str]], Iterable[Tuple[int, Any]]],
+                       store_path: Optional[str] = None) -> List[Any]:
+    """Like iter_with_store, but returns one result per file in input order"""
+    results = [None] * len(filepaths)
+    for i, result, _ in iter_with_store(reader, filepaths, iter_process, store_path):
+        results[i] = result
+    return results
@@ -1,8 +1,16 @@
-import lasio
 import os
 import json
 import sys
-import pandas as pd
+from file_fingerprint import DEFAULT_MODE, unique_id_fields
+from fingerprint_store import iter_with_store, process_with_store
+from ndjson_output import stream_results, stream_error
+
+# Version of this reader's result shape; bump it whenever fields are added,
+# removed or change meaning so results stored by older versions are not served
+RESULT_VERSION = 1
+# Fingerprint store key of this reader's results
+STORE_READER = f"las_reader/v{RESULT_VERSION}/{DEFAULT_MODE}"
+FILE_LIST_PATH = "scripts/data/las_list.txt"  # Hardcoded file list path
 
 def validate_depth_step(depths):
     if len(depths) < 2:
@@ -24,6 +32,7 @@ def parse_single_las_file(file_path):
         }
 
     try:
+        import lasio  # Deferred to the first parse; results served from the store never need it
         las = lasio.read(file_path)
     except Exception as e:
         return {
@@ -80,18 +89,23 @@ def parse_single_las_file(file_path):
         "file_windows_path": file_path.replace('/', '\\'),
         "file_unix_path": file_path.replace('\\', '/'),
         "file_size_bytes": os.path.getsize(file_path),
+        **unique_id_fields(file_path),
     }
 
     return data
 
+def list_las_files(file_list_path):
+    with open(file_list_path, 'r') as f:
+        filepaths = [line.strip() for line in f]
+    return [p for p in filepaths if p.lower().endswith(".las") and os.path.isfile(p)]
+
 def process_file_list(file_list_path):
     results = []
     try:
-        with open(file_list_path, 'r') as f:
-            for line in f:
-                filepath = line.strip()
-                if filepath.lower().endswith(".las") and os.path.isfile(filepath):
-                    results.append(parse_single_las_file(filepath))
+        filepaths = list_las_files(file_list_path)
+        # Only new or changed files are parsed; the rest come from the fingerprint store
+        results = process_with_store(STORE_READER, filepaths,
+                                     lambda paths: enumerate(map(parse_single_las_file, paths)))
     except Exception as e:
         results.append({
             "file_name": os.path.basename(file_list_path),
@@ -102,16 +116,38 @@ def process_file_list(file_list_path):
         })
     return results
 
+def stream_file_list(file_list_path, emit=None):
+    # NDJSON records are written (or passed to emit) as each file is parsed, so
+    # memory stays flat; returns the writer, or None when the list is unreadable
+    try:
+        filepaths = list_las_files(file_list_path)
+    except Exception as e:
+        stream_error({
+            "type": "file_list_error",
+            "message": f"Failed to read file list: {str(e)}"
+        }, emit=emit)
+        return None
+    return stream_results(iter_with_store(STORE_READER, filepaths,
+                                          lambda paths: enumerate(map(parse_single_las_file, paths))),
+                          len(filepaths), emit=emit)
+
 if __name__ == "__main__":
-    file_list_path = "scripts/data/las_list.txt"  # Hardcoded file list path
+    file_list_path = FILE_LIST_PATH
+    ndjson = "--ndjson" in sys.argv[1:]  # Stream one JSON record per file instead of one document
     if os.path.isfile(file_list_path):
+        if ndjson:
+            stream_file_list(file_list_path)
+            sys.exit(0)
         result = process_file_list(file_list_path)
     else:
         result = [{
             "error": {
                 "type": "path_error",
-                "message": "Hardcoded file list path 'scripts/data/las_list.txt' is not a file"
+                "message": f"Hardcoded file list path '{FILE_LIST_PATH}' is not a file"
             },
             "success": False
         }]
-    print(json.dumps(result, indent=2))
\ No newline at end of file
+    if ndjson:
+        stream_error(result[0]["error"])
+    else:
+        print(json.dumps(result, indent=2))
\ No newline at end of file
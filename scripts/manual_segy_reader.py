@@ -1,10 +1,16 @@
 import os
 import sys
 import json
-import segyio
-import hashlib
-import struct
-import pandas as pd
+import functools
+from segy_header_table import coordinate_error_field
+from segy_header_spec import compile_fields
+from segy_header_stats import header_statistics
+from segy_coordinate_report import coordinate_report
+from segy_index_cache import save_index, unique_id_fields
+from segy_handle_cache import SEGY_HANDLES
+from file_fingerprint import DEFAULT_MODE
+from batch_runner import run_batch, iter_batch
+from ndjson_output import NdjsonWriter
 
 # Default header byte positions and format
 DEFAULT_HEADER_BYTES = {
@@ -110,209 +116,74 @@ def get_header_bytes_config(input_data):
     
     return config
 
-def extract_header_bytes(filepath, format_type, headers, byte_positions, gaps, coord_config):
+def to_json_number(value):
+    """Convert a decoded NumPy scalar to a plain int or float"""
+    return value.item() if hasattr(value, "item") else value
+
+def build_decode_plan(format_type, headers, byte_positions, gaps, coord_config):
+    """Compile the configured headers and source coordinates into one header decode plan"""
+    mapping = {}
+    for header in headers:
+        byte_pos = byte_positions.get(header)
+        if byte_pos is not None:
+            # Configured positions are 0-based offsets; gaps are byte widths
+            mapping[header] = {"byte": byte_pos + 1, "width": gaps.get(header), "type": format_type}
+
+    for label, key in (("Source_X", "srcx"), ("Source_Y", "srcy")):
+        coord_pos = coord_config.get(f"{key}_value", DEFAULT_COORD_BYTES[label])
+        coord_format = coord_config.get(f"{key}_format", DEFAULT_FORMAT)
+        mapping[label] = {"byte": coord_pos + 1, "type": coord_format if coord_format in ("ibm", "ieee") else "int32"}
+
+    return compile_fields(mapping)
+
+def extract_header_bytes(table, format_type, headers, byte_positions, gaps, coord_config):
     values = {}
-    all_source_x_zero = True
-    all_source_y_zero = True
-    has_source_x_non_zero = False
-    has_source_y_non_zero = False
 
     try:
-        with open(filepath, "rb") as f:
-            f.seek(3200 + 400)
-            for header in headers:
-                byte_pos = byte_positions.get(header)
-                gap = gaps.get(header, 4)  # Default to 4 bytes if not specified
-                if byte_pos is not None:
-                    f.seek(3200 + 400 + byte_pos)
-                    byte = f.read(gap)
-                    print(f"Raw bytes for {header} at position {byte_pos} (gap={gap}): {byte.hex()}", file=sys.stderr)
-                    if len(byte) == gap:
-                        if format_type == "ibm":
-                            if gap != 4:
-                                raise ValueError(f"IBM format requires 4 bytes, but gap is {gap}")
-                            values[header] = segyio.tools.from_ibm(byte)
-                        elif format_type == "ieee":
-                            if gap != 4:
-                                raise ValueError(f"IEEE format requires 4 bytes, but gap is {gap}")
-                            values[header] = struct.unpack('>f', byte)[0]
-                        elif format_type == "uint32":
-                            if gap != 4:
-                                raise ValueError(f"uint32 format requires 4 bytes, but gap is {gap}")
-                            values[header] = int.from_bytes(byte, 'big', signed=False)
-                        else:  # int32
-                            if gap == 2:
-                                values[header] = struct.unpack('>h', byte)[0]  # signed 16-bit
-                            elif gap == 4:
-                                values[header] = int.from_bytes(byte, 'big', signed=True)
-                            else:
-                                raise ValueError(f"Invalid gap {gap} for int32 format")
-                        print(f"Interpreted {header} as {format_type} with gap={gap}: {values[header]}", file=sys.stderr)
-                    else:
-                        values[header] = None
-                        print(f"Failed to read {gap} bytes for {header} at position {byte_pos}", file=sys.stderr)
+        # One decode plan for the configured headers and coordinates
+        plan = build_decode_plan(format_type, headers, byte_positions, gaps, coord_config)
 
-            # Extract Source_X from first trace
-            srcx_pos = coord_config.get("srcx_value", DEFAULT_COORD_BYTES["Source_X"])
-            srcx_format = coord_config.get("srcx_format", DEFAULT_FORMAT)
-            f.seek(3200 + 400 + srcx_pos)
-            byte = f.read(4)
-            if len(byte) == 4:
-                if srcx_format == "ibm":
-                    values["Source_X"] = segyio.tools.from_ibm(byte)
-                elif srcx_format == "ieee":
-                    values["Source_X"] = struct.unpack('>f', byte)[0]
-                else:  # int32
-                    values["Source_X"] = int.from_bytes(byte, 'big', signed=True)
-                if values["Source_X"] != 0:
-                    all_source_x_zero = False
-                    has_source_x_non_zero = True
-            else:
-                values["Source_X"] = None
-            
-            # Extract Source_Y from first trace
-            srcy_pos = coord_config.get("srcy_value", DEFAULT_COORD_BYTES["Source_Y"])
-            srcy_format = coord_config.get("srcy_format", DEFAULT_FORMAT)
-            f.seek(3200 + 400 + srcy_pos)
-            byte = f.read(4)
-            if len(byte) == 4:
-                if srcy_format == "ibm":
-                    values["Source_Y"] = segyio.tools.from_ibm(byte)
-                elif srcy_format == "ieee":
-                    values["Source_Y"] = struct.unpack('>f', byte)[0]
-                else:  # int32
-                    values["Source_Y"] = int.from_bytes(byte, 'big', signed=True)
-                if values["Source_Y"] != 0:
-                    all_source_y_zero = False
-                    has_source_y_non_zero = True
-            else:
-                values["Source_Y"] = None
-            
-            # Calculate number of traces
-            file_size = os.path.getsize(filepath)
-            f.seek(3200 + 400 + 114)
-            nsamples = int.from_bytes(f.read(2), 'big', signed=False)
-            trace_size = 240 + (nsamples * 4)
-            num_traces = (file_size - 3600) // trace_size if trace_size > 0 else 0
-            
+        # Decode every trace in one vectorized pass
+        num_traces = len(table)
+        columns = plan.decode_table(table)
+
+        for label, column in columns.items():
+            values[label] = to_json_number(column[0]) if num_traces > 0 else None
             if num_traces > 1:
-                last_pos = 3600 + (trace_size * (num_traces - 1))
-                
-                # Extract headers from last trace
-                for header in headers:
-                    byte_pos = byte_positions.get(header)
-                    gap = gaps.get(header, 4)
-                    if byte_pos is not None:
-                        f.seek(last_pos + byte_pos)
-                        byte = f.read(gap)
-                        print(f"Raw bytes for Last_{header} at position {byte_pos} (gap={gap}): {byte.hex()}", file=sys.stderr)
-                        if len(byte) == gap:
-                            if format_type == "ibm":
-                                if gap != 4:
-                                    raise ValueError(f"IBM format requires 4 bytes, but gap is {gap}")
-                                values[f"Last_{header}"] = segyio.tools.from_ibm(byte)
-                            elif format_type == "ieee":
-                                if gap != 4:
-                                    raise ValueError(f"IEEE format requires 4 bytes, but gap is {gap}")
-                                values[f"Last_{header}"] = struct.unpack('>f', byte)[0]
-                            elif format_type == "uint32":
-                                if gap != 4:
-                                    raise ValueError(f"uint32 format requires 4 bytes, but gap is {gap}")
-                                values[f"Last_{header}"] = int.from_bytes(byte, 'big', signed=False)
-                            else:  # int32
-                                if gap == 2:
-                                    values[f"Last_{header}"] = struct.unpack('>h', byte)[0]  # signed 16-bit
-                                elif gap == 4:
-                                    values[f"Last_{header}"] = int.from_bytes(byte, 'big', signed=True)
-                                else:
-                                    raise ValueError(f"Invalid gap {gap} for int32 format")
-                            print(f"Interpreted Last_{header} as {format_type} with gap={gap}: {values[f'Last_{header}']}", file=sys.stderr)
-                        else:
-                            values[f"Last_{header}"] = None
-                            print(f"Failed to read {gap} bytes for Last_{header} at position {byte_pos}", file=sys.stderr)
+                values[f"Last_{label}"] = to_json_number(column[-1])
+            if label in headers:
+                print(f"Interpreted {label} as {plan.specs[label].format} at position {plan.fields[label][0]}: "
+                      f"{values[label]} -> {values.get(f'Last_{label}')}", file=sys.stderr)
 
-                # Extract Last_Source_X
-                f.seek(last_pos + srcx_pos)
-                byte = f.read(4)
-                if len(byte) == 4:
-                    if srcx_format == "ibm":
-                        values["Last_Source_X"] = segyio.tools.from_ibm(byte)
-                    elif srcx_format == "ieee":
-                        values["Last_Source_X"] = struct.unpack('>f', byte)[0]
-                    else:  # int32
-                        values["Last_Source_X"] = int.from_bytes(byte, 'big', signed=True)
-                    if values["Last_Source_X"] != 0:
-                        all_source_x_zero = False
-                        has_source_x_non_zero = True
-                else:
-                    values["Last_Source_X"] = None
-                
-                # Extract Last_Source_Y
-                f.seek(last_pos + srcy_pos)
-                byte = f.read(4)
-                if len(byte) == 4:
-                    if srcy_format == "ibm":
-                        values["Last_Source_Y"] = segyio.tools.from_ibm(byte)
-                    elif srcy_format == "ieee":
-                        values["Last_Source_Y"] = struct.unpack('>f', byte)[0]
-                    else:  # int32
-                        values["Last_Source_Y"] = int.from_bytes(byte, 'big', signed=True)
-                    if values["Last_Source_Y"] != 0:
-                        all_source_y_zero = False
-                        has_source_y_non_zero = True
-                else:
-                    values["Last_Source_Y"] = None
-            
-            # Set error field based on coordinate checks
-            error_field = {
-                "type": None,
-                "message": None
-            }
-            if all_source_x_zero and all_source_y_zero:
-                error_field = {
-                    "type": "zero_coordinates",
-                    "message": "All Source_X and Source_Y are zero"
-                }
-            elif all_source_x_zero and has_source_y_non_zero:
-                error_field = {
-                    "type": "zero_coordinates",
-                    "message": "All Source_X are zero, but Source_Y has non-zero values"
-                }
-            elif all_source_y_zero and has_source_x_non_zero:
-                error_field = {
-                    "type": "zero_coordinates",
-                    "message": "All Source_Y are zero, but Source_X has non-zero values"
-                }
-            
-            return values, error_field
+        # Set error field based on coordinate checks over all traces
+        error_field = coordinate_error_field(columns["Source_X"], columns["Source_Y"])
+
+        # Full-range statistics of the requested headers and coordinate checks over every trace
+        reports = {
+            "header_statistics": header_statistics({label: columns[label] for label in headers if label in columns}),
+            "coordinate_report": coordinate_report(table, {"SourceX": plan.fields["Source_X"], "SourceY": plan.fields["Source_Y"]}),
+        }
+
+        return values, error_field, reports
     except Exception as e:
         raise Exception(f"Header extraction failed: {str(e)}")
 
-def get_file_unique_id(filepath):
-    """Compute SHA-256 hash of the file for unique_id"""
-    hash_sha256 = hashlib.sha256()
-    with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_sha256.update(chunk)
-    return hash_sha256.hexdigest()
-
-def read_segy(filepath, headers, format_type, byte_positions, gaps, coord_config):
+def read_segy(filepath, headers, format_type, byte_positions, gaps, coord_config, unique_id_mode=DEFAULT_MODE):
     try:
-        # Extract header values and error field
-        header_values, error_field = extract_header_bytes(filepath, format_type, headers, byte_positions, gaps, coord_config)
-        
-        # Compute file unique ID (SHA-256)
-        unique_id = get_file_unique_id(filepath)
+        # Header index from the cache, or built from the file on first open
+        index = SEGY_HANDLES.index(filepath, unique_id_mode)
         
-        # Get file size
-        file_size = os.path.getsize(filepath)
+        # Extract header values and error field
+        header_values, error_field, reports = extract_header_bytes(index.table, format_type, headers, byte_positions, gaps, coord_config)
+        save_index(index)  # Persist any newly decoded columns
         
-        # Open file with segyio to extract additional metadata
-        with segyio.open(filepath, "r", ignore_geometry=True) as segyfile:
-            ntraces = segyfile.tracecount
-            nsamples = segyfile.samples.size
-            interval = segyfile.bin[segyio.BinField.Interval]
-            first5_samples = segyfile.trace[0][:5].tolist()
+        # File unique ID (SHA-256 or fast fingerprint), size and trace layout come from the index
+        unique_id = index.get_unique_id(unique_id_mode)
+        file_size = index.fingerprint["size"]
+        ntraces = len(index.table)
+        nsamples = index.table.nsamples
+        interval = index.table.interval
+        first5_samples = index.first_samples
         
         # Format header values to match desired output
         formatted_headers = {
@@ -364,7 +235,9 @@ def read_segy(filepath, headers, format_type, byte_positions, gaps, coord_config
             "file_unix_path": filepath.replace('\\', '/'),
             "file_size_bytes": file_size,
             "header_values": formatted_headers,
+            **reports,
             "unique_id": unique_id,
+            **unique_id_fields(index, unique_id_mode),
             "first5_samples": first5_samples,
             "error": error_field  # Renamed from error_field to error
         }
@@ -380,6 +253,87 @@ def read_segy(filepath, headers, format_type, byte_positions, gaps, coord_config
             "header_values": {}
         }
 
+def process_files(input_data, header_config=None, writer=None, executor="process"):
+    """
+    Read the files of one extraction request ({"files": [{"index", "filePath"}], ...}).
+    
+    Args:
+        input_data (dict): Request, as passed to main
+        header_config (dict): Result of get_header_bytes_config (computed when not given)
+        writer (NdjsonWriter): Stream each result as it completes instead of returning them
+        executor (str): "process" or "thread" (see batch_runner.iter_batch); callers
+            that are themselves multithreaded use "thread" rather than forking
+    
+    Returns:
+        dict: index -> result, in input order (None when streamed)
+    """
+    if header_config is None:
+        header_config = get_header_bytes_config(input_data)
+    
+    results = {}
+    to_read = []
+    for file_info in input_data["files"]:
+        index = str(file_info.get("index", "unknown"))
+        filepath = file_info.get("filePath")
+        
+        if not filepath:
+            results[index] = {
+                "error": {
+                    "type": "input_error",
+                    "message": "Missing filePath"
+                }
+            }
+            continue
+            
+        if not os.path.isfile(filepath):
+            results[index] = {
+                "error": {
+                    "type": "path_error",
+                    "message": f"File not found: {filepath}"
+                }
+            }
+            continue
+            
+        if not filepath.lower().endswith((".sgy", ".segy")):
+            results[index] = {
+                "error": {
+                    "type": "path_error",
+                    "message": f"Not a SEG-Y file: {filepath}"
+                }
+            }
+            continue
+            
+        results[index] = None  # Filled in below, keeps the input order
+        to_read.append((index, filepath))
+    
+    # Read the valid files in parallel; per-file errors stay in their own result
+    read_file = functools.partial(
+        read_segy,
+        headers=header_config["headers"],
+        format_type=header_config["format"],
+        byte_positions=header_config["byte_positions"],
+        gaps=header_config["gaps"],
+        coord_config=header_config["coordinate_config"],
+        unique_id_mode=input_data.get("unique_id_mode", DEFAULT_MODE)
+    )
+    if writer:
+        # Input errors first, then each file as soon as it is read; nothing is kept in memory
+        for index, result in results.items():
+            if result is not None:
+                writer.result(index, result)
+        for i, result in iter_batch(read_file, [filepath for _, filepath in to_read], input_data.get("workers"),
+                                    executor=executor):
+            writer.result(to_read[i][0], result)
+        writer.progress(force=True)
+        writer.summary()
+        return None
+    
+    file_results = run_batch(read_file, [filepath for _, filepath in to_read], input_data.get("workers"),
+                             executor=executor)
+    for (index, _), result in zip(to_read, file_results):
+        results[index] = result
+    return results
+
 def save_to_json(data, output_file):
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
     with open(output_file, "w") as f:
@@ -419,46 +373,15 @@ def main():
         print(f"Byte positions: {header_config['byte_positions']}", file=sys.stderr)
         print(f"Gaps: {header_config['gaps']}", file=sys.stderr)
 
-        results = {}
-        for file_info in input_data["files"]:
-            index = str(file_info.get("index", "unknown"))
-            filepath = file_info.get("filePath")
-            
-            if not filepath:
-                results[index] = {
-                    "error": {
-                        "type": "input_error",
-                        "message": "Missing filePath"
-                    }
-                }
-                continue
-                
-            if not os.path.isfile(filepath):
-                results[index] = {
-                    "error": {
-                        "type": "path_error",
-                        "message": f"File not found: {filepath}"
-                    }
-                }
-                continue
-                
-            if not filepath.lower().endswith((".sgy", ".segy")):
-                results[index] = {
-                    "error": {
-                        "type": "path_error",
-                        "message": f"Not a SEG-Y file: {filepath}"
-                    }
-                }
-                continue
-                
-            results[index] = read_segy(
-                filepath,
-                header_config["headers"],
-                header_config["format"],
-                header_config["byte_positions"],
-                header_config["gaps"],
-                header_config["coordinate_config"]
-            )
+        # "ndjson": true streams one record per file as it completes instead of one document
+        ndjson = bool(input_data.get("ndjson"))
+        writer = NdjsonWriter(len(input_data["files"])) if ndjson else None
+        if writer:
+            writer.progress(force=True)
+        
+        results = process_files(input_data, header_config, writer)
+        if writer:
+            return
         
         json_output = json.dumps(results)
         print(json_output)
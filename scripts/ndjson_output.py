@@ -0,0 +1,110 @@
+"""
+NDJSON Output
+Streaming output mode for the batch readers: one compact JSON record per line,
+written as soon as each file is done, with progress and summary records
+"""
+
+import sys
+import json
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+PROGRESS_INTERVAL = 0.5  # Seconds between progress records
+
+
+def write_record(record: Dict[str, Any], stream=None):
+    """Write one record as a single compact JSON line and flush it"""
+    stream = stream or sys.stdout
+    stream.write(json.dumps(record, separators=(",", ":")) + "\n")
+    stream.flush()
+
+
+def is_failed(result: Any) -> bool:
+    """True for results of files that could not be read (zero coordinates etc. are not failures)"""
+    if not isinstance(result, dict) or result.get("success") is False:
+        return True
+    error = result.get("error")
+    return isinstance(error, dict) and str(error.get("type") or "").endswith("_error")
+
+
+class NdjsonWriter:
+    """
+    Emits the records of one batch:
+
+        {"type": "result", "index": ..., "cached": ..., "result": {...}}
+        {"type": "progress", "done": ..., "total": ..., "elapsed": ...}
+        {"type": "summary", "total": ..., "done": ..., "failed": ..., "cached": ..., "elapsed": ...}
+
+    Records go to stream as NDJSON lines, or to emit (called with each record
+    dict) when one is given, e.g. to tag them for the Electron backend protocol.
+    """
+
+    def __init__(self, total: int, stream=None, progress_interval: float = PROGRESS_INTERVAL,
+                 emit: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.total = total
+        self.stream = stream or sys.stdout
+        self.emit = emit or (lambda record: write_record(record, self.stream))
+        self.progress_interval = progress_interval
+        self.done = 0
+        self.failed = 0
+        self.cached = 0
+        self._start = time.monotonic()
+        self._last_progress = None
+
+    def _elapsed(self) -> float:
+        return round(time.monotonic() - self._start, 3)
+
+    def result(self, index: Any, result: Any, cached: bool = False):
+        """Emit the result of one file"""
+        self.done += 1
+        self.failed += is_failed(result)
+        self.cached += bool(cached)
+        self.emit({"type": "result", "index": index, "cached": bool(cached), "result": result})
+        self.progress()
+
+    def progress(self, force: bool = False):
+        """Emit a progress record, at most once per progress_interval unless forced"""
+        now = time.monotonic()
+        if force or self._last_progress is None or now - self._last_progress >= self.progress_interval:
+            self._last_progress = now
+            self.emit({"type": "progress", "done": self.done, "total": self.total, "elapsed": self._elapsed()})
+
+    def counts(self) -> Dict[str, Any]:
+        """Totals of the batch so far, as carried by the summary record"""
+        return {"total": self.total, "done": self.done, "failed": self.failed, "cached": self.cached,
+                "elapsed": self._elapsed()}
+
+    def summary(self, **fields):
+        """Emit the final summary record"""
+        self.emit({"type": "summary", **self.counts(), **fields})
+
+
+def stream_results(results: Iterable[Tuple], total: int, stream=None,
+                   emit: Optional[Callable[[Dict[str, Any]], None]] = None) -> NdjsonWriter:
+    """
+    Write a batch as NDJSON.
+
+    Args:
+        results (iterable): (index, result) or (index, result, cached) tuples in completion order
+        total (int): Number of results expected
+        emit (callable): Receives each record instead of stream (see NdjsonWriter)
+
+    Returns:
+        NdjsonWriter: The writer, after the summary record has been written
+    """
+    writer = NdjsonWriter(total, stream, emit=emit)
+    writer.progress(force=True)
+    for item in results:
+        writer.result(*item)
+    writer.progress(force=True)
+    writer.summary()
+    return writer
+
+
+def stream_error(error: Dict[str, Any], stream=None, emit: Optional[Callable[[Dict[str, Any]], None]] = None):
+    """Write a batch-level error (e.g. unreadable file list) as an NDJSON record, or pass it to emit"""
+    record = {"type": "error", "error": error}
+    if emit:
+        emit(record)
+    else:
+        write_record(record, stream)
@@ -1,10 +1,19 @@
 import os
 import sys
 import json
+from file_fingerprint import DEFAULT_MODE, unique_id_fields
+from fingerprint_store import iter_with_store, process_with_store
+from ndjson_output import stream_results, stream_error
 
 # 🔧 Hardcoded file list path
 FILE_LIST_PATH = "scripts/data/others_list.txt"
 
+# Version of this reader's result shape; bump it whenever fields are added,
+# removed or change meaning so results stored by older versions are not served
+RESULT_VERSION = 1
+# Fingerprint store key of this reader's results
+STORE_READER = f"others_reader/v{RESULT_VERSION}/{DEFAULT_MODE}"
+
 def get_file_details(file_path):
     """
     Return basic file info using os functions.
@@ -23,17 +32,22 @@ def get_file_details(file_path):
         "file_windows_path": file_path.replace('/', '\\'),
         "file_unix_path": file_path.replace('\\', '/'),
         "file_size_bytes": os.path.getsize(file_path),
+        **unique_id_fields(file_path),
         # "success": True
     }
 
+def list_files(file_list_path):
+    with open(file_list_path, 'r') as f:
+        filepaths = [line.strip() for line in f]
+    return [p for p in filepaths if os.path.isfile(p)]
+
 def process_file_list(file_list_path):
     results = []
     try:
-        with open(file_list_path, 'r') as f:
-            for line in f:
-                filepath = line.strip()
-                if os.path.isfile(filepath):
-                    results.append(get_file_details(filepath))
+        filepaths = list_files(file_list_path)
+        # Only new or changed files are hashed; the rest come from the fingerprint store
+        results = process_with_store(STORE_READER, filepaths,
+                                     lambda paths: enumerate(map(get_file_details, paths)))
     except Exception as e:
         results.append({
             "file_name": os.path.basename(file_list_path),
@@ -42,8 +56,29 @@ def process_file_list(file_list_path):
         })
     return results
 
+def stream_file_list(file_list_path, emit=None):
+    """
+    Write the file details as NDJSON records (or pass them to emit), each as soon
+    as its file is done. Returns the writer, or None when the list cannot be read.
+    """
+    try:
+        filepaths = list_files(file_list_path)
+    except Exception as e:
+        stream_error({
+            "type": "file_list_error",
+            "message": f"Failed to read file list: {str(e)}"
+        }, emit=emit)
+        return None
+    return stream_results(iter_with_store(STORE_READER, filepaths,
+                                          lambda paths: enumerate(map(get_file_details, paths))),
+                          len(filepaths), emit=emit)
+
 if __name__ == "__main__":
+    ndjson = "--ndjson" in sys.argv[1:]  # Stream one JSON record per file instead of one document
     if os.path.isfile(FILE_LIST_PATH):
+        if ndjson:
+            stream_file_list(FILE_LIST_PATH)
+            sys.exit(0)
         result = process_file_list(FILE_LIST_PATH)
     else:
         result = [{
@@ -53,4 +88,7 @@ if __name__ == "__main__":
             },
             "success": False
         }]
-    print(json.dumps(result, indent=2))
\ No newline at end of file
+    if ndjson:
+        stream_error(result[0]["error"])
+    else:
+        print(json.dumps(result, indent=2))
\ No newline at end of file
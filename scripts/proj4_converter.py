@@ -4,6 +4,7 @@ from typing import List, Tuple, Union, Dict, Any
 import numpy as np
 import os
 from pathlib import Path
+from segy_header_table import TraceHeaderTable
 
 def convert_coordinates_to_wgs84(
     coordinates: List[List[float]], 
@@ -65,33 +66,28 @@ def extract_srcx_srcy_from_segy(file_path: str, byte_header_x: int = None, byte_
         List of [srcx, srcy] coordinate pairs
     """
     try:
-        coordinates = []
-        
-        # Open SEG-Y file with ignore_geometry=True to handle both 2D and 3D files
-        with segyio.open(file_path, 'r', ignore_geometry=True) as f:
-            # Use custom byte headers if provided, otherwise use default segyio fields
-            if byte_header_x is not None and byte_header_y is not None:
-                srcx_values = f.attributes(byte_header_x)[:]
-                srcy_values = f.attributes(byte_header_y)[:]
-            else:
-                srcx_values = f.attributes(segyio.TraceField.SourceX)[:]
-                srcy_values = f.attributes(segyio.TraceField.SourceY)[:]
-            
-            coord_set = set()
-            # Sample traces by reading every nth trace
-            for i in range(0, len(srcx_values), sample_interval):
-                srcx = srcx_values[i]
-                srcy = srcy_values[i]
-                
-                if srcx != 0 and srcy != 0:  # Assuming 0,0 might be invalid coordinates
-                    # Convert numpy types to native Python types for JSON serialization
-                    srcx_float = float(srcx)
-                    srcy_float = float(srcy)
-                    coord_pair = (srcx_float, srcy_float)
-                    if coord_pair not in coord_set:
-                        coord_set.add(coord_pair)
-                        coordinates.append([srcx_float, srcy_float])
-        
+        # Use custom byte headers if provided, otherwise the standard SourceX/SourceY (bytes 73/77)
+        if byte_header_x is None or byte_header_y is None:
+            byte_header_x = segyio.TraceField.SourceX
+            byte_header_y = segyio.TraceField.SourceY
+
+        # Decode both columns for every trace in one pass, then take every nth trace
+        with TraceHeaderTable.open(file_path) as table:
+            columns = table.decode({
+                "srcx": (byte_header_x - 1, "int32"),
+                "srcy": (byte_header_y - 1, "int32"),
+            })
+        srcx_values = columns["srcx"][::sample_interval]
+        srcy_values = columns["srcy"][::sample_interval]
+
+        # Assuming 0,0 might be invalid coordinates
+        valid = (srcx_values != 0) & (srcy_values != 0)
+        pairs = np.column_stack((srcx_values[valid], srcy_values[valid])).astype(np.float64)
+
+        # Drop duplicate pairs while keeping the order of first appearance
+        _, first_index = np.unique(pairs, axis=0, return_index=True)
+        coordinates = pairs[np.sort(first_index)].tolist()
+
         return coordinates
         
     except Exception as e:
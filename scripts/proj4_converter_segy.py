@@ -1,28 +1,36 @@
-import segyio
-import pyproj
-import numpy as np
+import functools
 import json
-import struct
 import sys
 from datetime import datetime
-import pytz
+from segy_header_table import TraceHeaderTable
+from segy_header_spec import TYPE_ALIASES, compile_fields
 
-def ibm_to_float(ibm_bytes):
+def read_coordinate_arrays(config, trace_step=10):
     """
-    Convert 4-byte IBM floating-point to Python float.
+    Decode srcx and srcy of one SEGY file, with the scalar applied, for every trace_step-th trace.
+    
+    Parameters:
+    - config: Dict with file_path, srcx_field, srcy_field, srcx_format, srcy_format, scalar_field
+    - trace_step: Integer, distance between the traces read
+    
+    Returns:
+    - Tuple: (srcx, srcy) float64 NumPy arrays
     """
-    try:
-        if len(ibm_bytes) != 4:
-            raise ValueError("IBM float requires 4 bytes")
-        word = struct.unpack('>I', ibm_bytes)[0]
-        if word == 0:
-            return 0.0
-        sign = -1 if (word >> 31) & 0x01 else 1
-        exponent = (word >> 24) & 0x7F
-        mantissa = (word & 0x00FFFFFF) / float(1 << 24)
-        return sign * mantissa * (16 ** (exponent - 64))
-    except Exception as e:
-        raise ValueError(f"Error converting IBM float: {e}")
+    file_path = config.get('file_path')
+    srcx_field = config.get('srcx_field', 73) if config.get('srcx_field') is not None else 73
+    srcy_field = config.get('srcy_field', 77) if config.get('srcy_field') is not None else 77
+    srcx_format = config.get('srcx_format', 'int32').lower() if config.get('srcx_format') is not None else 'int32'
+    srcy_format = config.get('srcy_format', 'int32').lower() if config.get('srcy_format') is not None else 'int32'
+    scalar_field = config.get('scalar_field', 71) if config.get('scalar_field') is not None else 71
+    
+    # srcx/srcy with the scalar applied, decoded for the selected traces in one pass
+    plan = compile_fields({
+        "srcx": {"byte": srcx_field, "type": srcx_format if srcx_format in TYPE_ALIASES else 'int32', "scalar": scalar_field},
+        "srcy": {"byte": srcy_field, "type": srcy_format if srcy_format in TYPE_ALIASES else 'int32', "scalar": scalar_field},
+    })
+    with TraceHeaderTable.open(file_path) as table:
+        coords = plan.decode_table(table, slice(None, None, trace_step))
+    return coords["srcx"], coords["srcy"]
 
 def extract_coordinates(file_configs):
     """
@@ -37,73 +45,32 @@ def extract_coordinates(file_configs):
     results = []
     for config in file_configs:
         file_path = config.get('file_path')
-        srcx_field = config.get('srcx_field', 73) if config.get('srcx_field') is not None else 73
-        srcy_field = config.get('srcy_field', 77) if config.get('srcy_field') is not None else 77
-        srcx_format = config.get('srcx_format', 'int32').lower() if config.get('srcx_format') is not None else 'int32'
-        srcy_format = config.get('srcy_format', 'int32').lower() if config.get('srcy_format') is not None else 'int32'
-        scalar_field = config.get('scalar_field', 71) if config.get('scalar_field') is not None else 71
         seismic_id = config.get('seismic_id')
         
         try:
-            with segyio.open(file_path, mode='r', strict=False) as segy:
-                srcx = []
-                srcy = []
-                for trace_idx in range(0, segy.tracecount, 10):  # Modified to skip every 10 traces
-                    header = segy.header[trace_idx]
-                    
-                    # Read scalar (16-bit at scalar_field)
-                    scalar = header[71]
-                    if scalar == 0:
-                        scalar = 1
-                    
-                    # Read srcx based on format
-                    if srcx_format == 'ibm':
-                        x_bytes = struct.pack('>i', header.get(srcx_field, 0))
-                        x = ibm_to_float(x_bytes)
-                    elif srcx_format == 'ieee':
-                        x_bytes = struct.pack('>i', header.get(srcx_field, 0))
-                        x = struct.unpack('>f', x_bytes)[0]
-                    elif srcx_format == 'uint32':
-                        x = max(header.get(srcx_field, 0), 0)  # Ensure non-negative
-                    elif srcx_format == '2-bit':
-                        x = header.get(srcx_field, 0) & 0xFFFF  # Mask to 16-bit
-                        if x & 0x8000:  # Sign-extend if negative
-                            x -= 0x10000
-                    elif srcx_format == '4-bit' or srcx_format == 'int32':
-                        x = header.get(srcx_field, 0)
-                    else:
-                        x = header.get(srcx_field, 0)  # Default to int32
-                    
-                    # Read srcy based on format
-                    if srcy_format == 'ibm':
-                        y_bytes = struct.pack('>i', header.get(srcy_field, 0))
-                        y = ibm_to_float(y_bytes)
-                    elif srcy_format == 'ieee':
-                        y_bytes = struct.pack('>i', header.get(srcy_field, 0))
-                        y = struct.unpack('>f', y_bytes)[0]
-                    elif srcy_format == 'uint32':
-                        y = max(header.get(srcy_field, 0), 0)
-                    elif srcy_format == '2-bit':
-                        y = header.get(srcy_field, 0) & 0xFFFF
-                        if y & 0x8000:
-                            y -= 0x10000
-                    elif srcy_format == '4-bit' or srcy_format == 'int32':
-                        y = header.get(srcy_field, 0)
-                    else:
-                        y = header.get(srcy_field, 0)  # Default to int32
-                    
-                    # Apply scalar
-                    x = x / abs(scalar) if scalar < 0 else x * scalar
-                    y = y / abs(scalar) if scalar < 0 else y * scalar
-                    
-                    srcx.append(x)
-                    srcy.append(y)
-                
-                results.append((file_path, seismic_id, srcx, srcy, None))
+            srcx, srcy = read_coordinate_arrays(config)  # Modified to skip every 10 traces
+            results.append((file_path, seismic_id, srcx.tolist(), srcy.tolist(), None))
         except Exception as e:
             results.append((file_path, seismic_id, None, None, str(e)))
     return results
 
+@functools.lru_cache(maxsize=32)
+def get_transformer(srid=None, proj4_string=None):
+    """
+    Transformer from the source CRS to WGS84, built once per CRS and reused
+    across calls (and across requests in the long-lived backend).
+    """
+    import pyproj  # Deferred: loads the PROJ database, only needed once there is a CRS to convert
+    if proj4_string:
+        source_crs = pyproj.CRS.from_string(proj4_string)
+    elif srid:
+        source_crs = pyproj.CRS.from_epsg(srid)
+    else:
+        raise ValueError("Either srid or proj4_string must be provided")
+    
+    wgs84_crs = pyproj.CRS.from_epsg(4326)
+    return pyproj.Transformer.from_crs(source_crs, wgs84_crs, always_xy=True)
+
 def convert_segy_to_latlon(srcx, srcy, srid=None, proj4_string=None):
     """
     Convert srcx, srcy coordinates to latitude and longitude (WGS84).
@@ -118,15 +85,7 @@ def convert_segy_to_latlon(srcx, srcy, srid=None, proj4_string=None):
     - Tuple: (lons, lats, None) or (None, None, error_message)
     """
     try:
-        if proj4_string:
-            source_crs = pyproj.CRS.from_string(proj4_string)
-        elif srid:
-            source_crs = pyproj.CRS.from_epsg(srid)
-        else:
-            raise ValueError("Either srid or proj4_string must be provided")
-        
-        wgs84_crs = pyproj.CRS.from_epsg(4326)
-        transformer = pyproj.Transformer.from_crs(source_crs, wgs84_crs, always_xy=True)
+        transformer = get_transformer(srid, proj4_string)
         lons, lats = transformer.transform(srcx, srcy)
         return lons, lats, None
     except Exception as e:
@@ -144,6 +103,7 @@ def process_segy_files(file_configs, srid=None, proj4_string=None):
     Returns:
     - dict: JSON-serializable dictionary with status and results
     """
+    import pytz
     response = {
         "status": "success",
         "srid": srid,
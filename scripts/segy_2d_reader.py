@@ -1,40 +1,86 @@
 import segyio
 import numpy as np
 from typing import Optional, Dict, Any
+from segy_header_table import TEXT_HEADER_SIZE, decode_textual_header
+from segy_header_stats import standard_header_statistics
+from segy_geometry import get_geometry
+from segy_index_cache import save_index
+from segy_handle_cache import SEGY_HANDLES
+from segy_shared_blocks import SHARED_BLOCKS
+from segy_decimate import MINMAX, decimate_window
+from segy_block_cache import TRACE_BLOCKS
+from segy_trace_reader import SAMPLE_LAYOUT, TRACE_LAYOUT, first_sample_time, sample_interval, sample_range
 
-def get_seismic_data(file_path: str, start_trace: int = 0, end_trace: Optional[int] = None) -> Dict[str, Any]:
+def get_seismic_data(file_path: str, start_trace: int = 0, end_trace: Optional[int] = None,
+                     as_array: bool = False, handoff: Optional[str] = None, width: Optional[int] = None,
+                     height: Optional[int] = None, method: str = MINMAX, start_sample: Optional[int] = None,
+                     end_sample: Optional[int] = None, start_time: Optional[float] = None,
+                     end_time: Optional[float] = None, layout: str = SAMPLE_LAYOUT) -> Dict[str, Any]:
+    """
+    Samples of a range of traces as a (n_samples, n_traces) float32 grid, or
+    as (n_traces, n_samples) with layout='trace'.
+
+    start_sample/end_sample (or start_time/end_time in ms) limit the grid to a
+    time window, and only that byte span of each trace is read from the file.
+    Decoded blocks of traces are kept in memory (see segy_block_cache), so
+    windows a viewer returns to are not read or decoded again.
+    With as_array=True 'data' is the float32 NumPy array (for binary framed
+    responses) rather than nested lists. With handoff='file' or 'shm' the
+    samples are decoded into a shared block instead and 'block' describes it
+    (see segy_shared_blocks); the caller releases it by handle. With width
+    and/or height the window is decimated for display (see segy_decimate);
+    such sections are small and never handed off.
+    """
+    window = {'start_sample': start_sample, 'end_sample': end_sample, 'start_time': start_time, 'end_time': end_time}
+    if width is not None or height is not None:
+        return decimate_window(file_path, width, height, start_trace, end_trace, method, as_array=as_array, **window)
     try:
-        with segyio.open(file_path, 'r', ignore_geometry=True) as segyfile:
-            n_traces = segyfile.tracecount
-            n_samples = len(segyfile.samples)
-            sample_rate = segyfile.samples[1] - segyfile.samples[0]
+        with SEGY_HANDLES.table(file_path) as table:
+            n_traces = len(table)
             end_trace = min(end_trace, n_traces) if end_trace else n_traces
             start_trace = max(0, start_trace)
             if start_trace >= n_traces or end_trace <= start_trace:
                 return {'error': 'Invalid trace range'}
-            data = np.zeros((n_samples, end_trace - start_trace))
-            for i, trace_idx in enumerate(range(start_trace, end_trace)):
-                data[:, i] = segyfile.trace[trace_idx]
-            return {
-                'data': data.tolist(),
-                'sample_rate': float(sample_rate),
+            first_sample, last_sample = sample_range(table, **window)
+            interval = sample_interval(table)
+            result = {
+                'sample_rate': interval,
                 'n_traces': end_trace - start_trace,
-                'n_samples': n_samples,
+                'n_samples': last_sample - first_sample,
                 'start_trace': start_trace,
-                'total_traces': n_traces
+                'total_traces': n_traces,
+                'start_sample': first_sample,
+                'total_samples': table.nsamples,
+                'start_time': first_sample_time(table) + first_sample * interval,
+                'layout': layout
             }
+
+            def fill(out=None):
+                return TRACE_BLOCKS.read(table, start_trace, end_trace, first_sample, last_sample, layout, out)
+
+            if handoff:
+                shape = (end_trace - start_trace, last_sample - first_sample)
+                block = SHARED_BLOCKS.write(shape if layout == TRACE_LAYOUT else shape[::-1], fill, kind=handoff)
+                return {'block': block, **result}
+            data = fill()
+            return {'data': data if as_array else data.tolist(), **result}
     except Exception as e:
         return {'error': str(e)}
 
 def get_ebcdic_header(file_path: str) -> Dict[str, Any]:
     try:
-        with segyio.open(file_path, 'r', ignore_geometry=True) as segyfile:
-            header = segyfile.text[0]
-            lines = [header[i:i+80].decode('ascii') for i in range(0, len(header), 80)]
-            return {
-                'header': lines,
-                'error': None
-            }
+        # Use the cached header index when there is one, otherwise read just the textual header
+        index = SEGY_HANDLES.index(file_path, build=False)
+        if index is not None:
+            header = index.textual_header
+        else:
+            with open(file_path, 'rb') as f:
+                header = decode_textual_header(f.read(TEXT_HEADER_SIZE))
+        lines = [header[i:i+80] for i in range(0, len(header), 80)]
+        return {
+            'header': lines,
+            'error': None
+        }
     except Exception as e:
         return {
             'header': None,
@@ -43,42 +89,47 @@ def get_ebcdic_header(file_path: str) -> Dict[str, Any]:
 
 def get_file_metadata(file_path: str) -> Dict[str, Any]:
     try:
-        with segyio.open(file_path, 'r', ignore_geometry=True) as segyfile:
-            sample_interval_us = segyfile.bin[segyio.BinField.Interval]  # In microseconds
-            sample_interval_ms = sample_interval_us / 1000.0 if sample_interval_us else None
+        index = SEGY_HANDLES.index(file_path)
+        table = index.table
+        sample_interval_us = table.interval  # In microseconds
+        sample_interval_ms = sample_interval_us / 1000.0 if sample_interval_us else None
 
-            ffids = []
-            sps = []
-            cdps = []
-            for trace_idx, trace in enumerate(segyfile.trace):
-                trace_header = segyfile.header[trace_idx]
-                ffid = trace_header.get(segyio.TraceField.TRACE_SEQUENCE_FILE, None)
-                sp = trace_header.get(segyio.TraceField.FieldRecord, None)
-                cdp = trace_header.get(segyio.TraceField.CDP, None)
-                if ffid is not None:
-                    ffids.append(ffid)
-                if sp is not None:
-                    sps.append(sp)
-                if cdp is not None:
-                    cdps.append(cdp)
+        # Trace headers, decoded for every trace from the index
+        columns = table.decode({
+            'ffid': (segyio.TraceField.TRACE_SEQUENCE_FILE - 1, 'int32'),
+            'sp': (segyio.TraceField.FieldRecord - 1, 'int32'),
+            'cdp': (segyio.TraceField.CDP - 1, 'int32'),
+        })
+        # Min/max, monotonicity, steps and gaps of FFID, SP, CDP, inline and crossline
+        statistics = standard_header_statistics(table)
+        # 2D/3D detection with the inline/crossline grid and coverage bitmap
+        geometry = get_geometry(index)
+        save_index(index)
+        ffids = columns['ffid']
+        sps = columns['sp']
+        cdps = columns['cdp']
 
-            ffid_range = f"{min(ffids)} to {max(ffids)}" if ffids else "N/A"
-            sp_range = f"{min(sps)} to {max(sps)}" if sps else "N/A"
-            cdp_range = f"{min(cdps)} to {max(cdps)}" if cdps else "N/A"
-            sample_rate = f"{sample_interval_ms} ms" if sample_interval_ms else "N/A"
+        ffid_range = f"{ffids.min()} to {ffids.max()}" if ffids.size else "N/A"
+        sp_range = f"{sps.min()} to {sps.max()}" if sps.size else "N/A"
+        cdp_range = f"{cdps.min()} to {cdps.max()}" if cdps.size else "N/A"
+        sample_rate = f"{sample_interval_ms} ms" if sample_interval_ms else "N/A"
 
-            return {
-                'ffid_range': ffid_range,
-                'sp_range': sp_range,
-                'cdp_range': cdp_range,
-                'sample_rate': sample_rate,
-                'error': None
-            }
+        return {
+            'ffid_range': ffid_range,
+            'sp_range': sp_range,
+            'cdp_range': cdp_range,
+            'sample_rate': sample_rate,
+            'header_statistics': statistics,
+            'geometry': geometry,
+            'error': None
+        }
     except Exception as e:
         return {
             'ffid_range': 'N/A',
             'sp_range': 'N/A',
             'cdp_range': 'N/A',
             'sample_rate': 'N/A',
+            'header_statistics': None,
+            'geometry': None,
             'error': str(e)
         }
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+SEG-Y Block Cache
+In-memory LRU of decoded float32 trace blocks: sections are cut into aligned
+runs of traces, each decoded once per sample window and kept under a byte
+budget, so a viewer panning back and forth over the same traces is served
+without reading the file or decoding IBM floats again
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from file_fingerprint import stat_signature
+from segy_header_table import TraceHeaderTable
+from segy_trace_reader import LAYOUTS, SAMPLE_LAYOUT, TRACE_LAYOUT, read_block
+
+# Set SEGY_BLOCK_CACHE_BYTES=0 to disable the cache
+BUDGET_BYTES = int(os.environ.get("SEGY_BLOCK_CACHE_BYTES", str(256 << 20)))
+# Traces per cached block; blocks start at multiples of this
+BLOCK_TRACES = int(os.environ.get("SEGY_BLOCK_CACHE_TRACES", "256"))
+
+
+class TraceBlockCache:
+    """Decoded trace blocks keyed by (file fingerprint, block number, sample window), least recently used first"""
+
+    def __init__(self, budget_bytes: int = BUDGET_BYTES, block_traces: int = BLOCK_TRACES):
+        self.budget_bytes = budget_bytes
+        self.block_traces = block_traces
+        self._blocks: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _file_key(self, table: TraceHeaderTable) -> Tuple:
+        signature = stat_signature(table.filepath)
+        return (os.path.realpath(table.filepath), signature["size"], signature["mtime_ns"], signature["inode"])
+
+    def _block(self, table: TraceHeaderTable, file_key: Tuple, number: int,
+               start_sample: int, end_sample: int) -> np.ndarray:
+        """Decoded (traces, samples) block, read-only, from the cache or the file"""
+        key = (file_key, number, start_sample, end_sample)
+        with self._lock:
+            block = self._blocks.get(key)
+            if block is not None:
+                self._blocks.move_to_end(key)
+                self.hits += 1
+                return block
+            self.misses += 1
+
+        first = number * self.block_traces
+        block = read_block(table, first, min(first + self.block_traces, len(table)), start_sample, end_sample)
+        block.setflags(write=False)
+        with self._lock:
+            if key not in self._blocks:
+                self._blocks[key] = block
+                self._bytes += block.nbytes
+            while self._bytes > self.budget_bytes and self._blocks:
+                _, evicted = self._blocks.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+        return block
+
+    def read(self, table: TraceHeaderTable, start_trace: int, end_trace: int, start_sample: int = 0,
+             end_sample: Optional[int] = None, layout: str = TRACE_LAYOUT,
+             out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Same as segy_trace_reader.read_block (float32), served from cached blocks.
+
+        Reads larger than the whole budget go straight to the file so they do
+        not flush the blocks a viewer is panning over.
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout: {layout} (expected one of {', '.join(LAYOUTS)})")
+        end_sample = table.nsamples if end_sample is None else end_sample
+        n_traces, n_samples = end_trace - start_trace, end_sample - start_sample
+        if n_traces * n_samples * 4 > self.budget_bytes or table.filepath is None:
+            return read_block(table, start_trace, end_trace, start_sample, end_sample, layout, out)
+
+        shape = (n_traces, n_samples) if layout == TRACE_LAYOUT else (n_samples, n_traces)
+        if out is None:
+            out = np.empty(shape, dtype=np.float32)
+        elif out.shape != shape:
+            raise ValueError(f"Output shape {out.shape} does not match block shape {shape}")
+
+        file_key = self._file_key(table)
+        for number in range(start_trace // self.block_traces, -(-end_trace // self.block_traces)):
+            block_start = number * self.block_traces
+            first, last = max(start_trace, block_start), min(end_trace, block_start + self.block_traces)
+            part = self._block(table, file_key, number, start_sample, end_sample)[first - block_start:last - block_start]
+            if layout == SAMPLE_LAYOUT:
+                out[:, first - start_trace:last - start_trace] = part.T
+            else:
+                out[first - start_trace:last - start_trace] = part
+        return out
+
+    def warm(self, table: TraceHeaderTable, start_trace: int, end_trace: int, start_sample: int = 0,
+             end_sample: Optional[int] = None) -> bool:
+        """Decode the blocks of a window into the cache without assembling it; False when it would not fit"""
+        end_sample = table.nsamples if end_sample is None else end_sample
+        if (end_trace - start_trace) * (end_sample - start_sample) * 4 > self.budget_bytes or table.filepath is None:
+            return False
+        file_key = self._file_key(table)
+        for number in range(start_trace // self.block_traces, -(-end_trace // self.block_traces)):
+            self._block(table, file_key, number, start_sample, end_sample)
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._blocks.clear()
+            self._bytes = 0
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "blocks": len(self._blocks),
+                "bytes": self._bytes,
+                "budget_bytes": self.budget_bytes,
+                "block_traces": self.block_traces,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Process-wide cache used by get_seismic_data in the Flask app and the backend
+TRACE_BLOCKS = TraceBlockCache()
@@ -0,0 +1,121 @@
+"""
+SEG-Y Coordinate Report
+Exact validity report of the source and CDP coordinates over every trace
+header: zero, constant-run, duplicate and out-of-range counts with the
+coordinate scalar (bytes 71-72) and units (bytes 89-90) applied
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from segy_header_table import TraceHeaderTable, apply_scalar
+
+# Standard SEG-Y positions (0-based byte offset, format) of the coordinates
+COORDINATE_FIELDS = {
+    "SourceX": (72, "int32"),   # Bytes 73-76
+    "SourceY": (76, "int32"),   # Bytes 77-80
+    "CDP_X": (180, "int32"),    # Bytes 181-184
+    "CDP_Y": (184, "int32"),    # Bytes 185-188
+}
+COORDINATE_PAIRS = {
+    "Source": ("SourceX", "SourceY"),
+    "CDP": ("CDP_X", "CDP_Y"),
+}
+SCALAR_FIELD = (70, "int16")  # Bytes 71-72, scalar applied to all coordinates
+UNITS_FIELD = (88, "int16")   # Bytes 89-90, 1 = length, 2 = arc seconds, 3 = degrees, 4 = DMS
+
+# Largest plausible |X| and |Y| for each coordinate units code
+UNIT_LIMITS = {
+    1: (1e8, 1e8),              # Metres or feet
+    2: (180 * 3600, 90 * 3600),  # Arc seconds
+    3: (180.0, 90.0),            # Decimal degrees
+    4: (1800000, 900000),        # DDDMMSS
+}
+DEFAULT_LIMITS = UNIT_LIMITS[1]
+
+
+def _constant_runs(values: np.ndarray) -> Tuple[int, int]:
+    """Longest run of identical consecutive values, and number of traces in runs of 2 or more"""
+    if values.size < 2:
+        return int(values.size), 0
+    same = values[1:] == values[:-1]
+    in_run = np.zeros(values.size, dtype=bool)
+    in_run[1:] |= same
+    in_run[:-1] |= same
+    boundaries = np.flatnonzero(~same) + 1
+    run_lengths = np.diff(np.concatenate(([0], boundaries, [values.size])))
+    return int(run_lengths.max()), int(np.count_nonzero(in_run))
+
+
+def _field_report(values: np.ndarray, limit: np.ndarray) -> Dict[str, Any]:
+    zero = values == 0
+    longest_run, run_traces = _constant_runs(values)
+    nonzero = values[~zero]
+    return {
+        "zero_count": int(np.count_nonzero(zero)),
+        "out_of_range_count": int(np.count_nonzero(~np.isfinite(values) | (np.abs(values) > limit))),
+        "longest_constant_run": longest_run,
+        "constant_run_traces": run_traces,
+        "min": float(nonzero.min()) if nonzero.size else None,
+        "max": float(nonzero.max()) if nonzero.size else None,
+    }
+
+
+def _pair_report(x: np.ndarray, y: np.ndarray, x_limit: np.ndarray, y_limit: np.ndarray) -> Dict[str, Any]:
+    x_zero, y_zero = x == 0, y == 0
+    in_range = np.isfinite(x) & np.isfinite(y) & (np.abs(x) <= x_limit) & (np.abs(y) <= y_limit)
+    located = ~(x_zero | y_zero)
+    points = x[located] + 1j * y[located]
+    return {
+        "zero_count": int(np.count_nonzero(x_zero & y_zero)),
+        "partial_zero_count": int(np.count_nonzero(x_zero ^ y_zero)),
+        "duplicate_count": int(points.size - np.unique(points).size),
+        "out_of_range_count": int(np.count_nonzero(~in_range)),
+        "valid_count": int(np.count_nonzero(located & in_range)),
+    }
+
+
+def coordinate_report(table: TraceHeaderTable, fields: Optional[Dict[str, Tuple[int, str]]] = None,
+                      limits: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
+    """
+    Check the coordinates of every trace in one header-only pass.
+
+    Args:
+        table (TraceHeaderTable): Trace headers of the file
+        fields (dict): Overrides of COORDINATE_FIELDS, e.g. user-configured source positions
+        limits (tuple): Largest valid (|X|, |Y|) after scaling; default depends on the units code
+
+    Returns:
+        dict: trace_count, scalars and units codes found, a report per field
+        (zero, out-of-range and constant-run counts, scaled min/max) and per
+        X/Y pair (zero, partial-zero, duplicate, out-of-range and valid counts)
+    """
+    fields = {**COORDINATE_FIELDS, **(fields or {})}
+    columns = table.decode({**fields, "scalar": SCALAR_FIELD, "units": UNITS_FIELD})
+    scalar, units = columns["scalar"], columns["units"]
+    scaled = {label: apply_scalar(columns[label], scalar) for label in fields}
+
+    if limits is None:
+        x_limit = np.full(len(table), DEFAULT_LIMITS[0])
+        y_limit = np.full(len(table), DEFAULT_LIMITS[1])
+        for code, (x_max, y_max) in UNIT_LIMITS.items():
+            x_limit[units == code] = x_max
+            y_limit[units == code] = y_max
+    else:
+        x_limit = np.full(len(table), float(limits[0]))
+        y_limit = np.full(len(table), float(limits[1]))
+
+    return {
+        "trace_count": len(table),
+        "scalars": [int(s) for s in np.unique(scalar)[:10]],
+        "units": [int(u) for u in np.unique(units)[:10]],
+        "fields": {
+            label: _field_report(values, x_limit if label.endswith("X") else y_limit)
+            for label, values in scaled.items()
+        },
+        "pairs": {
+            name: _pair_report(scaled[x], scaled[y], x_limit, y_limit)
+            for name, (x, y) in COORDINATE_PAIRS.items()
+        },
+    }
@@ -0,0 +1,131 @@
+"""
+SEG-Y Decimate
+Display-resolution windows of a section: traces are read straight from a
+memory map of the file, decoded a block at a time and binned down to the
+target width and height with peak-preserving min/max or RMS binning along
+both the trace and time axes
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from segy_handle_cache import SEGY_HANDLES
+from segy_trace_reader import decode_window, first_sample_time, sample_interval, sample_range, sample_window
+
+MINMAX = "minmax"  # Min and max of each bin; 'data' keeps whichever has the larger magnitude
+RMS = "rms"        # Root mean square of each bin
+METHODS = (MINMAX, RMS)
+
+# Decoded float32 samples held at once while binning
+CHUNK_BYTES = 64 << 20
+
+
+def _bin_starts(length: int, bins: Optional[int]) -> np.ndarray:
+    """First index of each of min(bins, length) near-equal bins over range(length)"""
+    if not bins or bins >= length:
+        return np.arange(length)
+    return np.linspace(0, length, bins, endpoint=False).astype(np.int64)
+
+
+def decimate_window(file_path: str, width: Optional[int] = None, height: Optional[int] = None,
+                    start_trace: int = 0, end_trace: Optional[int] = None, method: str = MINMAX,
+                    as_array: bool = False, start_sample: Optional[int] = None, end_sample: Optional[int] = None,
+                    start_time: Optional[float] = None, end_time: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Read a range of traces binned down to at most width x height values.
+
+    Each output column covers a run of consecutive traces and each row a run of
+    consecutive samples; axes that already fit (or have no target) are not binned.
+    NaN samples are ignored by min/max binning.
+
+    Args:
+        file_path (str): Path to the SEGY file
+        width (int): Target number of columns (traces), None to keep every trace
+        height (int): Target number of rows (samples), None to keep every sample
+        start_trace (int): First trace of the window
+        end_trace (int): End of the window (exclusive), None for the last trace
+        method (str): MINMAX or RMS
+        as_array (bool): Return NumPy arrays instead of nested lists
+        start_sample, end_sample, start_time, end_time: Optional time window
+            (see segy_trace_reader.sample_range); only its samples are read
+
+    Returns:
+        dict: data (rows x columns, like get_seismic_data), min and max for
+        MINMAX, the first trace of each column and first sample of each row,
+        and the window metadata; or {'error': ...}
+    """
+    try:
+        if method not in METHODS:
+            raise ValueError(f"Unknown decimation method: {method} (expected one of {', '.join(METHODS)})")
+        for name, value in (("width", width), ("height", height)):
+            if value is not None and (not isinstance(value, int) or value < 1):
+                raise ValueError(f"{name} must be a positive integer")
+
+        with SEGY_HANDLES.table(file_path) as table:
+            n_traces = len(table)
+            end_trace = min(end_trace, n_traces) if end_trace else n_traces
+            start_trace = max(0, start_trace)
+            if start_trace >= n_traces or end_trace <= start_trace or table.nsamples == 0:
+                return {'error': 'Invalid trace range'}
+            first_sample, last_sample = sample_range(table, start_sample, end_sample, start_time, end_time)
+
+            window = end_trace - start_trace
+            n_samples = last_sample - first_sample
+            columns = _bin_starts(window, width)
+            rows = _bin_starts(n_samples, height)
+            samples = sample_window(table, first_sample, last_sample)
+
+            # Whole columns per block, so each block reduces on its own
+            traces_per_column = -(-window // columns.size)
+            columns_per_block = max(1, CHUNK_BYTES // (traces_per_column * n_samples * 4))
+            shape = (rows.size, columns.size)
+            if method == MINMAX:
+                low, high = np.empty(shape, np.float32), np.empty(shape, np.float32)
+            else:
+                data = np.empty(shape, np.float32)
+                row_counts = np.diff(np.append(rows, n_samples))
+
+            for first in range(0, columns.size, columns_per_block):
+                last = min(first + columns_per_block, columns.size)
+                block_start = int(columns[first])
+                block_end = int(columns[last]) if last < columns.size else window
+                block = decode_window(table, samples[start_trace + block_start:start_trace + block_end])
+                starts = columns[first:last] - block_start
+                # Bin the trace axis first: it runs over whole contiguous traces at once
+                if method == MINMAX:
+                    low[:, first:last] = np.fmin.reduceat(np.fmin.reduceat(block, starts, axis=0), rows, axis=1).T
+                    high[:, first:last] = np.fmax.reduceat(np.fmax.reduceat(block, starts, axis=0), rows, axis=1).T
+                else:
+                    squares = np.square(block, dtype=np.float64)
+                    sums = np.add.reduceat(np.add.reduceat(squares, starts, axis=0), rows, axis=1).T
+                    column_counts = np.diff(np.append(starts, block_end - block_start))
+                    data[:, first:last] = np.sqrt(sums / np.outer(row_counts, column_counts))
+
+            extremes = {}
+            if method == MINMAX:
+                data = np.where(np.abs(high) >= np.abs(low), high, low)
+                extremes = {'min': low, 'max': high}
+            result = {
+                'data': data,
+                **extremes,
+                'method': method,
+                'width': int(columns.size),
+                'height': int(rows.size),
+                'column_traces': (start_trace + columns).astype(np.int32),
+                'row_samples': (first_sample + rows).astype(np.int32),
+                'sample_rate': sample_interval(table),
+                'n_traces': window,
+                'n_samples': n_samples,
+                'start_trace': start_trace,
+                'total_traces': n_traces,
+                'start_sample': first_sample,
+                'total_samples': table.nsamples,
+                'start_time': first_sample_time(table) + first_sample * sample_interval(table),
+            }
+            if not as_array:
+                result = {key: value.tolist() if isinstance(value, np.ndarray) else value
+                          for key, value in result.items()}
+            return result
+    except Exception as e:
+        return {'error': str(e)}
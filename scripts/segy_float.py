@@ -0,0 +1,132 @@
+"""
+SEG-Y Float Kernels
+Vectorized conversion of big-endian IBM and IEEE single precision words to
+native floats for whole arrays at once (header columns or full trace blocks),
+with an optional numba kernel and float32 output into caller buffers
+"""
+
+import os
+from typing import Optional
+
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Set SEGY_FLOAT_JIT=0 to use the numpy kernels even when numba is installed
+JIT_ENABLED = NUMBA_AVAILABLE and os.environ.get("SEGY_FLOAT_JIT", "1") != "0"
+
+# Words converted per numpy pass, which bounds the float64 temporaries
+CHUNK_SIZE = 1 << 20
+
+# Big-endian sample dtype for each SEG-Y data sample format code (IBM is handled separately)
+SAMPLE_DTYPES = {
+    2: ">i4", 3: ">i2", 5: ">f4", 6: ">f8", 8: "i1", 9: ">i8", 10: ">u4", 11: ">u2", 12: ">u8", 16: "u1"
+}
+
+# +-16 ** (exponent - 64) / 2 ** 24 for every sign bit and 7-bit IBM exponent, exact in
+# float64, indexed by the top byte of the word so one lookup applies scale and sign
+_IBM_SCALE = np.ldexp(1.0, 4 * (np.arange(128) - 64) - 24)
+_IBM_SCALE = np.concatenate((_IBM_SCALE, -_IBM_SCALE))
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True, nogil=True)
+    def _ibm_jit(words, scale, out):
+        for i in range(words.size):
+            word = words[i]
+            out[i] = (word & 0x00FFFFFF) * scale[word >> 24]
+
+
+def _ibm_numpy(words: np.ndarray, out: np.ndarray):
+    for start in range(0, words.size, CHUNK_SIZE):
+        chunk = words[start:start + CHUNK_SIZE].astype(np.uint32)
+        values = (chunk & 0x00FFFFFF).astype(np.float64)
+        values *= _IBM_SCALE[chunk >> 24]
+        with np.errstate(over="ignore"):  # IBM values beyond the float32 range become +-inf
+            out[start:start + chunk.size] = values
+
+
+def _as_words(words) -> np.ndarray:
+    if isinstance(words, (bytes, bytearray, memoryview)):
+        return np.frombuffer(words, dtype=">u4")
+    return np.asarray(words)
+
+
+def _output(shape, out: Optional[np.ndarray], dtype) -> np.ndarray:
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    if out.shape != shape:
+        raise ValueError(f"Output shape {out.shape} does not match input shape {shape}")
+    if not out.flags.c_contiguous:
+        raise ValueError("Output array must be C-contiguous")
+    return out
+
+
+def ibm_to_float(words, out: Optional[np.ndarray] = None, dtype=np.float64) -> np.ndarray:
+    """
+    Convert big-endian IBM single precision words to IEEE floats.
+
+    Args:
+        words: Array of 32-bit words of any shape and integer dtype (e.g. a ">u4"
+            header column or trace block), or raw big-endian bytes
+        out (np.ndarray): Optional C-contiguous array of the same shape to write into
+        dtype: Output dtype when out is not given (float64 or float32)
+
+    Returns:
+        np.ndarray: Decoded values (out, when given)
+    """
+    words = _as_words(words)
+    out = _output(words.shape, out, dtype)
+    flat = words.reshape(-1)
+    if JIT_ENABLED:
+        _ibm_jit(flat.astype(np.uint32), _IBM_SCALE, out.reshape(-1))
+    else:
+        _ibm_numpy(flat, out.reshape(-1))
+    return out
+
+
+def ieee_to_float(words, out: Optional[np.ndarray] = None, dtype=np.float64) -> np.ndarray:
+    """
+    Convert big-endian IEEE single precision words to native floats.
+
+    Args:
+        words: ">f4" array, array of 32-bit words holding the IEEE bits, or raw big-endian bytes
+        out (np.ndarray): Optional array of the same shape to write into
+        dtype: Output dtype when out is not given
+
+    Returns:
+        np.ndarray: Decoded values (out, when given)
+    """
+    words = _as_words(words)
+    if words.dtype.kind != "f":
+        words = words.astype(np.uint32).view(np.float32)
+    out = _output(words.shape, out, dtype)
+    np.copyto(out, words, casting="unsafe")
+    return out
+
+
+def decode_samples(raw, sample_format: int, out: Optional[np.ndarray] = None, dtype=np.float64) -> np.ndarray:
+    """
+    Decode raw big-endian trace samples for the given sample format code.
+
+    Args:
+        raw: Raw sample bytes (or a uint8 buffer such as a memmap slice)
+        sample_format (int): SEG-Y data sample format code
+        out (np.ndarray): Optional 1-D array with one slot per sample to write into
+        dtype: Output dtype when out is not given
+
+    Returns:
+        np.ndarray: Decoded samples (out, when given)
+    """
+    if sample_format == 1:
+        return ibm_to_float(np.frombuffer(raw, dtype=">u4"), out, dtype)
+    if sample_format not in SAMPLE_DTYPES:
+        raise ValueError(f"Unsupported sample format code: {sample_format}")
+    samples = np.frombuffer(raw, dtype=SAMPLE_DTYPES[sample_format])
+    out = _output(samples.shape, out, dtype)
+    np.copyto(out, samples, casting="unsafe")
+    return out
@@ -0,0 +1,163 @@
+"""
+SEG-Y Geometry
+Detects 2D or 3D geometry from the inline/crossline headers of every trace:
+grid ranges and increments, trace sorting, fold and a packed coverage bitmap
+of live and missing bins, kept with the header index so a 3D volume can be
+addressed by (inline, crossline) without segyio's geometry inference
+"""
+
+import base64
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from segy_header_table import TraceHeaderTable
+
+INLINE_FIELD = (188, "int32")  # Bytes 189-192
+XLINE_FIELD = (192, "int32")   # Bytes 193-196
+
+# Smallest share of live bins in the inline/crossline grid for a 3D volume; 2D lines
+# that number inline and crossline per trace only fill the diagonal of their grid
+MIN_GRID_FILL = 0.1
+
+INLINE_SORTING = "inline"        # Inline is the slow axis, crosslines vary fastest
+CROSSLINE_SORTING = "crossline"  # Crossline is the slow axis
+UNSORTED = "unsorted"
+
+
+def _axis(unique: np.ndarray) -> Dict[str, int]:
+    """Range, increment and grid size of one axis from its sorted unique line numbers"""
+    step = int(np.gcd.reduce(np.diff(unique))) if unique.size > 1 else 1
+    return {
+        "min": int(unique[0]),
+        "max": int(unique[-1]),
+        "step": step,
+        "count": int((unique[-1] - unique[0]) // step) + 1,
+        "lines": int(unique.size),
+    }
+
+
+def _is_monotonic(steps: np.ndarray) -> bool:
+    return bool((steps >= 0).all() or (steps <= 0).all())
+
+
+def _sorting(inlines: np.ndarray, xlines: np.ndarray) -> str:
+    """Slow axis of the trace order: monotonic overall, with the other axis monotonic within each of its lines"""
+    il_steps, xl_steps = np.diff(inlines), np.diff(xlines)
+    if _is_monotonic(il_steps) and _is_monotonic(xl_steps[il_steps == 0]):
+        return INLINE_SORTING
+    if _is_monotonic(xl_steps) and _is_monotonic(il_steps[xl_steps == 0]):
+        return CROSSLINE_SORTING
+    return UNSORTED
+
+
+def _grid_bins(columns: Dict[str, np.ndarray], geometry: Dict[str, Any]) -> np.ndarray:
+    """Flat inline-major bin number of every trace"""
+    inlines, xlines = geometry["inlines"], geometry["xlines"]
+    rows = (columns["inline"].astype(np.int64) - inlines["min"]) // inlines["step"]
+    cols = (columns["xline"].astype(np.int64) - xlines["min"]) // xlines["step"]
+    return rows * xlines["count"] + cols
+
+
+def analyze_geometry(table: TraceHeaderTable, inline_field: Tuple[int, str] = INLINE_FIELD,
+                     xline_field: Tuple[int, str] = XLINE_FIELD) -> Dict[str, Any]:
+    """
+    Work out the geometry of a file from the inline/crossline headers of every trace.
+
+    A file is 3D when both axes carry more than one line and the live bins fill
+    at least MIN_GRID_FILL of the grid they span; otherwise it is treated as 2D.
+
+    Args:
+        table (TraceHeaderTable): Trace headers of the file
+        inline_field (tuple): (0-based byte offset, format) of the inline number
+        xline_field (tuple): (0-based byte offset, format) of the crossline number
+
+    Returns:
+        dict: type ("2D" or "3D"), trace_count, header bytes used, inlines and
+        xlines (min, max, step, grid count, lines present), and for 3D sorting,
+        fold, live/missing bin counts and the coverage bitmap (see decode_coverage)
+    """
+    geometry = {
+        "type": "2D",
+        "trace_count": len(table),
+        "inline_byte": inline_field[0] + 1,
+        "xline_byte": xline_field[0] + 1,
+        "inlines": None,
+        "xlines": None,
+        "sorting": None,
+        "fold": None,
+        "live_bins": None,
+        "missing_bins": None,
+        "coverage": None,
+    }
+    if len(table) == 0:
+        return geometry
+
+    columns = table.decode({"inline": inline_field, "xline": xline_field})
+    inline_unique, xline_unique = np.unique(columns["inline"]), np.unique(columns["xline"])
+    geometry["inlines"] = _axis(inline_unique.astype(np.int64))
+    geometry["xlines"] = _axis(xline_unique.astype(np.int64))
+    if inline_unique.size < 2 or xline_unique.size < 2:
+        return geometry
+
+    grid_size = geometry["inlines"]["count"] * geometry["xlines"]["count"]
+    live_bins, fold = np.unique(_grid_bins(columns, geometry), return_counts=True)
+    if live_bins.size < MIN_GRID_FILL * grid_size:
+        return geometry
+
+    coverage = np.zeros(grid_size, dtype=bool)
+    coverage[live_bins] = True
+    geometry.update({
+        "type": "3D",
+        "sorting": _sorting(columns["inline"], columns["xline"]),
+        "fold": int(fold.max()),
+        "live_bins": int(live_bins.size),
+        "missing_bins": int(grid_size - live_bins.size),
+        "coverage": {
+            "shape": [geometry["inlines"]["count"], geometry["xlines"]["count"]],
+            "order": "inline_major",
+            "bits": base64.b64encode(np.packbits(coverage).tobytes()).decode("ascii"),
+        },
+    })
+    return geometry
+
+
+def decode_coverage(geometry: Dict[str, Any]) -> Optional[np.ndarray]:
+    """Coverage bitmap as a (inline count, crossline count) bool array, or None for 2D files"""
+    coverage = geometry.get("coverage")
+    if not coverage:
+        return None
+    rows, cols = coverage["shape"]
+    bits = np.frombuffer(base64.b64decode(coverage["bits"]), dtype=np.uint8)
+    return np.unpackbits(bits, count=rows * cols).astype(bool).reshape(rows, cols)
+
+
+def trace_grid(table: TraceHeaderTable, geometry: Dict[str, Any]) -> np.ndarray:
+    """
+    Trace number of every bin of a 3D grid, -1 for missing bins (the first trace of each bin when fold > 1).
+
+    Lets a volume be read structured, by (inline, crossline) index, from a file
+    opened with ignore_geometry=True.
+    """
+    if geometry["type"] != "3D":
+        raise ValueError("Trace grid is only defined for 3D geometry")
+    columns = table.decode({
+        "inline": (geometry["inline_byte"] - 1, INLINE_FIELD[1]),
+        "xline": (geometry["xline_byte"] - 1, XLINE_FIELD[1]),
+    })
+    bins, first_trace = np.unique(_grid_bins(columns, geometry), return_index=True)
+    grid = np.full(geometry["inlines"]["count"] * geometry["xlines"]["count"], -1, dtype=np.int64)
+    grid[bins] = first_trace
+    return grid.reshape(geometry["inlines"]["count"], geometry["xlines"]["count"])
+
+
+def geometry_summary(geometry: Dict[str, Any]) -> Dict[str, Any]:
+    """Geometry without the coverage bitmap, for per-file results in batch output"""
+    return {key: value for key, value in geometry.items() if key != "coverage"}
+
+
+def get_geometry(index) -> Dict[str, Any]:
+    """Geometry of an indexed file, analyzed on first use and kept with the index (persisted by save_index)"""
+    if index.geometry is None:
+        index.geometry = analyze_geometry(index.table)
+    return index.geometry
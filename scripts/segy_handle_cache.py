@@ -0,0 +1,223 @@
+"""
+SEG-Y Handle Cache
+Process-wide LRU of open SEG-Y files: the memory-mapped trace table of each
+file and its header index (geometry, headers, decoded columns) stay open
+across requests, so a viewer scrolling through a line does not re-open and
+re-parse the file on every call. Entries are bounded by count and by trace
+header bytes, closed by a background sweep once idle and reopened when the
+file's size, mtime or inode change
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from file_fingerprint import stat_signature
+from segy_header_table import TRACE_HEADER_SIZE, TraceHeaderTable
+from segy_index_cache import SegyIndex, get_segy_index, load_index
+
+MAX_HANDLES = int(os.environ.get("SEGY_HANDLE_CACHE_SIZE", "16"))
+# Trace header bytes held by cached tables and indexes together
+MAX_MAPPED_BYTES = int(os.environ.get("SEGY_HANDLE_CACHE_BYTES", str(2 << 30)))
+# Seconds an unused entry is kept open
+IDLE_SECONDS = float(os.environ.get("SEGY_HANDLE_IDLE", "300"))
+
+
+class _Entry:
+    """Open table and/or index of one file, with the stat signature they were opened at"""
+
+    def __init__(self, signature: Dict[str, int]):
+        self.signature = signature
+        self.table: Optional[TraceHeaderTable] = None
+        self.index: Optional[SegyIndex] = None
+        self.leases = 0
+        self.stale = False  # Evicted or invalidated while leased; closed on the last return
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()  # Serializes opening the table or index
+
+    @property
+    def nbytes(self) -> int:
+        """Trace header bytes of the table and index (sample pages are only touched by windowed reads)"""
+        table_bytes = len(self.table) * TRACE_HEADER_SIZE if self.table is not None else 0
+        index_bytes = len(self.index.table) * TRACE_HEADER_SIZE if self.index is not None else 0
+        return table_bytes + index_bytes
+
+    def close(self):
+        if self.table is not None:
+            self.table.close()
+        self.table = None
+        self.index = None
+
+
+class HandleCache:
+    """LRU of open SEG-Y tables and header indexes, shared by every request of the process"""
+
+    def __init__(self, max_handles: int = MAX_HANDLES, max_bytes: int = MAX_MAPPED_BYTES,
+                 idle_seconds: float = IDLE_SECONDS):
+        self.max_handles = max_handles
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Timer] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _acquire(self, filepath: str) -> _Entry:
+        """Leased entry of a file, replacing it when the file changed on disk"""
+        key = os.path.realpath(filepath)
+        signature = stat_signature(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature != signature:
+                self._drop(key)
+                entry = None
+            if entry is None:
+                entry = self._entries[key] = _Entry(signature)
+            self._entries.move_to_end(key)
+            entry.leases += 1
+            entry.last_used = time.monotonic()
+            self._evict()
+            self._schedule_sweep()
+            return entry
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _return(self, entry: _Entry):
+        with self._lock:
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+            if entry.stale and entry.leases == 0:
+                entry.close()
+            self._evict()
+
+    def _drop(self, key: str):
+        """Remove an entry (caller holds the lock); leased entries close when returned"""
+        entry = self._entries.pop(key)
+        entry.stale = True
+        if entry.leases == 0:
+            entry.close()
+
+    def _evict(self):
+        """Drop idle entries, then least recently used ones while over the limits (caller holds the lock)"""
+        now = time.monotonic()
+        for key in [key for key, entry in self._entries.items()
+                    if entry.leases == 0 and now - entry.last_used > self.idle_seconds]:
+            self._drop(key)
+        total = sum(entry.nbytes for entry in self._entries.values())
+        for key in list(self._entries):
+            if len(self._entries) <= self.max_handles and total <= self.max_bytes:
+                break
+            entry = self._entries[key]
+            if entry.leases == 0:
+                total -= entry.nbytes
+                self._drop(key)
+
+    def _schedule_sweep(self):
+        """Start the idle sweep timer while entries are open (caller holds the lock)"""
+        if self._sweeper is None and self._entries:
+            self._sweeper = threading.Timer(max(self.idle_seconds / 2, 1.0), self._sweep)
+            self._sweeper.daemon = True
+            self._sweeper.start()
+
+    def _sweep(self):
+        """Timer callback: close idle entries, so a quiet process does not keep files mapped (and locked on Windows)"""
+        with self._lock:
+            self._sweeper = None
+            self._evict()
+            self._schedule_sweep()
+
+    @contextmanager
+    def table(self, filepath: str) -> Iterator[TraceHeaderTable]:
+        """
+        Lease the memory-mapped trace table of a file.
+
+        The table stays open for the duration of the with block even if the
+        entry is evicted meanwhile; it must not be closed by the caller.
+        """
+        entry = self._acquire(filepath)
+        try:
+            with entry.lock:
+                self._count(entry.table is not None)
+                if entry.table is None:
+                    entry.table = TraceHeaderTable.open(filepath)
+            yield entry.table
+        finally:
+            self._return(entry)
+
+    def index(self, filepath: str, unique_id_mode: Optional[str] = None, build: bool = True) -> Optional[SegyIndex]:
+        """
+        Header index of a file (see segy_index_cache.get_segy_index), kept open in memory.
+
+        Args:
+            filepath (str): Path to the SEG-Y file
+            unique_id_mode (str): Fingerprint mode whose unique_id the index must carry
+            build (bool): Build the index from the file when it is not cached;
+                with False, None is returned instead
+
+        Returns:
+            SegyIndex: Index shared with other requests; its columns must not be modified
+        """
+        entry = self._acquire(filepath)
+        try:
+            with entry.lock:
+                index = entry.index
+                hit = index is not None and (unique_id_mode is None or unique_id_mode in index.unique_ids)
+                self._count(hit)
+                if hit:
+                    return index
+                if build:
+                    index = get_segy_index(filepath, unique_id_mode)
+                elif index is None:
+                    index = load_index(filepath)
+                entry.index = index
+                return index
+        finally:
+            self._return(entry)
+
+    def invalidate(self, filepath: str) -> bool:
+        """Forget a file, e.g. after rewriting it in place; False when it was not cached"""
+        key = os.path.realpath(filepath)
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._drop(key)
+            return True
+
+    def close_all(self) -> int:
+        """Close every entry (leased ones when returned), e.g. at shutdown"""
+        with self._lock:
+            count = len(self._entries)
+            for key in list(self._entries):
+                self._drop(key)
+            if self._sweeper is not None:
+                self._sweeper.cancel()
+                self._sweeper = None
+            return count
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            self._evict()
+            entries = list(self._entries.values())
+            return {
+                "handles": len(entries),
+                "leased": sum(1 for entry in entries if entry.leases),
+                "header_bytes": sum(entry.nbytes for entry in entries),
+                "max_handles": self.max_handles,
+                "max_bytes": self.max_bytes,
+                "idle_seconds": self.idle_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Process-wide cache shared by the Flask app and the backend services
+SEGY_HANDLES = HandleCache()
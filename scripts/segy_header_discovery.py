@@ -0,0 +1,277 @@
+"""
+SEG-Y Header Discovery
+Suggests trace header byte positions for FFID, shot point, CDP, inline,
+crossline and the coordinate pairs by decoding every 2-byte-aligned word of
+the 240-byte header as int16, int32, IBM and IEEE over all (or an evenly
+strided sample of) traces, and scoring each candidate column by monotonicity,
+step regularity and plausible value ranges
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from segy_header_table import TRACE_HEADER_SIZE, TraceHeaderTable
+from segy_float import ibm_to_float
+from segy_index_cache import save_index
+from segy_handle_cache import SEGY_HANDLES
+
+MAX_SAMPLE_TRACES = 20000  # Larger files are sampled with an even trace stride
+MAX_SUGGESTIONS = 3        # Ranked candidates reported per field
+MIN_SCORE = 0.65           # Weakest candidate used in the suggested mappings
+
+# Standard SEG-Y byte (1-based) of each field, preferred when candidates tie
+STANDARD_BYTES = {
+    "FFID": 9,
+    "ShotPoint": 17,
+    "CDP": 21,
+    "Inline": 189,
+    "Xline": 193,
+    "Source": 73,  # SourceX, SourceY at 77
+    "CDP_XY": 181,  # CDP_X, CDP_Y at 185
+}
+# Trace counters that look like any numbering header (trace sequence in line/file,
+# trace number in field record and in ensemble)
+COUNTER_BYTES = {1, 5, 13, 25}
+
+STANDARD_WEIGHT = 1.0  # Candidate at the field's standard byte
+OTHER_WEIGHT = 0.85    # Non-standard byte
+TAKEN_WEIGHT = 0.6     # Byte that is standard for another field or a trace counter
+
+# Plausible value range of each numbering field
+FIELD_RANGES = {
+    "FFID": (1, 1e7),
+    "ShotPoint": (1, 1e7),
+    "CDP": (1, 1e8),
+    "Inline": (1, 1e6),
+    "Xline": (1, 1e6),
+}
+COORDINATE_RANGE = (1e3, 1e10)  # Plausible |raw coordinate| before the scalar
+FLOAT_RANGE = (1e-3, 1e10)      # Non-zero float words outside this are misread integers
+
+# Keys of the suggested mappings for /api/segy_manual_read (field_mappings, 1-based)
+# and the batch readers (header_bytes, 0-based)
+MAPPING_KEYS = {"FFID": "Ffid", "ShotPoint": "Sp", "CDP": "Cdp", "Inline": "Il", "Xline": "Xl"}
+PAIR_KEYS = {"Source": ("Source_X", "Source_Y"), "CDP_XY": ("CDP_X", "CDP_Y")}
+
+
+def _sample_headers(table: TraceHeaderTable, max_traces: Optional[int]) -> Tuple[np.ndarray, int]:
+    stride = 1 if not max_traces or len(table) <= max_traces else math.ceil(len(table) / max_traces)
+    return np.ascontiguousarray(table.headers()[::stride]), stride
+
+
+def _candidate_columns(headers: np.ndarray) -> List[Tuple[int, str, np.ndarray]]:
+    """(0-based offset, format, float64 column) of every word that passes the quick validity checks"""
+    words16 = headers.view(">u2")
+    high, low = words16[:, :-1].astype(np.uint32), words16[:, 1:].astype(np.uint32)
+    words32 = (high << 16) | low  # 4-byte word at every even offset
+
+    int16 = words16.view(">i2").astype(np.float64)
+    int32 = words32.view(np.int32).astype(np.float64)
+    sign_extended = (high == np.where(low & 0x8000, 0xFFFF, 0)).all(axis=0)
+    candidates = []
+
+    def nonconstant(values):
+        return (values != values[0]).any(axis=0)
+
+    # High half changing on few traces: the top of a large number, or a separate constant field
+    high_changes = np.diff(high.astype(np.int64), axis=0) != 0
+    high_steady = high_changes.mean(axis=0) < 0.05
+    # High half changing only when the low half wraps around: a carry, so one 32-bit number
+    wraps = np.abs(np.diff(low.astype(np.int64), axis=0)) > 0x8000
+    carry = high_changes.any(axis=0) & ((high_changes & wraps).sum(axis=0) >= 0.9 * high_changes.sum(axis=0))
+    int32_varies = nonconstant(int32)
+
+    for k in np.flatnonzero(nonconstant(int16)):
+        # High half of a larger int32 on a 4-byte boundary
+        if (2 * k) % 4 == 0 and k < carry.size and int32_varies[k] and carry[k]:
+            continue
+        if k > 0 and (2 * (k - 1)) % 4 == 0:
+            # Same values as the int32 starting 2 bytes earlier on a 4-byte boundary,
+            # or its low half when the high half hardly changes
+            if sign_extended[k - 1] or (int32_varies[k - 1] and (high_steady[k - 1] or carry[k - 1])):
+                continue
+        candidates.append((int(2 * k), "int16", int16[:, k]))
+
+    for k in np.flatnonzero(int32_varies):
+        # A 16-bit value shifted up (low half always zero)
+        if not (low[:, k] != 0).any():
+            continue
+        # Off a 4-byte boundary: a copy of an int16, or a constant field joined to the next one
+        if (2 * k) % 4 != 0 and (sign_extended[k] or high_steady[k]):
+            continue
+        candidates.append((int(2 * k), "int32", int32[:, k]))
+
+    with np.errstate(invalid="ignore"):  # NaN bit patterns are expected in integer words
+        ieee = words32.view(np.float32).astype(np.float64)
+    for fmt, floats in (("ibm", ibm_to_float(words32)), ("ieee", ieee)):
+        magnitude = np.abs(floats)
+        valid = np.isfinite(floats).all(axis=0) & ((floats == 0) | ((magnitude > FLOAT_RANGE[0]) & (magnitude < FLOAT_RANGE[1]))).all(axis=0)
+        for k in np.flatnonzero(valid & nonconstant(floats)):
+            candidates.append((int(2 * k), fmt, floats[:, k]))
+    return candidates
+
+
+def _features(values: np.ndarray) -> Dict[str, float]:
+    """Shape of one candidate column: monotonicity, step regularity, repeats, zeros and smoothness"""
+    steps = np.diff(values)
+    moving = steps[steps != 0]
+    span = float(values.max() - values.min())
+    if moving.size:
+        step_values, step_counts = np.unique(np.abs(moving), return_counts=True)
+        regularity = float(step_counts.max() / moving.size)
+        monotonic = float(max(np.count_nonzero(moving > 0), np.count_nonzero(moving < 0)) / moving.size)
+        signs = np.sign(moving)
+        resets = int(np.count_nonzero(signs[1:] != signs[:-1]))
+        smooth = float(np.count_nonzero(np.abs(moving) <= 0.05 * span) / moving.size)
+    else:
+        regularity = monotonic = smooth = 0.0
+        resets = 0
+    return {
+        "monotonic": monotonic,
+        "regularity": regularity,
+        "repeat": float(1 - moving.size / steps.size) if steps.size else 1.0,
+        "resets": resets,
+        "zero": float(np.count_nonzero(values == 0) / values.size),
+        "integral": float(np.count_nonzero(values == np.round(values)) / values.size),
+        "smooth": smooth,
+        "unique": float(np.unique(values).size / values.size),
+    }
+
+
+def _in_range(values: np.ndarray, low: float, high: float) -> float:
+    magnitude = np.abs(values)
+    return float(np.count_nonzero((magnitude >= low) & (magnitude <= high)) / values.size)
+
+
+def _field_scores(values: np.ndarray, f: Dict[str, float]) -> Dict[str, float]:
+    """Likelihood (0-1) of a column being each numbering field"""
+    base = f["integral"] * f["regularity"]
+    # Either axis of a 3D grid may be the slow one (long runs of one line) or the
+    # fast one (restarting at every line); the standard bytes then tell them apart
+    grid_axis = max(f["monotonic"] * f["repeat"], (1 - f["repeat"]) * (1.0 if f["resets"] else 0.5))
+    return {
+        "FFID": base * f["monotonic"] * (0.5 + 0.5 * f["repeat"]) * _in_range(values, *FIELD_RANGES["FFID"]),
+        "ShotPoint": base * f["monotonic"] * _in_range(values, *FIELD_RANGES["ShotPoint"]),
+        "CDP": base * f["monotonic"] * (1 - f["repeat"]) * _in_range(values, *FIELD_RANGES["CDP"]),
+        "Inline": base * grid_axis * _in_range(values, *FIELD_RANGES["Inline"]),
+        "Xline": base * grid_axis * _in_range(values, *FIELD_RANGES["Xline"]),
+    }
+
+
+def _coordinate_score(values: np.ndarray, f: Dict[str, float]) -> float:
+    """Likelihood (0-1) of a column being a raw X or Y coordinate"""
+    return (1 - f["zero"]) * f["smooth"] * min(1.0, 10 * f["unique"]) * _in_range(values, *COORDINATE_RANGE)
+
+
+def _weight(field: str, byte: int) -> float:
+    if byte == STANDARD_BYTES[field]:
+        return STANDARD_WEIGHT
+    if byte in COUNTER_BYTES or byte in STANDARD_BYTES.values():
+        return TAKEN_WEIGHT
+    return OTHER_WEIGHT
+
+
+def _describe(values: np.ndarray, byte: int, fmt: str, score: float) -> Dict[str, Any]:
+    as_number = int if fmt in ("int16", "int32") else float
+    return {
+        "byte": byte,
+        "type": fmt,
+        "score": round(score, 3),
+        "min": as_number(values.min()),
+        "max": as_number(values.max()),
+        "first": as_number(values[0]),
+        "last": as_number(values[-1]),
+    }
+
+
+def discover_header_fields(table: TraceHeaderTable, max_traces: Optional[int] = MAX_SAMPLE_TRACES) -> Dict[str, Any]:
+    """
+    Rank candidate byte positions for the standard numbering headers and coordinate pairs.
+
+    Args:
+        table (TraceHeaderTable): Trace headers of the file
+        max_traces (int): Largest number of traces examined; larger files are
+            sampled with an even stride (None examines every trace)
+
+    Returns:
+        dict: trace_count, sampled_traces and stride; suggestions (field ->
+        ranked candidates with 1-based byte, type, score and value range);
+        field_mappings (1-based, as /api/segy_manual_read expects), field_types
+        and header_bytes (0-based, as the batch readers use) of the best
+        non-overlapping candidates scoring at least MIN_SCORE
+    """
+    result = {"trace_count": len(table), "sampled_traces": 0, "stride": 1, "suggestions": {},
+              "field_mappings": {}, "field_types": {}, "header_bytes": {}}
+    if len(table) < 2:
+        return result
+
+    headers, stride = _sample_headers(table, max_traces)
+    result["sampled_traces"], result["stride"] = len(headers), stride
+
+    ranked = {field: [] for field in STANDARD_BYTES}
+    coordinates = {}
+    for offset, fmt, values in _candidate_columns(headers):
+        features = _features(values)
+        byte = offset + 1
+        for field, score in _field_scores(values, features).items():
+            score *= _weight(field, byte)
+            if score > 0:
+                ranked[field].append((score, byte, fmt, values))
+        coordinates[(offset, fmt)] = (_coordinate_score(values, features), values)
+
+    # Coordinates come in X/Y pairs of the same type, Y in the word after X
+    for (offset, fmt), (x_score, x_values) in coordinates.items():
+        y_score, y_values = coordinates.get((offset + 4, fmt), (0.0, None))
+        for field in PAIR_KEYS:
+            score = min(x_score, y_score) * _weight(field, offset + 1)
+            if score > 0:
+                ranked[field].append((score, offset + 1, fmt, (x_values, y_values)))
+
+    for field, candidates in ranked.items():
+        candidates.sort(key=lambda c: (-round(c[0], 3), c[1] != STANDARD_BYTES[field], c[1]))
+        ranked[field] = candidates
+        suggestions = []
+        for score, byte, fmt, values in candidates[:MAX_SUGGESTIONS]:
+            if field in PAIR_KEYS:
+                x, y = _describe(values[0], byte, fmt, score), _describe(values[1], byte + 4, fmt, score)
+                suggestions.append({"x": x, "y": y, "type": fmt, "score": round(score, 3)})
+            else:
+                suggestions.append(_describe(values, byte, fmt, score))
+        result["suggestions"][field] = suggestions
+
+    # Best candidate of each field, strongest first, without reusing header bytes
+    used = np.zeros(TRACE_HEADER_SIZE, dtype=bool)
+    best = sorted(((c[0], field, c) for field, candidates in ranked.items() for c in candidates[:MAX_SUGGESTIONS]),
+                  key=lambda item: -item[0])
+    for score, field, (_, byte, fmt, _) in best:
+        width = (2 if fmt == "int16" else 4) * (2 if field in PAIR_KEYS else 1)
+        if score < MIN_SCORE or field in result["field_types"] or used[byte - 1:byte - 1 + width].any():
+            continue
+        used[byte - 1:byte - 1 + width] = True
+        result["field_types"][field] = fmt
+        if field in PAIR_KEYS:
+            x_key, y_key = PAIR_KEYS[field]
+            result["field_mappings"].update({x_key: byte, y_key: byte + width // 2})
+        else:
+            result["field_mappings"][MAPPING_KEYS[field]] = byte
+            result["header_bytes"][field] = byte - 1
+    return result
+
+
+def discover_file_header_fields(file_path: str, max_traces: Optional[int] = MAX_SAMPLE_TRACES) -> Dict[str, Any]:
+    """
+    Header discovery for a SEG-Y file, run on its cached header index.
+
+    Returns:
+        dict: discover_header_fields result with error None, or {"error": message}
+    """
+    try:
+        index = SEGY_HANDLES.index(file_path)
+        result = discover_header_fields(index.table, max_traces)
+        save_index(index)
+        result["error"] = None
+        return result
+    except Exception as e:
+        return {"error": str(e)}
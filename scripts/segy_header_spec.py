@@ -0,0 +1,167 @@
+"""
+SEG-Y Header Field Specs
+Compiles a declarative header mapping (name -> 1-based byte, width, type and
+optional scalar field) into a single NumPy decode plan that can be applied to
+any set of traces at once, from a TraceHeaderTable or from raw header bytes
+"""
+
+from typing import Any, Dict, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from segy_header_table import (
+    TRACE_HEADER_SIZE, HEADER_FORMATS, TraceHeaderTable, convert_column, apply_scalar, column_key
+)
+
+# Byte width of each header word format
+FORMAT_WIDTHS = {"int16": 2, "uint16": 2, "int32": 4, "uint32": 4, "ibm": 4, "ieee": 4}
+
+# Names used by the UI and older readers: "2-bit"/"4-bit" are really 2-/4-byte integers
+TYPE_ALIASES = {
+    "2-bit": ("int", 2), "4-bit": ("int", 4),
+    "2-byte": ("int", 2), "4-byte": ("int", 4),
+    "int": ("int", None), "int16": ("int", 2), "int32": ("int", 4),
+    "uint": ("uint", None), "uint16": ("uint", 2), "uint32": ("uint", 4),
+    "ibm": ("ibm", 4), "ieee": ("ieee", 4),
+}
+FLOAT_NAMES = {"ibm": "IBM", "ieee": "IEEE"}
+
+
+class FieldSpec(NamedTuple):
+    """One header field: 1-based byte position, byte width, word format and optional scalar field"""
+    name: str
+    byte: int
+    width: int
+    format: str
+    scalar_byte: Optional[int] = None
+
+
+def resolve_format(field_type: str, width: Optional[int] = None) -> str:
+    """
+    Map a field type name and byte width to a header word format (see HEADER_FORMATS).
+
+    Integer types follow the width ("int32" with width 2 reads a signed 16-bit
+    word); IBM and IEEE floats are always 4 bytes wide.
+    """
+    key = str(field_type).lower()
+    if key not in TYPE_ALIASES:
+        raise ValueError(f"Unsupported header field type: {field_type}")
+    kind, type_width = TYPE_ALIASES[key]
+
+    if kind in FLOAT_NAMES:
+        if width not in (None, 4):
+            raise ValueError(f"{FLOAT_NAMES[kind]} format requires 4 bytes, but gap is {width}")
+        return kind
+    width = width or type_width or 4
+    if width not in (2, 4):
+        raise ValueError(f"Invalid gap {width} for {field_type} format")
+    return f"{kind}{8 * width}"
+
+
+def parse_field(name: str, spec: Union[int, Dict[str, Any], FieldSpec], default_type: str = "int32") -> FieldSpec:
+    """
+    Normalise one mapping entry: a 1-based byte position, or a dict with
+    "byte" and optional "width", "type" and "scalar" (1-based byte of a 16-bit scalar).
+    """
+    if isinstance(spec, FieldSpec):
+        return spec
+    if not isinstance(spec, dict):
+        spec = {"byte": spec}
+    byte = int(spec["byte"])
+    fmt = resolve_format(spec.get("type") or default_type, spec.get("width"))
+    if byte < 1 or byte - 1 + FORMAT_WIDTHS[fmt] > TRACE_HEADER_SIZE:
+        raise ValueError(f"Byte position {byte} for {name} is outside the trace header")
+    scalar = spec.get("scalar")
+    return FieldSpec(name, byte, FORMAT_WIDTHS[fmt], fmt, int(scalar) if scalar is not None else None)
+
+
+class DecodePlan:
+    """Compiled set of header fields, decoded together in one structured-dtype pass"""
+
+    def __init__(self, specs: Sequence[FieldSpec]):
+        self.specs = {spec.name: spec for spec in specs}
+
+        # Fields as TraceHeaderTable.decode expects them, plus the scalar words they need
+        self.fields = {spec.name: (spec.byte - 1, spec.format) for spec in specs}
+        self.scalars = {}
+        scalar_fields = {}
+        for spec in specs:
+            if spec.scalar_byte is not None:
+                key = column_key(spec.scalar_byte - 1, "int16")
+                self.scalars[spec.name] = key
+                scalar_fields[key] = (spec.scalar_byte - 1, "int16")
+
+        self._all_fields = {**self.fields, **scalar_fields}
+        keys = {column_key(offset, fmt): (offset, fmt) for offset, fmt in self._all_fields.values()}
+        self._dtype = np.dtype({
+            "names": list(keys),
+            "formats": [HEADER_FORMATS[fmt][0] for _, fmt in keys.values()],
+            "offsets": [offset for offset, _ in keys.values()],
+            "itemsize": TRACE_HEADER_SIZE,
+        })
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.specs
+
+    def _finish(self, raw: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Apply scalars to the decoded columns (raw: label or scalar key -> column)"""
+        values = {}
+        for name in self.fields:
+            column = raw[name]
+            if name in self.scalars:
+                column = apply_scalar(column, raw[self.scalars[name]])
+            values[name] = column
+        return values
+
+    def decode_table(self, table: TraceHeaderTable, traces=None) -> Dict[str, np.ndarray]:
+        """
+        Decode the plan for every trace of a table (or a selection of them).
+
+        Args:
+            table (TraceHeaderTable): Trace headers
+            traces: Optional index, slice or index array selecting traces
+
+        Returns:
+            dict: Field name -> column
+        """
+        columns = table.decode(self._all_fields)
+        if traces is not None:
+            columns = {label: column[traces] for label, column in columns.items()}
+        return self._finish(columns)
+
+    def decode_headers(self, headers) -> Dict[str, np.ndarray]:
+        """Decode the plan from raw 240-byte trace headers (bytes or an (n, 240) uint8 array)"""
+        if isinstance(headers, (bytes, bytearray, memoryview)):
+            headers = np.frombuffer(headers, dtype=np.uint8)
+        headers = np.ascontiguousarray(headers, dtype=np.uint8).reshape(-1)
+        if headers.size % TRACE_HEADER_SIZE:
+            raise ValueError(f"Trace headers must be multiples of {TRACE_HEADER_SIZE} bytes")
+        records = headers.view(self._dtype)
+        raw = {}
+        for label, (offset, fmt) in self._all_fields.items():
+            raw[label] = convert_column(records[column_key(offset, fmt)], fmt)
+        return self._finish(raw)
+
+
+def compile_fields(mapping: Dict[str, Union[int, Dict[str, Any], FieldSpec]], default_type: str = "int32",
+                   strict: bool = True) -> DecodePlan:
+    """
+    Compile a header mapping into a decode plan.
+
+    Args:
+        mapping (dict): Field name -> 1-based byte position, or dict with byte,
+            width, type and scalar (see parse_field)
+        default_type (str): Type of entries that do not give one
+        strict (bool): Raise ValueError on an invalid entry; otherwise it is left out of the plan
+
+    Returns:
+        DecodePlan: Plan decoding all fields at once
+    """
+    specs = []
+    for name, spec in mapping.items():
+        try:
+            specs.append(parse_field(name, spec, default_type))
+        except (ValueError, KeyError, TypeError):
+            if strict:
+                raise
+    return DecodePlan(specs)
@@ -0,0 +1,125 @@
+"""
+SEG-Y Header Statistics
+Full-range statistics of the trace numbering headers (FFID, shot point, CDP,
+inline, crossline) over every trace: min, max, unique count, monotonicity,
+step histogram and gaps, all computed with vectorized numpy on decoded columns
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from segy_header_table import TraceHeaderTable
+
+# Standard SEG-Y positions (0-based byte offset, format) of the numbering headers
+STAT_FIELDS = {
+    "FFID": (8, "int32"),       # Bytes 9-12
+    "ShotPoint": (16, "int32"),  # Bytes 17-20
+    "CDP": (20, "int32"),        # Bytes 21-24
+    "Inline": (188, "int32"),    # Bytes 189-192
+    "Xline": (192, "int32"),     # Bytes 193-196
+}
+
+MAX_STEP_HISTOGRAM = 10  # Most frequent trace-to-trace steps reported
+MAX_GAPS = 100           # Gaps reported (gap_count is always the full count)
+
+
+def _to_json_number(value):
+    value = value.item() if isinstance(value, np.generic) else value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _monotonicity(steps: np.ndarray) -> str:
+    if steps.size == 0 or not steps.any():
+        return "constant"
+    if (steps > 0).all():
+        return "increasing"
+    if (steps < 0).all():
+        return "decreasing"
+    if (steps >= 0).all():
+        return "non_decreasing"
+    if (steps <= 0).all():
+        return "non_increasing"
+    return "none"
+
+
+def column_statistics(values: np.ndarray) -> Dict[str, Any]:
+    """
+    Statistics of one header column (one value per trace, in trace order).
+
+    Returns:
+        dict: count, first, last, min, max, unique_count, monotonicity, reversals
+        (direction changes), step (most common non-zero step), step_histogram,
+        gap_count and gaps (missing value ranges between the sorted unique values)
+    """
+    values = np.asarray(values)
+    count = int(values.size)
+    if count == 0:
+        return {"count": 0, "first": None, "last": None, "min": None, "max": None, "unique_count": 0,
+                "monotonicity": "constant", "reversals": 0, "step": None, "step_histogram": [],
+                "gap_count": 0, "gaps": []}
+
+    work = values.astype(np.float64 if values.dtype.kind == "f" else np.int64)
+    steps = np.diff(work)
+
+    # Step histogram, most frequent first
+    step_values, step_counts = np.unique(steps, return_counts=True)
+    order = np.argsort(-step_counts, kind="stable")[:MAX_STEP_HISTOGRAM]
+    step_histogram = [{"step": _to_json_number(step_values[i]), "count": int(step_counts[i])} for i in order]
+
+    nonzero = step_counts[step_values != 0]
+    step = step_values[step_values != 0][np.argmax(nonzero)] if nonzero.size else None
+
+    # Direction changes between consecutive non-zero steps (reshoots, line turns)
+    signs = np.sign(steps[steps != 0])
+    reversals = int(np.count_nonzero(signs[1:] != signs[:-1]))
+
+    # Gaps: jumps between consecutive distinct values larger than the regular step
+    unique = np.unique(work)
+    gap_list: List[Dict[str, Any]] = []
+    gap_count = 0
+    if step is not None and unique.size > 1:
+        spacing = np.diff(unique)
+        stride = abs(step)
+        gap_at = np.nonzero(spacing > stride)[0]
+        gap_count = int(gap_at.size)
+        for i in gap_at[:MAX_GAPS]:
+            gap_list.append({
+                "after": _to_json_number(unique[i]),
+                "before": _to_json_number(unique[i + 1]),
+                "missing": _to_json_number(np.round(spacing[i] / stride) - 1),
+            })
+
+    return {
+        "count": count,
+        "first": _to_json_number(values[0]),
+        "last": _to_json_number(values[-1]),
+        "min": _to_json_number(values.min()),
+        "max": _to_json_number(values.max()),
+        "unique_count": int(unique.size),
+        "monotonicity": _monotonicity(steps),
+        "reversals": reversals,
+        "step": _to_json_number(step) if step is not None else None,
+        "step_histogram": step_histogram,
+        "gap_count": gap_count,
+        "gaps": gap_list,
+    }
+
+
+def header_statistics(columns: Dict[str, np.ndarray]) -> Dict[str, Dict[str, Any]]:
+    """Statistics for each decoded header column (label -> column)"""
+    return {label: column_statistics(column) for label, column in columns.items()}
+
+
+def standard_header_statistics(table: TraceHeaderTable, fields: Optional[Dict[str, tuple]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Decode the numbering headers of every trace in one header-only pass and
+    compute their statistics.
+
+    Args:
+        table (TraceHeaderTable): Trace headers of the file
+        fields (dict): Label -> (0-based byte offset, format) (default: STAT_FIELDS)
+    """
+    return header_statistics(table.decode(fields or STAT_FIELDS))
@@ -0,0 +1,256 @@
+"""
+SEG-Y Trace Header Table
+Memory-maps the trace region of a SEG-Y file with a strided structured dtype
+(one record per trace) so any set of header fields can be decoded for every
+trace in a single vectorized pass
+"""
+
+import os
+import struct
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from segy_float import ibm_to_float, ieee_to_float, decode_samples
+
+TEXT_HEADER_SIZE = 3200
+BINARY_HEADER_SIZE = 400
+TRACE_HEADER_SIZE = 240
+EXTENDED_HEADER_SIZE = 3200
+
+# Bytes per sample for each SEG-Y data sample format code
+SAMPLE_FORMAT_SIZES = {
+    1: 4,   # 4-byte IBM floating point
+    2: 4,   # 4-byte two's complement integer
+    3: 2,   # 2-byte two's complement integer
+    5: 4,   # 4-byte IEEE floating point
+    6: 8,   # 8-byte IEEE floating point
+    8: 1,   # 1-byte two's complement integer
+    9: 8,   # 8-byte two's complement integer
+    10: 4,  # 4-byte unsigned integer
+    11: 2,  # 2-byte unsigned integer
+    12: 8,  # 8-byte unsigned integer
+    16: 1,  # 1-byte unsigned integer
+}
+
+# Big-endian on-disk dtype and native output dtype for each header word format
+HEADER_FORMATS = {
+    "int32": (">i4", np.int32),
+    "uint32": (">u4", np.uint32),
+    "int16": (">i2", np.int16),
+    "uint16": (">u2", np.uint16),
+    "ieee": (">f4", np.float64),
+    "ibm": (">u4", np.float64),
+}
+
+
+def parse_binary_header(data: bytes) -> Dict[str, int]:
+    """
+    Parse the fields of the 400-byte binary header needed to lay out traces.
+
+    Args:
+        data (bytes): Raw binary header bytes
+
+    Returns:
+        dict: interval (us), samples, format code, revision and extended header count
+    """
+    if len(data) < BINARY_HEADER_SIZE:
+        raise ValueError("Binary header is truncated")
+    return {
+        "interval": struct.unpack(">H", data[16:18])[0],
+        "samples": struct.unpack(">H", data[20:22])[0],
+        "format": struct.unpack(">H", data[24:26])[0],
+        "revision": struct.unpack(">H", data[300:302])[0],
+        "extended_headers": struct.unpack(">h", data[304:306])[0],
+    }
+
+
+def decode_textual_header(raw: bytes) -> str:
+    """Decode the 3200-byte textual header, which may be EBCDIC or ASCII"""
+    # EBCDIC headers are mostly EBCDIC spaces (0x40), ASCII ones ASCII spaces (0x20)
+    if raw.count(0x40) > raw.count(0x20):
+        return raw.decode("cp037", errors="replace")
+    return raw.decode("ascii", errors="replace")
+
+
+def trace_layout(binary_header: Dict[str, int], first_trace_header: bytes = b"") -> Tuple[int, int, int]:
+    """
+    Work out data offset, samples per trace and trace size from the binary header.
+
+    Falls back to the sample count in the first trace header (bytes 115-116)
+    when the binary header does not carry one.
+
+    Returns:
+        tuple: (data_offset, nsamples, trace_size)
+    """
+    nsamples = binary_header["samples"]
+    if not nsamples and len(first_trace_header) >= 116:
+        nsamples = struct.unpack(">H", first_trace_header[114:116])[0]
+
+    sample_size = SAMPLE_FORMAT_SIZES.get(binary_header["format"], 4)
+    extended = max(binary_header.get("extended_headers", 0), 0)
+    data_offset = TEXT_HEADER_SIZE + BINARY_HEADER_SIZE + extended * EXTENDED_HEADER_SIZE
+    return data_offset, nsamples, TRACE_HEADER_SIZE + nsamples * sample_size
+
+
+def convert_column(raw: np.ndarray, fmt: str) -> np.ndarray:
+    """Convert a column of big-endian header words to the native output dtype of its format"""
+    if fmt == "ibm":
+        return ibm_to_float(raw)
+    if fmt == "ieee":
+        return ieee_to_float(raw)
+    return raw.astype(HEADER_FORMATS[fmt][1])
+
+
+def apply_scalar(values: np.ndarray, scalar: np.ndarray) -> np.ndarray:
+    """Scale header values: positive scalars multiply, negative ones divide, zero means 1"""
+    scalar = np.asarray(scalar).astype(np.float64)
+    factor = np.ones_like(scalar)
+    factor[scalar > 0] = scalar[scalar > 0]
+    factor[scalar < 0] = -1.0 / scalar[scalar < 0]
+    return np.asarray(values).astype(np.float64) * factor
+
+
+def column_key(byte_offset: int, fmt: str) -> str:
+    """Key under which a decoded header column is cached"""
+    return f"{byte_offset}_{fmt}"
+
+
+class TraceHeaderTable:
+    """
+    Vectorized view over all trace headers of a SEG-Y file.
+
+    Records are read straight from a memory map of the file (stride = trace
+    size) or from an in-memory block of 240-byte headers (stride = 240).
+    """
+
+    def __init__(self, buffer, ntraces: int, stride: int, offset: int = 0,
+                 binary_header: Optional[Dict[str, int]] = None, filepath: Optional[str] = None):
+        self._buffer = buffer
+        self.ntraces = ntraces
+        self.stride = stride
+        self.offset = offset
+        self.binary_header = binary_header or {}
+        self.filepath = filepath
+
+        self.nsamples = self.binary_header.get("samples", 0)
+        self.sample_format = self.binary_header.get("format", 1)
+        self.interval = self.binary_header.get("interval", 0)
+        self.trace_size = TRACE_HEADER_SIZE + self.nsamples * SAMPLE_FORMAT_SIZES.get(self.sample_format, 4)
+
+        # Decoded columns keyed by "<byte offset>_<format>", reused across decode() calls
+        self.columns = {}
+
+    @classmethod
+    def open(cls, filepath: str) -> "TraceHeaderTable":
+        """Memory-map a SEG-Y file and build a table over its trace headers"""
+        file_size = os.path.getsize(filepath)
+        if file_size < TEXT_HEADER_SIZE + BINARY_HEADER_SIZE:
+            raise ValueError(f"File too small to be SEG-Y: {filepath}")
+
+        mm = np.memmap(filepath, dtype=np.uint8, mode="r")
+        binary_header = parse_binary_header(bytes(mm[TEXT_HEADER_SIZE:TEXT_HEADER_SIZE + BINARY_HEADER_SIZE]))
+        first_header_start = TEXT_HEADER_SIZE + BINARY_HEADER_SIZE + max(binary_header["extended_headers"], 0) * EXTENDED_HEADER_SIZE
+        data_offset, nsamples, trace_size = trace_layout(
+            binary_header, bytes(mm[first_header_start:first_header_start + TRACE_HEADER_SIZE])
+        )
+        binary_header["samples"] = nsamples
+
+        ntraces = max(file_size - data_offset, 0) // trace_size
+        return cls(mm, ntraces, trace_size, data_offset, binary_header, filepath)
+
+    @classmethod
+    def from_headers(cls, headers, binary_header: Optional[Dict[str, int]] = None) -> "TraceHeaderTable":
+        """Build a table over an in-memory block of consecutive 240-byte trace headers"""
+        if isinstance(headers, (bytes, bytearray, memoryview)):
+            headers = np.frombuffer(headers, dtype=np.uint8)
+        headers = np.ascontiguousarray(headers, dtype=np.uint8).reshape(-1)
+        return cls(headers, headers.size // TRACE_HEADER_SIZE, TRACE_HEADER_SIZE, 0, binary_header)
+
+    def __len__(self):
+        return self.ntraces
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Release the underlying memory map"""
+        mm = getattr(self._buffer, "_mmap", None)
+        self._buffer = None
+        if mm is not None:
+            try:
+                mm.close()
+            except BufferError:
+                # Still referenced by a live view; the map is freed with it
+                pass
+
+    def records(self, dtype: np.dtype) -> np.ndarray:
+        """Return a zero-copy strided view of every trace record with the given structured dtype"""
+        if self._buffer is None:
+            raise ValueError("Trace header table is closed")
+        return np.ndarray(shape=(self.ntraces,), dtype=dtype, buffer=self._buffer, offset=self.offset)
+
+    def headers(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Return the raw 240-byte headers of traces [start, stop) as an (n, 240) uint8 array"""
+        dtype = np.dtype({"names": ["header"], "formats": [(np.uint8, TRACE_HEADER_SIZE)], "offsets": [0], "itemsize": self.stride})
+        return self.records(dtype)["header"][start:stop]
+
+    def decode(self, fields: Dict[str, Tuple[int, str]]) -> Dict[str, np.ndarray]:
+        """
+        Decode a set of header fields for every trace in one pass.
+
+        Args:
+            fields (dict): Label -> (0-based byte offset within the trace header, format),
+                format being one of HEADER_FORMATS
+
+        Returns:
+            dict: Label -> decoded column (one value per trace). Columns are
+            shared with the table's column cache and must not be modified.
+        """
+        keys = {}
+        names, formats, offsets = [], [], []
+        for label, (byte_offset, fmt) in fields.items():
+            if fmt not in HEADER_FORMATS:
+                raise ValueError(f"Unsupported header format: {fmt}")
+            disk_dtype = np.dtype(HEADER_FORMATS[fmt][0])
+            if byte_offset < 0 or byte_offset + disk_dtype.itemsize > TRACE_HEADER_SIZE:
+                raise ValueError(f"Byte offset {byte_offset} for {label} is outside the trace header")
+            keys[label] = column_key(byte_offset, fmt)
+            if keys[label] not in self.columns and keys[label] not in names:
+                names.append(keys[label])
+                formats.append(disk_dtype)
+                offsets.append(byte_offset)
+
+        if names:
+            records = self.records(np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": self.stride}))
+            for key in names:
+                self.columns[key] = convert_column(records[key], key.split("_", 1)[1])
+
+        return {label: self.columns[key] for label, key in keys.items()}
+
+    def field(self, byte_offset: int, fmt: str = "int32") -> np.ndarray:
+        """Decode a single header field for every trace"""
+        return self.decode({"value": (byte_offset, fmt)})["value"]
+
+
+def coordinate_error_field(source_x: np.ndarray, source_y: np.ndarray) -> Dict[str, Any]:
+    """
+    Build the reader error field from full Source_X / Source_Y columns.
+
+    Returns:
+        dict: {"type": ..., "message": ...} with type "zero_coordinates" when
+        one or both coordinates are zero on every trace
+    """
+    has_x = bool(np.any(source_x != 0))
+    has_y = bool(np.any(source_y != 0))
+
+    if not has_x and not has_y:
+        return {"type": "zero_coordinates", "message": "All Source_X and Source_Y are zero"}
+    if not has_x:
+        return {"type": "zero_coordinates", "message": "All Source_X are zero, but Source_Y has non-zero values"}
+    if not has_y:
+        return {"type": "zero_coordinates", "message": "All Source_Y are zero, but Source_X has non-zero values"}
+    return {"type": None, "message": None}
@@ -0,0 +1,251 @@
+"""
+SEG-Y Header Index Cache
+Persists the trace headers, decoded header columns, binary and textual headers
+and the file fingerprint of each SEG-Y file in a central cache directory, so a
+repeat open only reads the cache instead of the file
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from typing import Any, Dict, Optional, Callable
+
+import numpy as np
+
+from segy_header_table import (
+    TraceHeaderTable, TEXT_HEADER_SIZE, TRACE_HEADER_SIZE, SAMPLE_FORMAT_SIZES,
+    decode_textual_header, decode_samples
+)
+from segy_ingest import ingest_segy
+from file_fingerprint import FAST, FULL, FULL_HASH_QUEUE, stat_signature, get_file_unique_id
+
+INDEX_VERSION = 2
+
+# Set SEGY_INDEX_CACHE=0 to disable the cache entirely
+CACHE_ENABLED = os.environ.get("SEGY_INDEX_CACHE", "1") != "0"
+CACHE_DIR = os.environ.get(
+    "SEGY_INDEX_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "ed_loader_tester", "segy_index")
+)
+
+FIRST_SAMPLES_COUNT = 5
+
+
+class SegyIndex:
+    """Header index of one SEG-Y file: trace header table plus file-level metadata"""
+
+    def __init__(self, filepath: str, fingerprint: Dict[str, int], table: TraceHeaderTable,
+                 textual_header: str, first_samples, unique_ids: Optional[Dict[str, str]] = None,
+                 geometry: Optional[Dict[str, Any]] = None):
+        self.filepath = filepath
+        self.fingerprint = fingerprint
+        self.table = table
+        self.textual_header = textual_header
+        self.first_samples = first_samples
+        self.unique_ids = dict(unique_ids or {})  # Fingerprint mode -> unique_id
+        self.geometry = geometry  # 2D/3D geometry, see segy_geometry.get_geometry
+
+        self._saved_headers = False
+        self._saved_state = None
+
+    @property
+    def binary_header(self) -> Dict[str, int]:
+        return self.table.binary_header
+
+    @property
+    def unique_id(self) -> Optional[str]:
+        """Full SHA-256 of the content, if known"""
+        return self.unique_ids.get(FULL)
+
+    def get_unique_id(self, mode: str = FULL) -> Optional[str]:
+        """unique_id of the file for a fingerprint mode (see file_fingerprint)"""
+        return self.unique_ids.get(mode)
+
+    def _state(self):
+        return (tuple(sorted(self.unique_ids.items())), tuple(sorted(self.table.columns)), self.geometry is not None)
+
+    def is_dirty(self) -> bool:
+        """True when the index holds data that has not been written to the cache yet"""
+        return not self._saved_headers or self._state() != self._saved_state
+
+
+def _index_dir(filepath: str) -> str:
+    key = hashlib.sha1(os.path.abspath(filepath).encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, key)
+
+
+def _atomic_write(path: str, write: Callable):
+    """Write a cache file through a temp file so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def build_index(filepath: str, with_unique_id: bool = False) -> SegyIndex:
+    """
+    Read the headers of a SEG-Y file and build its index.
+
+    With with_unique_id the whole file is read once by the single-pass ingest,
+    which hashes it while collecting headers; otherwise only the header bytes
+    are touched through the memory map.
+    """
+    fingerprint = stat_signature(filepath)
+
+    if with_unique_id:
+        ingest = ingest_segy(filepath)
+        table = TraceHeaderTable.from_headers(ingest["headers"], ingest["binary_header"])
+        table.filepath = filepath
+        return SegyIndex(filepath, fingerprint, table, ingest["textual_header"],
+                         ingest["first_samples"], {FULL: ingest["unique_id"]})
+
+    with TraceHeaderTable.open(filepath) as source:
+        headers = np.array(source.headers())
+        binary_header = source.binary_header
+        first_samples_offset = source.offset + TRACE_HEADER_SIZE
+        has_traces = len(source) > 0
+
+    with open(filepath, "rb") as f:
+        textual_header = decode_textual_header(f.read(TEXT_HEADER_SIZE))
+        first_samples = []
+        if has_traces:
+            sample_size = SAMPLE_FORMAT_SIZES.get(binary_header["format"], 4)
+            count = min(FIRST_SAMPLES_COUNT, binary_header["samples"])
+            f.seek(first_samples_offset)
+            first_samples = decode_samples(f.read(count * sample_size), binary_header["format"]).tolist()
+
+    table = TraceHeaderTable.from_headers(headers, binary_header)
+    table.filepath = filepath
+    return SegyIndex(filepath, fingerprint, table, textual_header, first_samples)
+
+
+def load_index(filepath: str) -> Optional[SegyIndex]:
+    """Load the cached index of a file, or None if missing or stale"""
+    if not CACHE_ENABLED:
+        return None
+    index_dir = _index_dir(filepath)
+    try:
+        with open(os.path.join(index_dir, "meta.json"), "r") as f:
+            meta = json.load(f)
+        if meta.get("version") != INDEX_VERSION or meta.get("fingerprint") != stat_signature(filepath):
+            return None
+
+        headers = np.load(os.path.join(index_dir, "headers.npy"), mmap_mode="r")
+        table = TraceHeaderTable.from_headers(headers, meta["binary_header"])
+        table.filepath = filepath
+        columns_path = os.path.join(index_dir, "columns.npz")
+        if os.path.exists(columns_path):
+            with np.load(columns_path) as columns:
+                table.columns.update({key: columns[key] for key in columns.files})
+    except (OSError, ValueError, KeyError):
+        return None
+
+    index = SegyIndex(filepath, meta["fingerprint"], table, meta["textual_header"],
+                      meta["first_samples"], meta.get("unique_ids"), meta.get("geometry"))
+    index._saved_headers = True
+    index._saved_state = index._state()
+    return index
+
+
+def save_index(index: SegyIndex):
+    """Write an index to the cache; failures are ignored since the cache is best effort"""
+    if not CACHE_ENABLED or not index.is_dirty():
+        return
+    index_dir = _index_dir(index.filepath)
+    try:
+        os.makedirs(index_dir, exist_ok=True)
+        if not index._saved_headers:
+            _atomic_write(os.path.join(index_dir, "headers.npy"),
+                          lambda f: np.save(f, np.asarray(index.table.headers())))
+        _atomic_write(os.path.join(index_dir, "columns.npz"),
+                      lambda f: np.savez(f, **index.table.columns))
+
+        meta = {
+            "version": INDEX_VERSION,
+            "filepath": os.path.abspath(index.filepath),
+            "fingerprint": index.fingerprint,
+            "unique_ids": index.unique_ids,
+            "binary_header": index.binary_header,
+            "textual_header": index.textual_header,
+            "first_samples": list(index.first_samples),
+            "geometry": index.geometry,
+        }
+        # meta.json goes last: it carries the fingerprint that makes the entry valid
+        _atomic_write(os.path.join(index_dir, "meta.json"),
+                      lambda f: f.write(json.dumps(meta).encode("utf-8")))
+        index._saved_headers = True
+        index._saved_state = index._state()
+    except OSError:
+        pass
+
+
+def get_segy_index(filepath: str, unique_id_mode: Optional[str] = None) -> SegyIndex:
+    """
+    Return the header index of a SEG-Y file, from the cache when it is still valid.
+
+    Args:
+        filepath (str): Path to the SEG-Y file
+        unique_id_mode (str): Make sure the index carries the file's unique_id for
+            this fingerprint mode. "full" (SHA-256 of the content) is computed in
+            the same pass as the headers; "tree" hashes chunks in parallel and
+            "fast" only samples a few blocks. None skips the unique_id.
+
+    Returns:
+        SegyIndex: Index of the file
+    """
+    index = load_index(filepath)
+    if index is None or (unique_id_mode == FULL and index.unique_id is None):
+        known_ids = index.unique_ids if index is not None else {}
+        index = build_index(filepath, with_unique_id=unique_id_mode == FULL)
+        index.unique_ids = {**known_ids, **index.unique_ids}
+    if unique_id_mode is not None and unique_id_mode not in index.unique_ids:
+        index.unique_ids[unique_id_mode] = get_file_unique_id(filepath, unique_id_mode)
+    save_index(index)
+    return index
+
+
+def store_full_hash(filepath: str, unique_id: str):
+    """Record a full hash computed later (e.g. by FULL_HASH_QUEUE) in the cached index"""
+    index = load_index(filepath)
+    if index is not None and index.unique_id is None:
+        index.unique_ids[FULL] = unique_id
+        save_index(index)
+
+
+def unique_id_fields(index: SegyIndex, unique_id_mode: str) -> Dict[str, Optional[str]]:
+    """
+    Extra result fields for a fast unique_id: the mode, and the full hash when
+    it is already known (otherwise None until a follow-up lookup supplies it)
+    """
+    if unique_id_mode != FAST:
+        return {}
+    return {"unique_id_mode": FAST, "unique_id_full": index.unique_id}
+
+
+def queue_full_hash(filepath: str) -> Dict[str, Any]:
+    """
+    Queue the full hash of a file that was given a fast unique_id; the result
+    is written back to the cached index when ready
+
+    Returns:
+        dict: Current full_hash_status of the file
+    """
+    status = full_hash_status(filepath)
+    if status["status"] in ("not_queued", "stale", "error"):
+        FULL_HASH_QUEUE.submit(filepath, on_done=store_full_hash)
+        status = full_hash_status(filepath)
+    return status
+
+
+def full_hash_status(filepath: str) -> Dict[str, Any]:
+    """Follow-up lookup of a deferred full hash, from the cached index or the background queue"""
+    index = load_index(filepath)
+    if index is not None and index.unique_id is not None:
+        return {"status": "done", "unique_id_full": index.unique_id}
+    return FULL_HASH_QUEUE.status(filepath)
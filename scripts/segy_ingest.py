@@ -0,0 +1,136 @@
+"""
+Single-Pass SEG-Y Ingest
+Reads a SEG-Y file once, front to back, with large buffered reads. The same
+bytes feed the content hash, the textual/binary header parsers, the trace
+header collector and the first trace samples
+"""
+
+import os
+import hashlib
+from typing import Dict, Any, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from segy_header_table import (
+    TEXT_HEADER_SIZE, BINARY_HEADER_SIZE, TRACE_HEADER_SIZE, EXTENDED_HEADER_SIZE, SAMPLE_FORMAT_SIZES,
+    parse_binary_header, trace_layout, decode_textual_header, decode_samples
+)
+
+READ_CHUNK_SIZE = 8 * 1024 * 1024  # 8 MB per read
+FIRST_SAMPLES_COUNT = 5
+
+
+def _copy_overlap(data: np.ndarray, data_start: int, dest: np.ndarray, dest_start: int):
+    """Copy the part of a chunk (at file offset data_start) that overlaps dest (at file offset dest_start)"""
+    lo = max(data_start, dest_start)
+    hi = min(data_start + len(data), dest_start + len(dest))
+    if lo < hi:
+        dest[lo - dest_start:hi - dest_start] = data[lo - data_start:hi - data_start]
+
+
+class _HeaderCollector:
+    """Collects every 240-byte trace header and the first samples from consecutive chunks"""
+
+    def __init__(self, file_size: int, prefix: bytes):
+        self.binary_header = parse_binary_header(prefix[TEXT_HEADER_SIZE:TEXT_HEADER_SIZE + BINARY_HEADER_SIZE])
+        first_header_start = TEXT_HEADER_SIZE + BINARY_HEADER_SIZE + max(self.binary_header["extended_headers"], 0) * EXTENDED_HEADER_SIZE
+        self.data_offset, nsamples, self.trace_size = trace_layout(
+            self.binary_header, prefix[first_header_start:first_header_start + TRACE_HEADER_SIZE]
+        )
+        self.binary_header["samples"] = nsamples
+        self.ntraces = max(file_size - self.data_offset, 0) // self.trace_size
+        self.headers = np.empty((self.ntraces, TRACE_HEADER_SIZE), dtype=np.uint8)
+
+        sample_size = SAMPLE_FORMAT_SIZES.get(self.binary_header["format"], 4)
+        first_count = min(FIRST_SAMPLES_COUNT, nsamples) if self.ntraces else 0
+        self.first_samples_raw = np.zeros(first_count * sample_size, dtype=np.uint8)
+        self.first_samples_start = self.data_offset + TRACE_HEADER_SIZE
+
+    def feed(self, data: np.ndarray, start: int):
+        """Take everything needed from a chunk of the file starting at byte offset start"""
+        end = start + len(data)
+        _copy_overlap(data, start, self.first_samples_raw, self.first_samples_start)
+        if not self.ntraces or end <= self.data_offset:
+            return
+
+        # Traces whose header overlaps [start, end)
+        first = max(0, -(-(start - self.data_offset - TRACE_HEADER_SIZE + 1) // self.trace_size))
+        last = min(self.ntraces - 1, (end - 1 - self.data_offset) // self.trace_size)
+        if first > last:
+            return
+
+        # Headers fully inside the chunk are copied as one strided block
+        full_first = max(first, -(-(start - self.data_offset) // self.trace_size))
+        full_last = min(last, (end - TRACE_HEADER_SIZE - self.data_offset) // self.trace_size)
+        if full_first <= full_last:
+            offset = self.data_offset + full_first * self.trace_size - start
+            count = full_last - full_first + 1
+            self.headers[full_first:full_last + 1] = as_strided(
+                data[offset:], shape=(count, TRACE_HEADER_SIZE), strides=(self.trace_size, 1)
+            )
+
+        # Headers cut by a chunk boundary are copied piece by piece
+        for trace in {first, last}:
+            if not full_first <= trace <= full_last:
+                _copy_overlap(data, start, self.headers[trace], self.data_offset + trace * self.trace_size)
+
+
+def ingest_segy(filepath: str, hasher=None, chunk_size: int = READ_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Read a SEG-Y file in a single sequential pass.
+
+    Args:
+        filepath (str): Path to the SEG-Y file
+        hasher: hashlib-style object fed with every byte (default: SHA-256)
+        chunk_size (int): Bytes per read
+
+    Returns:
+        dict: binary_header, textual_header, headers ((ntraces, 240) uint8 array),
+        first_samples and unique_id (hex digest of hasher)
+    """
+    hasher = hasher if hasher is not None else hashlib.sha256()
+    file_size = os.path.getsize(filepath)
+
+    buffer = bytearray(max(chunk_size, TEXT_HEADER_SIZE + BINARY_HEADER_SIZE))
+    view = memoryview(buffer)
+    prefix = bytearray()
+    textual_header = None
+    collector: Optional[_HeaderCollector] = None
+    position = 0
+
+    with open(filepath, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            chunk = view[:n]
+            hasher.update(chunk)
+
+            if collector is None:
+                # Hold on to the leading bytes until the file layout can be parsed
+                prefix += chunk
+                needed = TEXT_HEADER_SIZE + BINARY_HEADER_SIZE
+                if len(prefix) >= needed:
+                    extended = max(parse_binary_header(bytes(prefix[TEXT_HEADER_SIZE:needed]))["extended_headers"], 0)
+                    needed += extended * EXTENDED_HEADER_SIZE + TRACE_HEADER_SIZE
+                if len(prefix) >= needed or position + n >= file_size:
+                    textual_header = decode_textual_header(bytes(prefix[:TEXT_HEADER_SIZE]))
+                    collector = _HeaderCollector(file_size, bytes(prefix[:needed]))
+                    collector.feed(np.frombuffer(prefix, dtype=np.uint8), 0)
+                    prefix = None
+            else:
+                collector.feed(np.frombuffer(chunk, dtype=np.uint8), position)
+            position += n
+
+    if collector is None:
+        raise ValueError(f"File too small to be SEG-Y: {filepath}")
+
+    first_samples = decode_samples(collector.first_samples_raw.tobytes(), collector.binary_header["format"])
+    return {
+        "binary_header": collector.binary_header,
+        "textual_header": textual_header,
+        "headers": collector.headers,
+        "first_samples": first_samples.tolist(),
+        "unique_id": hasher.hexdigest(),
+    }
@@ -0,0 +1,144 @@
+"""
+SEG-Y Prefetch
+Read-ahead for viewers scrolling through a section: the trace windows each
+client requests from a file are tracked, and once a client moves through the
+file in one direction the next windows are decoded into the block cache on a
+background thread, so the next scroll step is served from memory
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from segy_block_cache import TRACE_BLOCKS, TraceBlockCache
+from segy_handle_cache import SEGY_HANDLES, HandleCache
+
+# Windows read ahead once access is sequential; 0 disables prefetching
+PREFETCH_WINDOWS = int(os.environ.get("SEGY_PREFETCH_WINDOWS", "2"))
+PREFETCH_WORKERS = int(os.environ.get("SEGY_PREFETCH_WORKERS", "1"))
+# Consecutive steps in one direction before reading ahead
+SEQUENTIAL_STEPS = 2
+MAX_STREAMS = 64  # (client, file) pairs tracked at once
+
+
+class _Stream:
+    """Last window a client read from a file and how long it has moved in one direction"""
+
+    def __init__(self, start_trace: int, end_trace: int, samples):
+        self.start_trace = start_trace
+        self.end_trace = end_trace
+        self.samples = samples
+        self.direction = 0
+        self.steps = 0
+
+
+class ReadAhead:
+    """Detects sequential trace windows per client and file and prefetches the next ones"""
+
+    def __init__(self, windows: int = PREFETCH_WINDOWS, workers: int = PREFETCH_WORKERS,
+                 blocks: TraceBlockCache = TRACE_BLOCKS, handles: HandleCache = SEGY_HANDLES):
+        self.windows = windows
+        self.workers = workers
+        self.blocks = blocks
+        self.handles = handles
+        self._streams: "OrderedDict[tuple, _Stream]" = OrderedDict()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.scheduled = 0
+        self.completed = 0
+        self.failed = 0
+
+    def observe(self, client: str, file_path: str, start_trace: int, end_trace: int, total_traces: int,
+                start_sample: int, end_sample: int) -> int:
+        """
+        Record a window a client just read and prefetch ahead when access is sequential.
+
+        A step is sequential when the window keeps its size and sample range and
+        moves forward (start past the previous start) or backward. After
+        SEQUENTIAL_STEPS such steps the next windows in that direction are queued.
+
+        Returns:
+            int: Number of windows queued for prefetching
+        """
+        if self.windows <= 0:
+            return 0
+        samples = (start_sample, end_sample)
+        key = (client, os.path.realpath(file_path))
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None or stream.samples != samples or \
+                    stream.end_trace - stream.start_trace != end_trace - start_trace:
+                stream = _Stream(start_trace, end_trace, samples)
+            else:
+                # A repeated window keeps the run; a turn starts a new one
+                direction = (start_trace > stream.start_trace) - (start_trace < stream.start_trace)
+                if direction:
+                    stream.steps = stream.steps + 1 if direction == stream.direction else 1
+                    stream.direction = direction
+                stream.start_trace, stream.end_trace = start_trace, end_trace
+            self._streams[key] = stream
+            self._streams.move_to_end(key)
+            while len(self._streams) > MAX_STREAMS:
+                self._streams.popitem(last=False)
+            if stream.steps < SEQUENTIAL_STEPS:
+                return 0
+
+            width = end_trace - start_trace
+            queued = 0
+            for n in range(1, self.windows + 1):
+                first = start_trace + stream.direction * n * width
+                last = min(first + width, total_traces)
+                first = max(first, 0)
+                if first >= last:
+                    break
+                job = (key[1], first, last, start_sample, end_sample)
+                if job in self._pending:
+                    continue
+                self._pending.add(job)
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="segy-prefetch")
+                self._pool.submit(self._prefetch, job)
+                self.scheduled += 1
+                queued += 1
+            return queued
+
+    def _prefetch(self, job):
+        file_path, start_trace, end_trace, start_sample, end_sample = job
+        succeeded = False
+        try:
+            with self.handles.table(file_path) as table:
+                self.blocks.warm(table, start_trace, end_trace, start_sample, end_sample)
+            succeeded = True
+        except Exception:
+            pass  # Best effort: the request itself reads the window when it comes
+        finally:
+            with self._lock:
+                self._pending.discard(job)
+                if succeeded:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "windows": self.windows,
+                "streams": len(self._streams),
+                "pending": len(self._pending),
+                "scheduled": self.scheduled,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+
+# Process-wide read-ahead used by /api/seismic_data
+READ_AHEAD = ReadAhead()
@@ -1,249 +1,145 @@
 import os
-import segyio
-import pandas as pd
-import utm
 import json
-import numpy as np
-from pathlib import Path
-import re
 import sys
-import hashlib
+from segy_header_table import coordinate_error_field
+from segy_header_stats import header_statistics
+from segy_coordinate_report import coordinate_report
+from segy_geometry import get_geometry, geometry_summary
+from segy_index_cache import get_segy_index, save_index, unique_id_fields
+from file_fingerprint import DEFAULT_MODE
+from batch_runner import iter_batch
+from fingerprint_store import iter_with_store, process_with_store
+from ndjson_output import stream_results, stream_error
 
-# Optional: show all DataFrame content
-pd.set_option("display.max_rows", None)
-pd.set_option("display.max_columns", None)
-pd.set_option("display.width", 0)
+# Version of this reader's result shape; bump it whenever fields are added,
+# removed or change meaning so results stored by older versions are not served
+RESULT_VERSION = 4
+# Fingerprint store key of this reader's results
+STORE_READER = f"segy_read_from_list/v{RESULT_VERSION}/{DEFAULT_MODE}"
+FILE_LIST_PATH = "scripts/data/segy_list.txt"  # Hardcoded file list path
 
-# Add missing trace field if needed
-if not hasattr(segyio.TraceField, "SourcePoint"):
-    segyio.TraceField.SourcePoint = 17
+# Labels used for the first/last trace values of each standard header
+RANGE_LABELS = {
+    "FFID": "FFID",
+    "ShotPoint": "SP",
+    "CDP": "CDP",
+    "Inline": "Inline",
+    "Xline": "Xline",
+}
+
+def extract_header_bytes(table, byte_indices):
+    # Decode the requested headers and source coordinates for every trace in one pass
+    fields = {label: (idx, "uint32") for label, idx in byte_indices.items()}
+    fields["Source_X"] = (72, "int32")  # Bytes 73-76
+    fields["Source_Y"] = (76, "int32")  # Bytes 77-80
+
+    num_traces = len(table)
+    columns = table.decode(fields)
 
-def extract_header_bytes(filepath, byte_indices):
     values = {}
-    all_source_x_zero = True
-    all_source_y_zero = True
-    has_source_x_non_zero = False
-    has_source_y_non_zero = False
+    for label, column in columns.items():
+        values[label] = int(column[0]) if num_traces > 0 else None
 
-    with open(filepath, "rb") as f:
-        # Read the first trace header for initial values
-        f.seek(3200 + 400)  # Skip to first trace header
-        
-        # Basic header values
-        for label, idx in byte_indices.items():
-            f.seek(3200 + 400 + idx)  # 3200 for textual header, 400 for binary header
-            byte = f.read(4)
-            if len(byte) == 4:
-                values[label] = int.from_bytes(byte, byteorder='big', signed=False)
-            else:
-                values[label] = None
-        
-        # Get source coordinates from first trace
-        f.seek(3200 + 400 + 72)  # Source X (bytes 73-76)
-        source_x_bytes = f.read(4)
-        f.seek(3200 + 400 + 76)  # Source Y (bytes 77-80)
-        source_y_bytes = f.read(4)
-        
-        values["Source_X"] = int.from_bytes(source_x_bytes, byteorder='big', signed=True) if len(source_x_bytes) == 4 else None
-        values["Source_Y"] = int.from_bytes(source_y_bytes, byteorder='big', signed=True) if len(source_y_bytes) == 4 else None
-        
-        # Update flags for first trace
-        if values["Source_X"] != 0:
-            all_source_x_zero = False
-            has_source_x_non_zero = True
-        if values["Source_Y"] != 0:
-            all_source_y_zero = False
-            has_source_y_non_zero = True
+    if num_traces > 1:
+        for label, range_label in RANGE_LABELS.items():
+            if label in columns:
+                values[f"First_{range_label}"] = values.get(label)
+                values[f"Last_{range_label}"] = int(columns[label][-1])
+        values["Last_Source_X"] = int(columns["Source_X"][-1])
+        values["Last_Source_Y"] = int(columns["Source_Y"][-1])
 
-        # Get file size and calculate number of traces
-        file_size = os.path.getsize(filepath)
-        f.seek(3200 + 400 + 114)  # Move to number of samples in trace header (bytes 115-116)
-        num_samples_bytes = f.read(2)
-        num_samples = int.from_bytes(num_samples_bytes, byteorder='big', signed=False) if len(num_samples_bytes) == 2 else 0
-        
-        trace_size = 240 + (num_samples * 4)  # 240 for trace header + (num_samples * 4 bytes per sample)
-        num_traces = (file_size - 3600) // trace_size if trace_size > 0 else 0
-        
-        if num_traces > 1:
-            # Sample traces to check coordinates (check first 10, middle, and last 10)
-            sample_traces = []
-            if num_traces <= 20:
-                sample_traces = list(range(num_traces))
-            else:
-                sample_traces = (list(range(10)) + 
-                               [num_traces // 2] + 
-                               list(range(max(10, num_traces - 10), num_traces)))
-            
-            for trace_idx in sample_traces:
-                trace_pos = 3600 + (trace_size * trace_idx)
-                f.seek(trace_pos + 72)  # Source X
-                src_x = int.from_bytes(f.read(4), byteorder='big', signed=True)
-                f.seek(trace_pos + 76)  # Source Y
-                src_y = int.from_bytes(f.read(4), byteorder='big', signed=True)
-                if src_x != 0:
-                    all_source_x_zero = False
-                    has_source_x_non_zero = True
-                if src_y != 0:
-                    all_source_y_zero = False
-                    has_source_y_non_zero = True
-                # Early exit if both coordinates have non-zero values
-                if not all_source_x_zero and not all_source_y_zero:
-                    break
-            
-            # Read last trace header for final values
-            last_trace_pos = 3600 + (trace_size * (num_traces - 1))
-            
-            # Field Record numbers
-            f.seek(last_trace_pos + 8)
-            last_ffid = int.from_bytes(f.read(4), byteorder='big', signed=False)
-            values["First_FFID"] = values.get("FFID")
-            values["Last_FFID"] = last_ffid
-            
-            # Shot points
-            f.seek(last_trace_pos + 16)
-            last_sp = int.from_bytes(f.read(4), byteorder='big', signed=False)
-            values["First_SP"] = values.get("ShotPoint")
-            values["Last_SP"] = last_sp
-            
-            # CDP numbers
-            f.seek(last_trace_pos + 20)
-            last_cdp = int.from_bytes(f.read(4), byteorder='big', signed=False)
-            values["First_CDP"] = values.get("CDP")
-            values["Last_CDP"] = last_cdp
-            
-            # Inline numbers
-            f.seek(last_trace_pos + 188)
-            last_inline = int.from_bytes(f.read(4), byteorder='big', signed=False)
-            values["First_Inline"] = values.get("Inline")
-            values["Last_Inline"] = last_inline
-            
-            # Crossline numbers
-            f.seek(last_trace_pos + 192)
-            last_xline = int.from_bytes(f.read(4), byteorder='big', signed=False)
-            values["First_Xline"] = values.get("Xline")
-            values["Last_Xline"] = last_xline
-            
-            # Last source coordinates
-            f.seek(last_trace_pos + 72)
-            last_source_x = int.from_bytes(f.read(4), byteorder='big', signed=True)
-            f.seek(last_trace_pos + 76)
-            last_source_y = int.from_bytes(f.read(4), byteorder='big', signed=True)
-            
-            values["Last_Source_X"] = last_source_x
-            values["Last_Source_Y"] = last_source_y
-            
-            # Update flags for last trace
-            if last_source_x != 0:
-                all_source_x_zero = False
-                has_source_x_non_zero = True
-            if last_source_y != 0:
-                all_source_y_zero = False
-                has_source_y_non_zero = True
-    
-    # Set error_field based on coordinate checks
-    error_field = {
-        "type": None,
-        "message": None
+    # Coordinates are checked on every trace rather than a sample
+    error_field = coordinate_error_field(columns["Source_X"], columns["Source_Y"])
+
+    # Full-range statistics and coordinate checks over every trace
+    reports = {
+        "header_statistics": header_statistics({label: columns[label] for label in byte_indices}),
+        "coordinate_report": coordinate_report(table),
     }
-    if all_source_x_zero and all_source_y_zero:
-        error_field = {
-            "type": "zero_coordinates",
-            "message": "All Source_X and Source_Y are zero"
-        }
-    elif all_source_x_zero and has_source_y_non_zero:
-        error_field = {
-            "type": "zero_coordinates",
-            "message": "All Source_X are zero, but Source_Y has non-zero values"
-        }
-    elif all_source_y_zero and has_source_x_non_zero:
-        error_field = {
-            "type": "zero_coordinates",
-            "message": "All Source_Y are zero, but Source_X has non-zero values"
-        }
-    
-    return values, error_field
 
-def get_file_unique_id(filepath):
-    hash_sha256 = hashlib.sha256()
-    with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_sha256.update(chunk)
-    return hash_sha256.hexdigest()
+    return values, error_field, reports
 
-def read_segy(filepath):
+def read_segy(filepath, unique_id_mode=DEFAULT_MODE):
     try:
-        unique_id = get_file_unique_id(filepath)
-        file_size = os.path.getsize(filepath)
-        with segyio.open(filepath, "r", ignore_geometry=True) as segyfile:
-            ntraces = segyfile.tracecount
-            nsamples = segyfile.samples.size
-            interval = segyfile.bin[segyio.BinField.Interval]
-            first5_samples = segyfile.trace[0][:5].tolist()
-            header_bytes = {
-                "FFID": 8,
-                "ShotPoint": 16,
-                "CDP": 20,
-                "Inline": 188,
-                "Xline": 192,
-            }
-            header_values, error_field = extract_header_bytes(filepath, header_bytes)
-            
-            # Format the header values to match SegyTable.vue field names
-            formatted_headers = {
-                "FSP": header_values.get("First_SP"),
-                "LSP": header_values.get("Last_SP"),
-                "First_CDP": header_values.get("First_CDP"),
-                "Last_CDP": header_values.get("Last_CDP"),
-                "Inline": header_values.get("First_Inline"),
-                "Xline": header_values.get("First_Xline"),
-            }
-            
-            # Get the parent folder name and base file name
-            folder_name = os.path.basename(os.path.dirname(filepath))
-            composite_file_name = os.path.basename(filepath)
+        # Header index from the cache, or built from the file on first open
+        index = get_segy_index(filepath, unique_id_mode)
+        table = index.table
+        unique_id = index.get_unique_id(unique_id_mode)
+        file_size = index.fingerprint["size"]
+        ntraces = len(table)
+        nsamples = table.nsamples
+        interval = table.interval
+        first5_samples = index.first_samples
+        header_bytes = {
+            "FFID": 8,
+            "ShotPoint": 16,
+            "CDP": 20,
+            "Inline": 188,
+            "Xline": 192,
+        }
+        header_values, error_field, reports = extract_header_bytes(table, header_bytes)
+        geometry = geometry_summary(get_geometry(index))
+        save_index(index)  # Persist any newly decoded columns
+        
+        # Format the header values to match SegyTable.vue field names
+        formatted_headers = {
+            "FSP": header_values.get("First_SP"),
+            "LSP": header_values.get("Last_SP"),
+            "First_CDP": header_values.get("First_CDP"),
+            "Last_CDP": header_values.get("Last_CDP"),
+            "Inline": header_values.get("First_Inline"),
+            "Xline": header_values.get("First_Xline"),
+        }
+        
+        # Get the parent folder name and base file name
+        folder_name = os.path.basename(os.path.dirname(filepath))
+        composite_file_name = os.path.basename(filepath)
 
-            # Attempt to remove the parent folder name prefix and leading separators if present
-            actual_file_name = composite_file_name
-            if composite_file_name.startswith(folder_name):
-                actual_file_name = composite_file_name[len(folder_name):]
-                # Remove leading separators if any remain (like _, -)
-                while actual_file_name and actual_file_name[0] in ('_', '-'):
-                    actual_file_name = actual_file_name[1:]
+        # Attempt to remove the parent folder name prefix and leading separators if present
+        actual_file_name = composite_file_name
+        if composite_file_name.startswith(folder_name):
+            actual_file_name = composite_file_name[len(folder_name):]
+            # Remove leading separators if any remain (like _, -)
+            while actual_file_name and actual_file_name[0] in ('_', '-'):
+                actual_file_name = actual_file_name[1:]
 
-            return {
-                "folder_name": folder_name,
-                "composite_file_name": composite_file_name,
-                "file_name": actual_file_name,
-                "edafy_seismic_id": "",
-                "seismic_name": os.path.splitext(actual_file_name)[0],
-                "extensionType": "SEGY",
-                "category": "",
-                "subcategory": "",
-                "description": "",
-                "item": "",
-                "remarks": "",
-                "created_for": "",
-                "created_by": "",
-                "created_date": "",
-                "first_field_file": str(header_values.get("First_FFID")),
-                "last_field_file": str(header_values.get("Last_FFID")),
-                "bin_spacing": "",
-                "first_trc": "1",
-                "last_trc": str(ntraces),
-                "ntraces": ntraces,
-                "sample_type": "4-byte IBM floating point",
-                "sample_rate": interval / 1000,
-                "sample_rate_uom": "seconds",
-                "record_length": nsamples * interval / 1000,
-                "record_length_uom": "seconds",
-                "file_windows_path": filepath.replace('/', '\\'),
-                "file_unix_path": filepath.replace('\\', '/'),
-                "file_size_bytes": file_size,
-                "header_values": formatted_headers,
-                "unique_id": unique_id,
-                "first5_samples": first5_samples,
-                "error": error_field
-            }
+        return {
+            "folder_name": folder_name,
+            "composite_file_name": composite_file_name,
+            "file_name": actual_file_name,
+            "edafy_seismic_id": "",
+            "seismic_name": os.path.splitext(actual_file_name)[0],
+            "extensionType": "SEGY",
+            "category": "",
+            "subcategory": "",
+            "description": "",
+            "item": "",
+            "remarks": "",
+            "created_for": "",
+            "created_by": "",
+            "created_date": "",
+            "first_field_file": str(header_values.get("First_FFID")),
+            "last_field_file": str(header_values.get("Last_FFID")),
+            "bin_spacing": "",
+            "first_trc": "1",
+            "last_trc": str(ntraces),
+            "ntraces": ntraces,
+            "sample_type": "4-byte IBM floating point",
+            "sample_rate": interval / 1000,
+            "sample_rate_uom": "seconds",
+            "record_length": nsamples * interval / 1000,
+            "record_length_uom": "seconds",
+            "file_windows_path": filepath.replace('/', '\\'),
+            "file_unix_path": filepath.replace('\\', '/'),
+            "file_size_bytes": file_size,
+            "header_values": formatted_headers,
+            **reports,
+            "geometry": geometry,
+            "unique_id": unique_id,
+            **unique_id_fields(index, unique_id_mode),
+            "first5_samples": first5_samples,
+            "error": error_field
+        }
     except Exception as e:
         return {
             "file_name": os.path.basename(filepath),
@@ -254,14 +150,19 @@ def read_segy(filepath):
             "header_values": {}
         }
 
-def process_file_list(file_path):
+def list_segy_files(file_path):
+    with open(file_path, 'r') as f:
+        filepaths = [line.strip() for line in f]
+    return [p for p in filepaths if p.lower().endswith((".sgy", ".segy")) and os.path.isfile(p)]
+
+def process_file_list(file_path, workers=None, executor="process"):
     results = []
     try:
-        with open(file_path, 'r') as f:
-            for line in f:
-                filepath = line.strip()
-                if filepath.lower().endswith((".sgy", ".segy")) and os.path.isfile(filepath):
-                    results.append(read_segy(filepath))
+        filepaths = list_segy_files(file_path)
+        # Unchanged files come from the fingerprint store; the rest are scanned in
+        # parallel and results keep the order of the list
+        results = process_with_store(STORE_READER, filepaths,
+                                     lambda paths: iter_batch(read_segy, paths, workers, executor=executor))
     except Exception as e:
         results.append({
             "error": {
@@ -271,15 +172,37 @@ def process_file_list(file_path):
         })
     return results
 
+def stream_file_list(file_path, workers=None, executor="process", emit=None):
+    # NDJSON records are written (or passed to emit) as each file completes, so
+    # memory stays flat; returns the writer, or None when the list is unreadable
+    try:
+        filepaths = list_segy_files(file_path)
+    except Exception as e:
+        stream_error({
+            "type": "file_list_error",
+            "message": f"Failed to read file list: {str(e)}"
+        }, emit=emit)
+        return None
+    return stream_results(iter_with_store(STORE_READER, filepaths,
+                                          lambda paths: iter_batch(read_segy, paths, workers, executor=executor)),
+                          len(filepaths), emit=emit)
+
 if __name__ == "__main__":
-    path = "scripts/data/segy_list.txt"  # Hardcoded file path
+    path = FILE_LIST_PATH
+    ndjson = "--ndjson" in sys.argv[1:]  # Stream one JSON record per file instead of one document
     if os.path.isfile(path):
+        if ndjson:
+            stream_file_list(path)
+            sys.exit(0)
         result = process_file_list(path)
     else:
         result = {
             "error": {
                 "type": "path_error",
-                "message": "Hardcoded path 'scripts/data/segy_list.txt' is not a file"
+                "message": f"Hardcoded path '{FILE_LIST_PATH}' is not a file"
             }
         }
-    print(json.dumps(result, indent=2))
\ No newline at end of file
+    if ndjson:
+        stream_error(result["error"])
+    else:
+        print(json.dumps(result, indent=2))
\ No newline at end of file
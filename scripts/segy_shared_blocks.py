@@ -0,0 +1,180 @@
+"""
+SEG-Y Shared Blocks
+Hands large decoded trace blocks to the viewer without sending them over the
+backend pipe: the block is decoded straight into a memory-mapped temp file or
+a named shared-memory segment and only a handle with shape, dtype and strides
+is returned. Blocks live until the viewer releases them, expire after a TTL
+otherwise, and are all freed when the backend shuts down
+"""
+
+import os
+import tempfile
+import threading
+import time
+import uuid
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+FILE = "file"  # Memory-mapped temp file, readable from any process on every platform
+SHM = "shm"    # Named shared-memory segment (/dev/shm/<name> on Linux)
+HANDOFF_KINDS = (FILE, SHM)
+
+BLOCK_DIR = os.environ.get("SEGY_BLOCK_DIR", os.path.join(tempfile.gettempdir(), "segy_blocks"))
+# Seconds an unreleased block is kept, so a viewer that goes away cannot leak segments
+BLOCK_TTL = float(os.environ.get("SEGY_BLOCK_TTL", "900"))
+
+
+class SharedBlock:
+    """One published block: where it lives and how to view it"""
+
+    def __init__(self, kind: str, shape: Tuple[int, ...], dtype: np.dtype, location: str):
+        self.handle = uuid.uuid4().hex
+        self.kind = kind
+        self.shape = tuple(int(n) for n in shape)
+        self.dtype = np.dtype(dtype)
+        self.location = location  # File path, or segment name for SHM
+        # Open handle of SHM blocks; on Windows the segment lives only while a handle is open
+        self.segment: Optional[shared_memory.SharedMemory] = None
+        self.created = time.monotonic()
+
+    @property
+    def nbytes(self) -> int:
+        return int(np.prod(self.shape)) * self.dtype.itemsize
+
+    def describe(self, ttl: float) -> Dict[str, Any]:
+        strides, step = [], self.dtype.itemsize
+        for size in reversed(self.shape):
+            strides.insert(0, step)
+            step *= size
+        description = {
+            "handle": self.handle,
+            "kind": self.kind,
+            "path": self.location if self.kind == FILE else None,
+            "name": self.location if self.kind == SHM else None,
+            "shape": list(self.shape),
+            "dtype": self.dtype.name,
+            "byte_order": "little",
+            "strides": strides,
+            "offset": 0,
+            "nbytes": self.nbytes,
+            "expires_in": max(0.0, ttl - (time.monotonic() - self.created)),
+        }
+        if self.kind == SHM and os.path.exists(f"/dev/shm/{self.location}"):
+            description["path"] = f"/dev/shm/{self.location}"
+        return description
+
+
+class SharedBlockRegistry:
+    """Creates, tracks and frees the shared blocks of one backend process"""
+
+    def __init__(self, directory: str = BLOCK_DIR, ttl: float = BLOCK_TTL):
+        self.directory = directory
+        self.ttl = ttl
+        self._blocks: Dict[str, SharedBlock] = {}
+        self._lock = threading.Lock()
+
+    def write(self, shape: Tuple[int, ...], fill: Callable[[np.ndarray], Any], kind: str = FILE,
+              dtype=np.float32) -> Dict[str, Any]:
+        """
+        Allocate a block, let fill() decode into it and publish it.
+
+        Args:
+            shape (tuple): Array shape, C order
+            fill (callable): Called once with the writable mapped array; must not keep it
+            kind (str): FILE or SHM
+            dtype: Element dtype (stored little-endian)
+
+        Returns:
+            dict: Block description (handle, kind, path/name, shape, dtype, strides, nbytes, expires_in)
+        """
+        if kind not in HANDOFF_KINDS:
+            raise ValueError(f"Unknown handoff kind: {kind} (expected one of {', '.join(HANDOFF_KINDS)})")
+        self.sweep()
+        dtype = np.dtype(dtype).newbyteorder("<")
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+
+        if kind == FILE:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, path = tempfile.mkstemp(prefix="block-", suffix=".bin", dir=self.directory)
+            os.close(fd)
+            block = SharedBlock(kind, shape, dtype, path)
+            try:
+                if nbytes:
+                    mapped = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+                    fill(mapped)
+                    mapped.flush()
+                    del mapped
+            except Exception:
+                os.remove(path)
+                raise
+        else:
+            segment = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+            block = SharedBlock(kind, shape, dtype, segment.name)
+            block.segment = segment
+            try:
+                fill(np.ndarray(shape, dtype=dtype, buffer=segment.buf))
+            except Exception:
+                segment.close()
+                segment.unlink()
+                raise
+            # The segment stays open until release() or sweep() frees it
+
+        with self._lock:
+            self._blocks[block.handle] = block
+        return block.describe(self.ttl)
+
+    def release(self, handle: str) -> bool:
+        """Free a block; False when the handle is unknown (already released or expired)"""
+        with self._lock:
+            block = self._blocks.pop(handle, None)
+        if block is None:
+            return False
+        _free(block)
+        return True
+
+    def sweep(self) -> int:
+        """Free blocks older than the TTL and return how many were freed"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [h for h, block in self._blocks.items() if now - block.created > self.ttl]
+            blocks = [self._blocks.pop(h) for h in expired]
+        for block in blocks:
+            _free(block)
+        return len(blocks)
+
+    def release_all(self) -> int:
+        """Free every block, e.g. at shutdown"""
+        with self._lock:
+            blocks = list(self._blocks.values())
+            self._blocks.clear()
+        for block in blocks:
+            _free(block)
+        return len(blocks)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            blocks = list(self._blocks.values())
+        return {
+            "blocks": len(blocks),
+            "bytes": sum(block.nbytes for block in blocks),
+            "directory": self.directory,
+            "ttl": self.ttl,
+        }
+
+
+def _free(block: SharedBlock):
+    try:
+        if block.kind == FILE:
+            os.remove(block.location)
+        else:
+            block.segment.close()
+            if os.name != "nt":
+                block.segment.unlink()  # Windows frees the segment with its last handle
+    except OSError:
+        pass  # Already gone, or a temp file still mapped by a viewer on Windows
+
+
+# Process-wide registry used by the long-lived backend
+SHARED_BLOCKS = SharedBlockRegistry()
@@ -0,0 +1,141 @@
+"""
+SEG-Y Trace Reader
+Windowed sample reads straight from a memory map of the file: only the byte
+span of the requested samples of each requested trace is touched, so I/O is
+proportional to the visible window rather than to whole traces. Blocks of
+traces decode to float32 in one pass, trace-major as stored or transposed to
+the (samples, traces) section grid, optionally into a caller's buffer
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from segy_float import SAMPLE_DTYPES, ibm_to_float
+from segy_header_table import SAMPLE_FORMAT_SIZES, TRACE_HEADER_SIZE, TraceHeaderTable
+
+DELAY_FIELD = (108, ">i2")     # Bytes 109-110, delay recording time in ms
+INTERVAL_FIELD = (116, ">u2")  # Bytes 117-118, sample interval in microseconds
+
+TRACE_LAYOUT = "trace"    # (traces, samples), the order of the file
+SAMPLE_LAYOUT = "sample"  # (samples, traces), the section grid of get_seismic_data
+LAYOUTS = (TRACE_LAYOUT, SAMPLE_LAYOUT)
+
+# Traces decoded per pass, which bounds the gathered raw samples (and transpose buffer)
+BLOCK_TRACES = 1024
+
+
+def _first_header_word(table: TraceHeaderTable, field: Tuple[int, str]) -> int:
+    if len(table) == 0:
+        return 0
+    offset, dtype = field
+    header = table.headers(0, 1)[0]
+    return int(np.frombuffer(header[offset:offset + np.dtype(dtype).itemsize].tobytes(), dtype=dtype)[0])
+
+
+def sample_interval(table: TraceHeaderTable) -> float:
+    """Sample interval in ms from the binary header, or the first trace header when that is zero"""
+    interval = table.interval or _first_header_word(table, INTERVAL_FIELD)
+    return interval / 1000.0
+
+
+def first_sample_time(table: TraceHeaderTable) -> float:
+    """Time of the first sample in ms (delay recording time of the first trace)"""
+    return float(_first_header_word(table, DELAY_FIELD))
+
+
+def sample_range(table: TraceHeaderTable, start_sample: Optional[int] = None, end_sample: Optional[int] = None,
+                 start_time: Optional[float] = None, end_time: Optional[float] = None) -> Tuple[int, int]:
+    """
+    Resolve a sample window, given in samples or in ms, to a clamped [start, end) sample range.
+
+    Sample numbers take precedence over times; times are measured on the same
+    axis as segyio's samples (first sample at the delay recording time) and
+    the window covers every sample in [start_time, end_time].
+
+    Raises:
+        ValueError: When the window holds no samples
+    """
+    if (start_time is not None or end_time is not None) and (start_sample is None and end_sample is None):
+        interval, t0 = sample_interval(table), first_sample_time(table)
+        if not interval:
+            raise ValueError("Sample interval is unknown, use start_sample/end_sample")
+        if start_time is not None:
+            start_sample = int(np.ceil((start_time - t0) / interval - 1e-9))
+        if end_time is not None:
+            end_sample = int(np.floor((end_time - t0) / interval + 1e-9)) + 1
+
+    start = max(0, start_sample or 0)
+    end = table.nsamples if end_sample is None else min(end_sample, table.nsamples)
+    if start >= end:
+        raise ValueError("Invalid sample range")
+    return start, end
+
+
+def sample_window(table: TraceHeaderTable, start_sample: int = 0, end_sample: Optional[int] = None) -> np.ndarray:
+    """
+    Zero-copy (ntraces, window) view of the raw big-endian samples [start_sample, end_sample) of every trace.
+
+    Slicing the view by trace and copying it reads just those byte spans of the
+    memory-mapped file.
+    """
+    end_sample = table.nsamples if end_sample is None else end_sample
+    raw_dtype = np.dtype(">u4") if table.sample_format == 1 else np.dtype(SAMPLE_DTYPES[table.sample_format])
+    dtype = np.dtype({
+        "names": ["samples"],
+        "formats": [(raw_dtype, (end_sample - start_sample,))],
+        "offsets": [TRACE_HEADER_SIZE + start_sample * SAMPLE_FORMAT_SIZES[table.sample_format]],
+        "itemsize": table.stride,
+    })
+    return table.records(dtype)["samples"]
+
+
+def decode_window(table: TraceHeaderTable, raw: np.ndarray, out: Optional[np.ndarray] = None,
+                  dtype=np.float32) -> np.ndarray:
+    """Decode a (traces, samples) block of raw samples from sample_window (into out, when given)"""
+    if table.sample_format == 1:
+        return ibm_to_float(raw, out, dtype)
+    if out is None:
+        return raw.astype(dtype)
+    np.copyto(out, raw, casting="unsafe")
+    return out
+
+
+def read_block(table: TraceHeaderTable, start_trace: int, end_trace: int, start_sample: int = 0,
+               end_sample: Optional[int] = None, layout: str = TRACE_LAYOUT, out: Optional[np.ndarray] = None,
+               dtype=np.float32) -> np.ndarray:
+    """
+    Decode samples [start_sample, end_sample) of traces [start_trace, end_trace) as one block.
+
+    Args:
+        table (TraceHeaderTable): Open table of the file
+        start_trace, end_trace (int): Trace range, end exclusive
+        start_sample, end_sample (int): Sample window, end exclusive (None for the last sample)
+        layout (str): TRACE_LAYOUT for (traces, samples) or SAMPLE_LAYOUT for (samples, traces)
+        out (np.ndarray): Optional array of that shape to decode into (C-contiguous for TRACE_LAYOUT)
+        dtype: Output dtype when out is not given
+
+    Returns:
+        np.ndarray: The decoded block (out, when given)
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout} (expected one of {', '.join(LAYOUTS)})")
+    raw = sample_window(table, start_sample, end_sample)[start_trace:end_trace]
+    shape = raw.shape if layout == TRACE_LAYOUT else raw.shape[::-1]
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif out.shape != shape:
+        raise ValueError(f"Output shape {out.shape} does not match block shape {shape}")
+
+    # Trace-major: decode straight into row runs of out; otherwise decode into a
+    # reused trace-major buffer and write it transposed
+    scratch = None
+    if layout == SAMPLE_LAYOUT:
+        scratch = np.empty((min(BLOCK_TRACES, raw.shape[0]), raw.shape[1]), dtype=out.dtype)
+    for first in range(0, raw.shape[0], BLOCK_TRACES):
+        last = min(first + BLOCK_TRACES, raw.shape[0])
+        if scratch is None:
+            decode_window(table, raw[first:last], out[first:last])
+        else:
+            out[:, first:last] = decode_window(table, raw[first:last], scratch[:last - first]).T
+    return out
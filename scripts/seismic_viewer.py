@@ -1,7 +1,16 @@
 import segyio
 import numpy as np
+from segy_header_table import TEXT_HEADER_SIZE, decode_textual_header
+from segy_header_stats import standard_header_statistics
+from segy_geometry import get_geometry
+from segy_index_cache import save_index
+from segy_handle_cache import SEGY_HANDLES
+from segy_decimate import MINMAX, decimate_window
+from segy_block_cache import TRACE_BLOCKS
+from segy_trace_reader import SAMPLE_LAYOUT, first_sample_time, sample_interval, sample_range
 
-def get_seismic_data(file_path, start_trace=0, end_trace=None):
+def get_seismic_data(file_path, start_trace=0, end_trace=None, width=None, height=None, method=MINMAX,
+                     start_sample=None, end_sample=None, start_time=None, end_time=None):
     """
     Read seismic data from a SEGY file for a specified range of traces.
     
@@ -9,15 +18,23 @@ def get_seismic_data(file_path, start_trace=0, end_trace=None):
         file_path (str): Path to the SEGY file
         start_trace (int): Starting trace index (default: 0)
         end_trace (int): Ending trace index (default: None, reads all traces)
+        width (int): Target display width in traces; with height, returns a decimated section
+        height (int): Target display height in samples
+        method (str): Decimation binning, 'minmax' (peak-preserving) or 'rms'
+        start_sample (int): First sample of the time window (default: None, first sample)
+        end_sample (int): End of the time window, exclusive (default: None, last sample)
+        start_time (float): Window start in ms, used when no sample numbers are given
+        end_time (float): Window end in ms (inclusive)
     
     Returns:
         dict: Dictionary containing seismic data and metadata or error
     """
+    window = {'start_sample': start_sample, 'end_sample': end_sample, 'start_time': start_time, 'end_time': end_time}
+    if width is not None or height is not None:
+        return decimate_window(file_path, width, height, start_trace, end_trace, method, **window)
     try:
-        with segyio.open(file_path, 'r', ignore_geometry=True) as segyfile:
-            n_traces = segyfile.tracecount
-            n_samples = len(segyfile.samples)
-            sample_rate = segyfile.samples[1] - segyfile.samples[0]
+        with SEGY_HANDLES.table(file_path) as table:
+            n_traces = len(table)
             
             # Limit end_trace to the total number of traces
             end_trace = min(end_trace, n_traces) if end_trace else n_traces
@@ -27,18 +44,22 @@ def get_seismic_data(file_path, start_trace=0, end_trace=None):
             if start_trace >= n_traces or end_trace <= start_trace:
                 return {'error': 'Invalid trace range'}
             
-            # Read only the specified range of traces
-            data = np.zeros((n_samples, end_trace - start_trace))
-            for i, trace_idx in enumerate(range(start_trace, end_trace)):
-                data[:, i] = segyfile.trace[trace_idx]
+            # Read only the byte span of the time window of each trace in the range,
+            # or serve it from decoded blocks kept from earlier requests
+            first_sample, last_sample = sample_range(table, **window)
+            data = TRACE_BLOCKS.read(table, start_trace, end_trace, first_sample, last_sample, SAMPLE_LAYOUT)
+            interval = sample_interval(table)
             
             return {
                 'data': data.tolist(),
-                'sample_rate': float(sample_rate),
+                'sample_rate': interval,
                 'n_traces': end_trace - start_trace,
-                'n_samples': n_samples,
+                'n_samples': last_sample - first_sample,
                 'start_trace': start_trace,
-                'total_traces': n_traces
+                'total_traces': n_traces,
+                'start_sample': first_sample,
+                'total_samples': table.nsamples,
+                'start_time': first_sample_time(table) + first_sample * interval
             }
     except Exception as e:
         return {'error': str(e)}
@@ -54,13 +75,18 @@ def get_ebcdic_header(file_path):
         dict: Dictionary containing header lines or error
     """
     try:
-        with segyio.open(file_path, 'r', ignore_geometry=True) as segyfile:
-            header = segyfile.text[0]
-            lines = [header[i:i+80].decode('ascii') for i in range(0, len(header), 80)]
-            return {
-                'header': lines,
-                'error': None
-            }
+        # Use the cached header index when there is one, otherwise read just the textual header
+        index = SEGY_HANDLES.index(file_path, build=False)
+        if index is not None:
+            header = index.textual_header
+        else:
+            with open(file_path, 'rb') as f:
+                header = decode_textual_header(f.read(TEXT_HEADER_SIZE))
+        lines = [header[i:i+80] for i in range(0, len(header), 80)]
+        return {
+            'header': lines,
+            'error': None
+        }
     except Exception as e:
         return {
             'header': None,
@@ -78,47 +104,50 @@ def get_file_metadata(file_path):
         dict: Dictionary containing file metadata or error
     """
     try:
-        with segyio.open(file_path, 'r', ignore_geometry=True) as segyfile:
-            sample_interval_us = segyfile.bin[segyio.BinField.Interval]  # In microseconds
-            sample_interval_ms = sample_interval_us / 1000 if sample_interval_us else None
-
-            # Trace headers:
-            ffids = []
-            sps = []
-            cdps = []
+        index = SEGY_HANDLES.index(file_path)
+        table = index.table
+        sample_interval_us = table.interval  # In microseconds
+        sample_interval_ms = sample_interval_us / 1000 if sample_interval_us else None
 
-            for trace_idx, trace in enumerate(segyfile.trace):
-                trace_header = segyfile.header[trace_idx]  # Access header for current trace
-                ffid = trace_header.get(segyio.TraceField.TRACE_SEQUENCE_FILE, None)
-                sp = trace_header.get(segyio.TraceField.FieldRecord, None)
-                cdp = trace_header.get(segyio.TraceField.CDP, None)
-                if ffid is not None:
-                    ffids.append(ffid)
-                if sp is not None:
-                    sps.append(sp)
-                if cdp is not None:
-                    cdps.append(cdp)
+        # Trace headers, decoded for every trace from the index
+        columns = table.decode({
+            'ffid': (segyio.TraceField.TRACE_SEQUENCE_FILE - 1, 'int32'),
+            'sp': (segyio.TraceField.FieldRecord - 1, 'int32'),
+            'cdp': (segyio.TraceField.CDP - 1, 'int32'),
+        })
+        # Min/max, monotonicity, steps and gaps of FFID, SP, CDP, inline and crossline
+        statistics = standard_header_statistics(table)
+        # 2D/3D detection with the inline/crossline grid and coverage bitmap
+        geometry = get_geometry(index)
+        save_index(index)
+        ffids = columns['ffid']
+        sps = columns['sp']
+        cdps = columns['cdp']
 
-            ffid_range = f"{min(ffids)} to {max(ffids)}" if ffids else "N/A"
-            sp_range = f"{min(sps)} to {max(sps)}" if sps else "N/A"
-            cdp_range = f"{min(cdps)} to {max(cdps)}" if cdps else "N/A"
-            sample_rate = f"{sample_interval_ms} ms" if sample_interval_ms else "N/A"
+        ffid_range = f"{ffids.min()} to {ffids.max()}" if ffids.size else "N/A"
+        sp_range = f"{sps.min()} to {sps.max()}" if sps.size else "N/A"
+        cdp_range = f"{cdps.min()} to {cdps.max()}" if cdps.size else "N/A"
+        sample_rate = f"{sample_interval_ms} ms" if sample_interval_ms else "N/A"
 
-            return {
-                'ffid_range': ffid_range,
-                'sp_range': sp_range,
-                'cdp_range': cdp_range,
-                'sample_rate': sample_rate,
-                'total_traces': segyfile.tracecount,
-                'n_samples': len(segyfile.samples),
-                'error': None
-            }
+        return {
+            'ffid_range': ffid_range,
+            'sp_range': sp_range,
+            'cdp_range': cdp_range,
+            'sample_rate': sample_rate,
+            'header_statistics': statistics,
+            'geometry': geometry,
+            'total_traces': len(table),
+            'n_samples': table.nsamples,
+            'error': None
+        }
     except Exception as e:
         return {
             'ffid_range': 'N/A',
             'sp_range': 'N/A',
             'cdp_range': 'N/A',
             'sample_rate': 'N/A',
+            'header_statistics': None,
+            'geometry': None,
             'total_traces': 0,
             'n_samples': 0,
             'error': str(e)
@@ -0,0 +1,131 @@
+"""
+Startup Profile
+Cold-start import cost of the backend entry points: each module is imported
+in a fresh interpreter with -X importtime and the report breaks the time down
+by the top-level packages it pulled in, so start-up latency can be tracked
+and kept within a budget
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules started as processes by the app (scripts and the long-lived backend)
+ENTRY_POINTS = [
+    "electron_backend", "backend_services", "segy_read_single_file", "segy_read_from_list",
+    "las_reader", "others_reader", "manual_segy_reader", "proj4_converter_segy", "segy_2d_reader",
+]
+TOP_PACKAGES = 8  # Heaviest top-level packages listed per entry point
+
+# Optional budget in milliseconds for the import time of each entry point
+BUDGET_MS = float(os.environ["STARTUP_BUDGET_MS"]) if os.environ.get("STARTUP_BUDGET_MS") else None
+
+
+def _parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Rows of -X importtime output: module, self and cumulative microseconds, nesting depth"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue  # Column header
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append({"module": name.strip(), "self_us": self_us, "cumulative_us": cumulative_us, "depth": depth})
+    return rows
+
+
+def profile_module(module: str, top: int = TOP_PACKAGES) -> Dict[str, Any]:
+    """
+    Import one module in a fresh interpreter and measure it.
+
+    Args:
+        module (str): Module name, importable from the scripts directory
+        top (int): Number of heaviest top-level packages to report
+
+    Returns:
+        dict: module, import_ms (cumulative import time), process_ms (wall time
+        of the whole interpreter run), the heaviest packages [{package, ms}] and
+        error when the import failed
+    """
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True
+    )
+    process_ms = (time.perf_counter() - started) * 1000
+    rows = _parse_importtime(completed.stderr)
+
+    # The target's import tree is every row since the previous top-level import;
+    # its time is split by top-level package, summing the self time of submodules
+    end = next((i for i in range(len(rows) - 1, -1, -1)
+                if rows[i]["module"] == module and rows[i]["depth"] == 0), None)
+    target = rows[end] if end is not None else None
+    packages: Dict[str, int] = {}
+    if target is not None:
+        begin = end
+        while begin > 0 and rows[begin - 1]["depth"] > 0:
+            begin -= 1
+        for row in rows[begin:end + 1]:
+            package = row["module"].split(".")[0]
+            packages[package] = packages.get(package, 0) + row["self_us"]
+
+    report = {
+        "module": module,
+        "import_ms": round(target["cumulative_us"] / 1000, 1) if target else None,
+        "process_ms": round(process_ms, 1),
+        "packages": [
+            {"package": name, "ms": round(us / 1000, 1)}
+            for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        ],
+    }
+    if completed.returncode != 0:
+        report["error"] = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "Import failed"
+    return report
+
+
+def profile_startup(modules: Optional[Sequence[str]] = None, budget_ms: Optional[float] = BUDGET_MS,
+                    top: int = TOP_PACKAGES) -> Dict[str, Any]:
+    """
+    Profile the cold start of several entry points (all of ENTRY_POINTS by default).
+
+    Returns:
+        dict: python version, budget_ms, one profile_module report per entry
+        point and the modules whose import time is over the budget
+    """
+    reports = [profile_module(module, top) for module in (modules or ENTRY_POINTS)]
+    over_budget = [] if budget_ms is None else [
+        report["module"] for report in reports
+        if report["import_ms"] is None or report["import_ms"] > budget_ms
+    ]
+    return {
+        "python": sys.version.split()[0],
+        "budget_ms": budget_ms,
+        "entry_points": reports,
+        "over_budget": over_budget,
+    }
+
+
+def main():
+    """Usage: python startup_profile.py [module ...] [--budget-ms N]; exits 1 when a module is over budget"""
+    args = sys.argv[1:]
+    budget_ms = BUDGET_MS
+    if "--budget-ms" in args:
+        i = args.index("--budget-ms")
+        budget_ms = float(args[i + 1])
+        del args[i:i + 2]
+    report = profile_startup(args or None, budget_ms)
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if report["over_budget"] else 0)
+
+
+if __name__ == "__main__":
+    main()
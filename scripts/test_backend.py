@@ -36,6 +36,9 @@ def test_backend():
         # Ping test
         {"endpoint": "ping"},
         
+        # Tagged request: runs on the worker pool, response echoes the id
+        {"id": 1, "endpoint": "ping"},
+        
         # Calculator tests
         {"endpoint": "calculate", "params": {"a": 10, "b": 5, "operation": "add"}},
         {"endpoint": "calculate", "params": {"a": 10, "b": 3, "operation": "power"}},
@@ -61,6 +64,19 @@ def test_backend():
         {"endpoint": "get_segy_metadata", "params": {"file_path": "nonexistent.segy"}},  # Test error handling
         {"endpoint": "get_segy_ebcdic_header", "params": {"file_path": "nonexistent.segy"}},  # Test error handling
         {"endpoint": "get_seismic_data", "params": {"file_path": "nonexistent.segy", "start_trace": 0, "end_trace": 10}},  # Test error handling
+        {"endpoint": "get_segy_full_hash", "params": {"file_path": "nonexistent.segy"}},  # Test error handling
+        {"endpoint": "discover_segy_headers", "params": {"file_path": "nonexistent.segy"}},  # Test error handling
+        
+        # Reader script endpoints (modules load on first call and stay loaded)
+        {"endpoint": "get_script_status"},
+        {"endpoint": "read_segy_file", "params": {"file_path": "nonexistent.segy"}},  # Test error handling
+        {"endpoint": "parse_las_file", "params": {"file_path": "nonexistent.las"}},  # Test error handling
+        {"endpoint": "read_segy_manual", "params": {"files": [{"index": 0, "filePath": "nonexistent.segy"}]}},  # Test error handling
+        {"endpoint": "convert_segy_coordinates", "params": {"file_configs": []}},  # Test error handling
+        {"endpoint": "get_segy_coordinates", "params": {"file_path": "nonexistent.segy"}},  # Test error handling
+        {"endpoint": "release_seismic_block", "params": {"handle": "unknown"}},
+        {"endpoint": "get_startup_profile", "params": {"modules": ["electron_backend"]}},
+        {"endpoint": "get_script_status"},
         # Note: We can't test actual SEGY extraction without a real SEGY file
         
         # Error tests
@@ -214,6 +230,11 @@ def test_segy_with_file(segy_file_path):
         {"endpoint": "get_segy_metadata", "params": {"file_path": segy_file_path}},
         {"endpoint": "get_segy_ebcdic_header", "params": {"file_path": segy_file_path}},
         {"endpoint": "get_seismic_data", "params": {"file_path": segy_file_path, "start_trace": 0, "end_trace": 5}},
+        {"endpoint": "get_seismic_data", "params": {"file_path": segy_file_path, "start_trace": 0, "end_trace": 5, "handoff": "file"}},
+        {"endpoint": "get_seismic_data", "params": {"file_path": segy_file_path, "width": 8, "height": 4}},
+        {"endpoint": "get_seismic_data", "params": {"file_path": segy_file_path, "start_trace": 0, "end_trace": 5, "start_sample": 10, "end_sample": 20}},
+        {"endpoint": "get_seismic_data", "params": {"file_path": segy_file_path, "start_trace": 0, "end_trace": 5, "layout": "trace"}},
+        {"endpoint": "get_segy_coordinates", "params": {"file_path": segy_file_path, "trace_step": 100}},
         {"endpoint": "shutdown"}
     ]
     
@@ -9,7 +9,8 @@ import {
   extractOthersContent, 
   extractSEGYFilesContent, 
   extractSegyCoordinates,
-  callBackendService
+  callBackendService,
+  stopPythonBackend
 } from './services/pythonService';
 import { openFolderDialog, readDirectory, fileExists, readSingleFile } from './services/fileService';
 import { startTusServer, stopTusServer, getTusServerUrl, TusServerConfig, testFtpConnection } from './services/tusServer';
@@ -315,6 +316,7 @@ app.on('ready', () => {
 app.on('window-all-closed', async () => {
   await closeMongo();
   stopTusServer();
+  stopPythonBackend();
   if (process.platform !== 'darwin') {
     app.quit();
   }
@@ -486,34 +488,39 @@ ipcMain.handle('fs:filterFile', async (_event, filePath: string, enableExtension
   }
 });
 
+// Batch results sent back to the calling window as they complete, when it asks for streaming
+function streamTo(sender: Electron.WebContents, stream?: boolean) {
+  return stream ? (record: any) => sender.send('python:stream', record) : undefined;
+}
+
 // Python script handlers
 ipcMain.handle('python:runSingleFileSegy', async (_event, filePath: string) => {
   return await extractSegySingleFileContent(filePath);
 });
 
-ipcMain.handle('python:runSegy', async (_event) => {
-  return await extractSegyContent();
+ipcMain.handle('python:runSegy', async (event, stream?: boolean) => {
+  return await extractSegyContent(streamTo(event.sender, stream));
 });
 
-ipcMain.handle('python:runLas', async (_event, folderPath?: string, formData?: any) => {
-  return await extractLasContent(folderPath, formData);
+ipcMain.handle('python:runLas', async (event, folderPath?: string, formData?: any, stream?: boolean) => {
+  return await extractLasContent(folderPath, formData, streamTo(event.sender, stream));
 });
 
-ipcMain.handle('python:runOthers', async (_event, folderPath?: string, formData?: any) => {
-  return await extractOthersContent(folderPath, formData);
+ipcMain.handle('python:runOthers', async (event, folderPath?: string, formData?: any, stream?: boolean) => {
+  return await extractOthersContent(folderPath, formData, streamTo(event.sender, stream));
 });
 
-ipcMain.handle('extract-segy-files-content', async (event, manualTraceHeaderExtractRequest: manualTraceHeaderExtractRequest) => {
-  return extractSEGYFilesContent(manualTraceHeaderExtractRequest);
+ipcMain.handle('extract-segy-files-content', async (event, manualTraceHeaderExtractRequest: manualTraceHeaderExtractRequest, stream?: boolean) => {
+  return extractSEGYFilesContent(manualTraceHeaderExtractRequest, streamTo(event.sender, stream));
 });
 
 ipcMain.handle('python:extractSegyCoordinates', async (_event, fileConfigs: any[], srid: number, proj4_string: string) => {
   return extractSegyCoordinates(fileConfigs, srid, proj4_string);
 });
 
-// Generic backend service handler
-ipcMain.handle('backend:callService', async (_event, endpoint: string, params?: any) => {
-  return callBackendService(endpoint, params);
+// Generic backend service handler; binary requests return their arrays as typed arrays
+ipcMain.handle('backend:callService', async (_event, endpoint: string, params?: any, binary?: boolean) => {
+  return callBackendService(endpoint, params, binary);
 });
 
 // LAS file preview handler
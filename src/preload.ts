@@ -48,11 +48,12 @@ contextBridge.exposeInMainWorld('electronAPI', {
   
   // Python script operations
   extractSingleFileSegyContent: (filePath: string) => ipcRenderer.invoke('python:runSingleFileSegy', filePath),
-  extractSegyContent: () => ipcRenderer.invoke('python:runSegy'),
-  extractLasContent: (folderPath?: string, formData?: any) => ipcRenderer.invoke('python:runLas', folderPath, formData),
-  extractOthersContent: (folderPath?: string, formData?: any) => ipcRenderer.invoke('python:runOthers', folderPath, formData),
-  extractSEGYFilesContent: (manualTraceHeaderExtractRequest: manualTraceHeaderExtractRequest) => {
-    return ipcRenderer.invoke('extract-segy-files-content', manualTraceHeaderExtractRequest)
+  // With stream, results arrive through onPythonStream and the call resolves to the batch totals
+  extractSegyContent: (stream?: boolean) => ipcRenderer.invoke('python:runSegy', stream),
+  extractLasContent: (folderPath?: string, formData?: any, stream?: boolean) => ipcRenderer.invoke('python:runLas', folderPath, formData, stream),
+  extractOthersContent: (folderPath?: string, formData?: any, stream?: boolean) => ipcRenderer.invoke('python:runOthers', folderPath, formData, stream),
+  extractSEGYFilesContent: (manualTraceHeaderExtractRequest: manualTraceHeaderExtractRequest, stream?: boolean) => {
+    return ipcRenderer.invoke('extract-segy-files-content', manualTraceHeaderExtractRequest, stream)
   },
   extractSegyCoordinates: (fileConfigs: any[], srid: number, proj4_string: string) => 
     ipcRenderer.invoke('python:extractSegyCoordinates', fileConfigs, srid, proj4_string),
@@ -102,6 +103,16 @@ contextBridge.exposeInMainWorld('electronAPI', {
     });
   },
   
+  // Streamed batch records: { endpoint, type: 'result' | 'progress' | 'summary' | 'error', ... }
+  onPythonStream: (callback: (record: any) => void) => {
+    ipcRenderer.on('python:stream', (_event, record) => {
+      callback(record);
+    });
+  },
+  removePythonStreamListeners: () => {
+    ipcRenderer.removeAllListeners('python:stream');
+  },
+  
   removeUploadListeners: () => {
     ipcRenderer.removeAllListeners('upload-complete');
     ipcRenderer.removeAllListeners('upload-progress');
@@ -122,8 +133,8 @@ contextBridge.exposeInMainWorld('electronAPI', {
   setDbName: (newDbName: string) => ipcRenderer.invoke('settings:setDbName', newDbName),
 
   // Generic backend service call
-  callBackendService: (endpoint: string, params?: any) => 
-    ipcRenderer.invoke('backend:callService', endpoint, params),
+  callBackendService: (endpoint: string, params?: any, binary?: boolean) => 
+    ipcRenderer.invoke('backend:callService', endpoint, params, binary),
 });
 
 // Expose MongoDB API separately
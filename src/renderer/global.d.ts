@@ -15,10 +15,10 @@ interface ElectronAPI {
   parseLasToWellioJson: (filePath: string) => Promise<any>;
   
   extractSingleFileSegyContent: (filePath: string) => Promise<any>;
-  extractSegyContent: () => Promise<any>;
-  extractLasContent: (folderPath?: string, formData?: any) => Promise<any>;
-  extractOthersContent: (folderPath?: string, formData?: any) => Promise<any>;
-  extractSEGYFilesContent: (manualTraceHeaderExtractRequest: any) => Promise<any>;
+  extractSegyContent: (stream?: boolean) => Promise<any>;
+  extractLasContent: (folderPath?: string, formData?: any, stream?: boolean) => Promise<any>;
+  extractOthersContent: (folderPath?: string, formData?: any, stream?: boolean) => Promise<any>;
+  extractSEGYFilesContent: (manualTraceHeaderExtractRequest: any, stream?: boolean) => Promise<any>;
   extractSegyCoordinates: (fileConfigs: any[], srid: number, proj4_string: string) => Promise<any>;
   
   // Tus server operations
@@ -42,6 +42,9 @@ interface ElectronAPI {
   
   removeUploadListeners: () => void;
   
+  onPythonStream: (callback: (record: any) => void) => void;
+  removePythonStreamListeners: () => void;
+  
   onDeepLink: (callback: (url: string) => void) => void;
   setDbName: (newDbName: string) => Promise<any>;
 }
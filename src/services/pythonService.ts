@@ -1,4 +1,4 @@
-import { spawnSync } from 'child_process';
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
 import { manualTraceHeaderExtractRequest } from '../schemas/SegyTable';
 
 interface PythonResult {
@@ -7,60 +7,248 @@ interface PythonResult {
   // Add other properties if Python scripts return more structured data
 }
 
-function runPythonScript(scriptPath: string, folderPath?: string, formData?: any): any {
-  try {
-    // console.log(`Running script: ${scriptPath}`);
-    const args: string[] = [scriptPath];
+interface FrameArray {
+  path: Array<string | number>;
+  dtype: 'float32' | 'float64' | 'int32' | 'int64' | 'uint32' | 'uint8';
+  shape: number[];
+  offset: number;
+  nbytes: number;
+}
+
+type FrameTypedArray = Float32Array | Float64Array | Int32Array | BigInt64Array | Uint32Array | Uint8Array;
+
+function typedArray(dtype: FrameArray['dtype'], bytes: ArrayBuffer): FrameTypedArray {
+  switch (dtype) {
+    case 'float64':
+      return new Float64Array(bytes);
+    case 'int32':
+      return new Int32Array(bytes);
+    case 'int64':
+      return new BigInt64Array(bytes);
+    case 'uint32':
+      return new Uint32Array(bytes);
+    case 'uint8':
+      return new Uint8Array(bytes);
+    default:
+      return new Float32Array(bytes);
+  }
+}
+
+/**
+ * Splits the backend's stdout into messages: JSON lines, where a line with a
+ * "frame" entry is followed by frame.nbytes of raw little-endian array data.
+ * The arrays are put back into the message as typed arrays at their paths
+ * (shapes stay listed in message.frame.arrays).
+ */
+class FrameReader {
+  private buffer = Buffer.alloc(0);
+  private frame: { message: any; payload: Buffer; filled: number } | null = null;
 
-    if (folderPath) args.push(folderPath);
+  constructor(private onMessage: (message: any) => void) {}
 
-    if (formData) {
-      const formDataString = JSON.stringify(formData);
-      args.push('--form-data');
-      args.push(formDataString);
+  push(chunk: Buffer): void {
+    while (chunk.length) {
+      if (this.frame) {
+        // Copy straight into the preallocated payload rather than growing a buffer
+        const take = Math.min(chunk.length, this.frame.payload.length - this.frame.filled);
+        chunk.copy(this.frame.payload, this.frame.filled, 0, take);
+        this.frame.filled += take;
+        chunk = chunk.subarray(take);
+        if (this.frame.filled === this.frame.payload.length) {
+          const { message, payload } = this.frame;
+          this.frame = null;
+          this.onMessage(attachArrays(message, payload));
+        }
+        continue;
+      }
+
+      const newline = chunk.indexOf(0x0a);
+      if (newline < 0) {
+        this.buffer = Buffer.concat([this.buffer, chunk]);
+        return;
+      }
+      const line = Buffer.concat([this.buffer, chunk.subarray(0, newline)]).toString('utf8');
+      this.buffer = Buffer.alloc(0);
+      chunk = chunk.subarray(newline + 1);
+
+      let message: any;
+      try {
+        message = JSON.parse(line);
+      } catch (e) {
+        message = { error: 'Failed to parse Python output', raw: line };
+      }
+      if (message.frame?.nbytes > 0) {
+        this.frame = { message, payload: Buffer.allocUnsafe(message.frame.nbytes), filled: 0 };
+      } else if (message.frame) {
+        // No payload follows, but its arrays still exist: they are all empty
+        this.onMessage(attachArrays(message, Buffer.alloc(0)));
+      } else {
+        this.onMessage(message);
+      }
     }
+  }
+}
+
+function attachArrays(message: any, payload: Buffer): any {
+  for (const array of message.frame.arrays as FrameArray[]) {
+    // Copied out so each typed array gets its own aligned buffer
+    const start = payload.byteOffset + array.offset;
+    const bytes = payload.buffer.slice(start, start + array.nbytes) as ArrayBuffer;
+    let target = message;
+    array.path.slice(0, -1).forEach(key => { target = target[key]; });
+    target[array.path[array.path.length - 1]] = typedArray(array.dtype, bytes);
+  }
+  return message;
+}
+
+/**
+ * Long-lived scripts/electron_backend.py process. It is started on first use and
+ * keeps its imports and caches warm across calls. Requests are written as JSON
+ * lines tagged with an id; the backend runs them concurrently and answers each
+ * with one JSON line carrying the same id, in completion order. Calls made with
+ * binary: true get their arrays as typed arrays through framed responses. Batch
+ * calls made with an onStream callback get each result/progress/summary record
+ * (tagged "stream": true) as it completes, before the final response.
+ */
+class PythonBackendWorker {
+  private proc: ChildProcessWithoutNullStreams | null = null;
+  private ready: Promise<void> | null = null;
+  private pending = new Map<number, (response: any) => void>();
+  private streams = new Map<number, (record: any) => void>();
+  private nextId = 1;
 
-    // console.log("args   ", args);
+  private start(): Promise<void> {
+    if (this.ready) return this.ready;
 
-    const result = spawnSync('python3', args, { encoding: 'utf-8' });
+    const proc = spawn('python3', ['scripts/electron_backend.py']);
+    this.proc = proc;
 
-    // console.log('Result: ', result);
+    this.ready = new Promise((resolve, reject) => {
+      const reader = new FrameReader((message) => {
+        if (message.status === 'ready') return resolve();
+        if (message.status === 'shutdown') return;
+        if (message.stream) {
+          const { id: _id, stream: _stream, ...record } = message;
+          this.streams.get(message.id)?.(record);
+          return;
+        }
+        const respond = this.pending.get(message.id);
+        if (!respond) {
+          console.warn('Python backend: unmatched response', message);
+          return;
+        }
+        this.pending.delete(message.id);
+        this.streams.delete(message.id);
+        respond(message);
+      });
+      proc.stdout.on('data', (chunk: Buffer) => reader.push(chunk));
 
-    if (result.error) return { error: result.error.message };
-    if (result.stderr) return { error: result.stderr };
+      const stop = (reason: string) => {
+        // Fail whatever is in flight; the next call starts a new worker
+        if (this.proc === proc) {
+          this.proc = null;
+          this.ready = null;
+        }
+        const inFlight = Array.from(this.pending.values());
+        this.pending.clear();
+        this.streams.clear();
+        inFlight.forEach(respond => respond({ error: reason }));
+        reject(new Error(reason));
+      };
+      proc.on('error', (err) => stop(err.message));
+      proc.on('exit', (code) => stop(`Python backend exited with code ${code}`));
+    });
 
+    // Failed writes (EPIPE once the process is gone) are answered through the
+    // write callback in call(); the exit handler fails everything else
+    proc.stdin.on('error', () => {});
+    // Reader progress and warnings are diagnostics, not errors
+    proc.stderr.on('data', (data) => console.warn('Python backend:', data.toString()));
+    return this.ready;
+  }
+
+  async call(endpoint: string, params: any = {}, binary = false,
+             onStream?: (record: any) => void): Promise<any> {
     try {
-      return JSON.parse(result.stdout);
-    } catch (e) {
-      return { error: 'Failed to parse Python output', raw: result.stdout };
+      await this.start();
+    } catch (e: any) {
+      return { error: e.message };
     }
-  } catch (e: any) {
-    return { error: e.message };
+    // The worker may have exited (or been stopped) since it became ready;
+    // it is started again on the next call
+    const proc = this.proc;
+    if (!proc || !proc.stdin.writable) {
+      return { error: 'Python backend has exited' };
+    }
+    const id = this.nextId++;
+    return new Promise((resolve) => {
+      this.pending.set(id, (response) => {
+        // The id is protocol bookkeeping, not part of the result
+        const { id: _id, ...result } = response;
+        resolve(result);
+      });
+      const request: any = { id, endpoint, params };
+      if (binary) request.binary = true;
+      if (onStream) {
+        request.stream = true;
+        this.streams.set(id, (record) => onStream({ endpoint, ...record }));
+      }
+      proc.stdin.write(JSON.stringify(request) + '\n', (err) => {
+        const respond = this.pending.get(id);
+        if (err && respond) {
+          this.pending.delete(id);
+          this.streams.delete(id);
+          respond({ error: `Python backend has exited: ${err.message}` });
+        }
+      });
+    });
+  }
+
+  stop(): void {
+    this.proc?.stdin.end(JSON.stringify({ endpoint: 'shutdown' }) + '\n');
   }
 }
 
-export function extractSegySingleFileContent(filePath: string): any {
-  return runPythonScript('scripts/segy_read_single_file.py', filePath);
+const backendWorker = new PythonBackendWorker();
+
+/**
+ * Result of one backend endpoint. With onStream the results are delivered
+ * record by record as they complete and the batch totals are returned instead.
+ */
+async function callWorker(endpoint: string, params: any, resultKey: string,
+                          onStream?: (record: any) => void): Promise<any> {
+  const response = await backendWorker.call(endpoint, params, false, onStream);
+  if (response.error) return { error: response.error };
+  return onStream ? response.summary : response[resultKey];
 }
 
-export function extractSegyContent(): any {
-  return runPythonScript('scripts/segy_read_from_list.py');
+export function stopPythonBackend(): void {
+  backendWorker.stop();
 }
 
-export function extractLasContent(folderPath?: string, formData?: any): any {
-  return runPythonScript('scripts/las_reader.py', folderPath, formData);
+export function extractSegySingleFileContent(filePath: string): Promise<any> {
+  return callWorker('read_segy_file', { file_path: filePath }, 'segy_file');
 }
 
-export function extractOthersContent(folderPath?: string, formData?: any): any {
-  return runPythonScript('scripts/others_reader.py', folderPath, formData);
+export function extractSegyContent(onStream?: (record: any) => void): Promise<any> {
+  return callWorker('read_segy_list', {}, 'segy_files', onStream);
 }
 
-export function extractSEGYFilesContent(
-  manualTraceHeaderExtractRequest: manualTraceHeaderExtractRequest
-): any {
-  try {
-    const args = ['scripts/manual_segy_reader.py'];
+export function extractLasContent(folderPath?: string, formData?: any,
+                                  onStream?: (record: any) => void): Promise<any> {
+  return callWorker('read_las_list', {}, 'las_files', onStream);
+}
+
+export function extractOthersContent(folderPath?: string, formData?: any,
+                                     onStream?: (record: any) => void): Promise<any> {
+  return callWorker('read_others_list', {}, 'other_files', onStream);
+}
 
+export async function extractSEGYFilesContent(
+  manualTraceHeaderExtractRequest: manualTraceHeaderExtractRequest,
+  onStream?: (record: any) => void
+): Promise<any> {
+  try {
     // Prepare the single configuration object
     const config = {
       action: 'process_files',
@@ -73,37 +261,17 @@ export function extractSEGYFilesContent(
       coordinate_config: manualTraceHeaderExtractRequest.coordinateConfig
     };
 
-    // Push the single JSON argument
-    args.push(JSON.stringify(config));
-
-    // console.log('Final args:', args);
-
-    const result = spawnSync('python3', args, {
-      encoding: 'utf-8',
-      maxBuffer: 1024 * 1024 * 50 // 50MB
-    });
+    const response = await backendWorker.call('read_segy_manual', config, false, onStream);
 
-    if (result.error) {
-      console.error('Spawn error:', result.error);
+    if (response.error) {
+      console.error('Python backend error:', response.error);
       return {
-        error: result.error.message,
+        error: response.error,
         details: {}
       };
     }
 
-    if (result.stderr) {
-      console.error('Python stderr:', result.stderr);
-    }
-
-    try {
-      return JSON.parse(result.stdout);
-    } catch (e) {
-      console.error('Parse error:', e);
-      return {
-        error: 'Failed to parse Python output',
-        rawOutput: result.stdout
-      };
-    }
+    return onStream ? response.summary : response.segy_manual;
   } catch (e: any) {
     console.error('Unexpected error:', e);
     return {
@@ -114,46 +282,15 @@ export function extractSEGYFilesContent(
   }
 }
 
-function runPythonScriptWithStdin(scriptPath: string, inputData: any): any {
-  try {
-    const args: string[] = [scriptPath];
-    
-    const result = spawnSync('python3', args, {
-      input: JSON.stringify(inputData),
-      encoding: 'utf-8',
-      maxBuffer: 1024 * 1024 * 50 // 50MB, consistent with extractSEGYFilesContent
-    });
-
-    if (result.error) {
-      return { error: result.error.message };
-    }
-    if (result.stderr) {
-      return { error: result.stderr };
-    }
-
-    try {
-      return JSON.parse(result.stdout);
-    } catch (e) {
-      return { error: 'Failed to parse Python output', raw: result.stdout };
-    }
-  } catch (e: any) {
-    return { error: e.message };
-  }
-}
-
-export function extractSegyCoordinates(fileConfigs: any[], srid: number, proj4_string: string): any {
+export function extractSegyCoordinates(fileConfigs: any[], srid: number, proj4_string: string): Promise<any> {
   const inputData = {
     file_configs: fileConfigs,
     srid: srid,
     proj4_string: proj4_string
   };
-  return runPythonScriptWithStdin('scripts/proj4_converter_segy.py', inputData);
+  return callWorker('convert_segy_coordinates', inputData, 'segy_coordinates');
 }
 
-export function callBackendService(endpoint: string, params: any = {}): any {
-  const requestData = {
-    endpoint,
-    params
-  };
-  return runPythonScriptWithStdin('scripts/electron_backend.py', requestData);
+export function callBackendService(endpoint: string, params: any = {}, binary = false): Promise<any> {
+  return backendWorker.call(endpoint, params, binary);
 }